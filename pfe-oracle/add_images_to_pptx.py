@@ -5,35 +5,30 @@ Parses HTML to find which images go on which slides and embeds them
 """
 
 import os
-import re
 from pptx import Presentation
 from pptx.util import Inches, Pt
 
+from asset_index import report_missing_assets, resolve_asset
+from image_pipeline import add_picture
+from slide_extractor import load_slides
+
 def parse_html_for_images():
     """Parse HTML to extract slide-to-image mappings"""
-    with open('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html', 'r') as f:
-        html_content = f.read()
-
-    # Extract all slides
-    slides_pattern = r'<div class="slide[^"]*"[^>]*>(.*?)</div>\s*(?=<div class="slide|<script)'
-    slides = re.findall(slides_pattern, html_content, re.DOTALL)
+    slides = load_slides('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html')
 
     image_mappings = []
 
-    for slide_num, slide_content in enumerate(slides, 1):
-        # Find images in this slide
-        img_pattern = r'<img[^>]+src="([^"]+)"'
-        images = re.findall(img_pattern, slide_content)
-
-        if images:
+    for slide in slides:
+        if slide['images']:
             # Check if this is a full-image slide (image should be large)
-            is_full_image = 'full-image-slide' in slide_content or 'image-container' in slide_content
+            is_full_image = ('full-image-slide' in slide['classes']
+                             or 'image-container' in slide['content_classes'])
 
-            for img_path in images:
+            for image in slide['images']:
                 # Clean up the path
-                img_path = img_path.replace('images/', '')
+                img_path = image['src'].replace('images/', '')
                 image_mappings.append({
-                    'slide_num': slide_num,
+                    'slide_num': slide['number'],
                     'image_path': img_path,
                     'is_full_image': is_full_image
                 })
@@ -67,10 +62,10 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
         slide = prs.slides[slide_idx]
 
         # Full path to image
-        full_image_path = os.path.join(images_dir, image_path)
+        # Missing images are listed together at the end
+        full_image_path = resolve_asset(images_dir, image_path, f"slide {slide_num}")
 
-        if not os.path.exists(full_image_path):
-            print(f"⚠ Image not found: {image_path}, skipping")
+        if full_image_path is None:
             images_skipped += 1
             continue
 
@@ -94,14 +89,14 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
                 left = Inches(1.5)
                 top = Inches(1.5)
                 height = Inches(5.0)
-                slide.shapes.add_picture(full_image_path, left, top, height=height)
+                add_picture(slide.shapes, full_image_path, left, top, height=height)
                 print(f"✓ Added full image to slide {slide_num}: {image_path}")
             else:
                 # Smaller image - top right or center
                 left = Inches(7.0)
                 top = Inches(2.0)
                 height = Inches(3.0)
-                slide.shapes.add_picture(full_image_path, left, top, height=height)
+                add_picture(slide.shapes, full_image_path, left, top, height=height)
                 print(f"✓ Added image to slide {slide_num}: {image_path}")
 
             images_added += 1
@@ -135,6 +130,7 @@ def main():
 
     print("Step 2: Adding images to PPTX...")
     output_path = add_images_to_pptx(pptx_path, image_mappings, images_dir)
+    report_missing_assets()
 
     print("\n✅ Complete! Your PPTX now has all the images embedded.")
     print(f"📁 Location: {output_path}")
@@ -5,50 +5,47 @@ This version properly embeds images even if slides already have some content
 """
 
 import os
-import re
+import sys
+from lxml import etree
 from pptx import Presentation
 from pptx.util import Inches, Pt
 
+import ooxml_shapes
+from asset_index import report_missing_assets, resolve_asset
+from image_geometry import data_format
+from image_pipeline import active_profile, add_picture, display_size, downscale, print_image_report
+from pptx_package import IMAGE_FORMATS, NS_P, RT_IMAGE, ZipPackage
+from slide_extractor import load_slides
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+XML_PARSER = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+
 def parse_html_for_images():
     """Parse HTML to extract slide-to-image mappings with better detection"""
-    with open('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html', 'r') as f:
-        html_content = f.read()
-
-    # Split by slide divs more accurately
-    slide_sections = html_content.split('<div class="slide')
+    slides = load_slides('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html')
 
     image_mappings = []
 
-    for slide_num, section in enumerate(slide_sections[1:], 1):  # Skip first split (before slides)
-        # Find the end of this slide
-        slide_end = section.find('<div class="slide')
-        if slide_end == -1:
-            slide_end = section.find('</div>')
-
-        slide_content = section[:slide_end] if slide_end != -1 else section
+    for slide in slides:
+        slide_num = slide['number']
 
-        # Find images in this slide
-        img_pattern = r'<img[^>]+src="([^"]+)"[^>]*alt="([^"]*)"'
-        images = re.findall(img_pattern, slide_content)
+        # Determine if full-image slide
+        is_full_image = 'full-image-slide' in slide['classes']
 
-        if images:
-            # Determine if full-image slide
-            is_full_image = 'full-image-slide' in slide_content
+        for image in slide['images']:
+            # Clean up the path
+            img_path = image['src'].replace('images/', '')
 
-            for img_src, img_alt in images:
-                # Clean up the path
-                img_path = img_src.replace('images/', '')
+            # Skip logos on title slide (they're decorative)
+            if 'logo' in img_path.lower() and slide_num <= 2:
+                continue
 
-                # Skip logos on title slide (they're decorative)
-                if 'logo' in img_path.lower() and slide_num <= 2:
-                    continue
-
-                image_mappings.append({
-                    'slide_num': slide_num,
-                    'image_path': img_path,
-                    'is_full_image': is_full_image,
-                    'alt_text': img_alt
-                })
+            image_mappings.append({
+                'slide_num': slide_num,
+                'image_path': img_path,
+                'is_full_image': is_full_image,
+                'alt_text': image['alt']
+            })
 
     return image_mappings
 
@@ -80,10 +77,10 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
         slide = prs.slides[slide_idx]
 
         # Full path to image
-        full_image_path = os.path.join(images_dir, image_path)
+        # Missing images are listed together at the end
+        full_image_path = resolve_asset(images_dir, image_path, f"slide {slide_num}")
 
-        if not os.path.exists(full_image_path):
-            print(f"⚠ Image not found: {image_path}, skipping")
+        if full_image_path is None:
             images_skipped += 1
             continue
 
@@ -105,7 +102,7 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
                 left = Inches(0.5)
                 top = Inches(1.0)
                 height = Inches(6.5)
-                slide.shapes.add_picture(full_image_path, left, top, height=height)
+                add_picture(slide.shapes, full_image_path, left, top, height=height)
                 print(f"✓ Added FULL image to slide {slide_num}: {image_path}")
                 images_added += 1
             else:
@@ -132,7 +129,7 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
                     top = Inches(2.0)
                     height = Inches(4.5)
 
-                pic = slide.shapes.add_picture(full_image_path, left, top, height=height)
+                pic = add_picture(slide.shapes, full_image_path, left, top, height=height)
                 print(f"✓ Added image to slide {slide_num}: {image_path}")
                 images_added += 1
 
@@ -155,7 +152,156 @@ def add_images_to_pptx(pptx_path, image_mappings, images_dir):
 
     return output_path
 
+class _SlideXml:
+    """One slide part opened for patching: its XML tree and relationships"""
+
+    def __init__(self, package, part_name):
+        self.part_name = part_name
+        self.root = etree.fromstring(package.parts[part_name], XML_PARSER)
+        self.rels = package.get_rels(part_name)
+        self.sp_tree = self.root.find(f'{{{NS_P}}}cSld/{{{NS_P}}}spTree')
+
+    def pictures(self):
+        """Top-level <p:pic> shapes that are not placeholders (shape_type 13)"""
+        return [pic for pic in self.sp_tree.iterchildren(f'{{{NS_P}}}pic')
+                if pic.find(f'{{{NS_P}}}nvPicPr/{{{NS_P}}}nvPr/{{{NS_P}}}ph') is None]
+
+    def has_text_content(self):
+        """Some top-level text shape has non-blank text"""
+        for sp in self.sp_tree.iterchildren(f'{{{NS_P}}}sp'):
+            if any((t.text or '').strip() for t in sp.iter(f'{{{NS_A}}}t')):
+                return True
+        return False
+
+    def next_shape_id(self):
+        ids = [int(value) for value in self.root.xpath('//@id') if value.isdigit()]
+        return max(ids) + 1 if ids else 1
+
+    def store(self, package):
+        package.parts[self.part_name] = etree.tostring(self.root, encoding='UTF-8', standalone=True)
+        package.set_rels(self.part_name, self.rels)
+
+
+def _inject_picture(package, slide, image_path, left, top, height, descriptions):
+    """Picture of image_path on slide at (left, top), height tall, like add_picture()"""
+    cx, cy = display_size(image_path, height=height)
+    data = downscale(image_path, cx, cy, active_profile())
+    from_file = data is None
+    if from_file:
+        with open(image_path, 'rb') as f:
+            data = f.read()
+
+    # Identical bytes already in the deck are reused, as python-pptx does
+    media_part = package.find_media(data)
+    if media_part is None:
+        extension, content_type = IMAGE_FORMATS[data_format(data)]
+        media_part = package.next_image_part_name(extension)
+        package.parts[media_part] = data
+        package.ensure_default(extension, content_type)
+        descriptions[media_part] = os.path.basename(image_path) if from_file else f'image.{extension}'
+    descr = descriptions.get(media_part) or 'image.' + media_part.rsplit('.', 1)[-1]
+
+    for rel in slide.rels:
+        if (rel['Type'] == RT_IMAGE and rel.get('TargetMode') != 'External'
+                and package.resolve(slide.part_name, rel['Target']) == media_part):
+            rel_id = rel['Id']
+            break
+    else:
+        rel_id = package.next_rel_id(slide.rels)
+        slide.rels.append({'Id': rel_id, 'Type': RT_IMAGE,
+                           'Target': package.relative(slide.part_name, media_part)})
+
+    pic = etree.fromstring(ooxml_shapes.picture(slide.next_shape_id(), rel_id, left, top, cx, cy, descr))
+    ext_lst = slide.sp_tree.find(f'{{{NS_P}}}extLst')
+    if ext_lst is None:
+        slide.sp_tree.append(pic)
+    else:
+        ext_lst.addprevious(pic)
+
+def inject_images_zip(pptx_path, image_mappings, images_dir):
+    """add_images_to_pptx() patched into the zip: same pictures, nothing else rewritten
+
+    Only the affected slides, their relationships, the content types and the
+    new ppt/media entries are written; every other entry is copied across
+    still compressed.
+    """
+    print(f"\n{'='*60}")
+    print(f"Adding images to PPTX (zip patch)")
+    print(f"{'='*60}\n")
+
+    images_added = 0
+    images_skipped = 0
+    output_path = pptx_path.replace('_converted.pptx', '_with_all_images.pptx')
+
+    with ZipPackage.open(pptx_path) as package:
+        slide_parts = package.slide_parts()
+        slides = {}
+        descriptions = {}
+
+        for mapping in image_mappings:
+            slide_num = mapping['slide_num']
+            image_path = mapping['image_path']
+            is_full_image = mapping['is_full_image']
+
+            slide_idx = slide_num - 1
+
+            if slide_idx >= len(slide_parts):
+                print(f"⚠ Slide {slide_num} not found in PPTX, skipping")
+                images_skipped += 1
+                continue
+
+            # Missing images are listed together at the end
+            full_image_path = resolve_asset(images_dir, image_path, f"slide {slide_num}")
+
+            if full_image_path is None:
+                images_skipped += 1
+                continue
+
+            part_name = slide_parts[slide_idx]
+            if part_name not in slides:
+                slides[part_name] = _SlideXml(package, part_name)
+            slide = slides[part_name]
+
+            try:
+                if is_full_image:
+                    # Same placement as add_images_to_pptx(): replace existing pictures
+                    for pic in slide.pictures():
+                        slide.sp_tree.remove(pic)
+                    _inject_picture(package, slide, full_image_path,
+                                    Inches(0.5), Inches(1.0), Inches(6.5), descriptions)
+                    print(f"✓ Added FULL image to slide {slide_num}: {image_path}")
+                elif slide.has_text_content():
+                    _inject_picture(package, slide, full_image_path,
+                                    Inches(7.5), Inches(2.0), Inches(4.0), descriptions)
+                    print(f"✓ Added image to slide {slide_num}: {image_path}")
+                else:
+                    _inject_picture(package, slide, full_image_path,
+                                    Inches(2.5), Inches(2.0), Inches(4.5), descriptions)
+                    print(f"✓ Added image to slide {slide_num}: {image_path}")
+                images_added += 1
+
+            except Exception as e:
+                print(f"✗ Error adding image {image_path} to slide {slide_num}: {e}")
+                images_skipped += 1
+
+        for slide in slides.values():
+            slide.store(package)
+        package.save(output_path)
+
+    print(f"\n{'='*60}")
+    print(f"Summary")
+    print(f"{'='*60}")
+    print(f"✅ Images added: {images_added}")
+    print(f"⚠️  Images skipped: {images_skipped}")
+    print(f"📁 Output file: {output_path}")
+    print(f"📊 File size: {os.path.getsize(output_path) / (1024*1024):.1f} MB")
+    print(f"{'='*60}\n")
+
+    return output_path
+
 def main():
+    zip_patch = '--zip-patch' in sys.argv[1:]
+
     base_dir = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle'
     pptx_path = os.path.join(base_dir, 'presentation_converted.pptx')
     images_dir = os.path.join(base_dir, 'images')
@@ -165,7 +311,13 @@ def main():
     print(f"   Found {len(image_mappings)} image references in HTML\n")
 
     print("🖼️  Step 2: Embedding images into PPTX...")
-    output_path = add_images_to_pptx(pptx_path, image_mappings, images_dir)
+    if zip_patch:
+        output_path = inject_images_zip(pptx_path, image_mappings, images_dir)
+    else:
+        output_path = add_images_to_pptx(pptx_path, image_mappings, images_dir)
+
+    report_missing_assets()
+    print_image_report()
 
     print("\n✅ COMPLETE! Your PPTX now has all images embedded.")
     print(f"📁 Open: {output_path}")
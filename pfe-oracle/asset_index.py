@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Indexed asset resolver
+An asset directory is scanned once with os.scandir into an index of its files
+(relative path, normalized name, size, mtime; content hash on demand), so
+resolving an <img src> is a dict lookup instead of a stat per reference.
+Lookups fall back to the normalized name (URL-decoded, case-folded, runs of
+whitespace collapsed and trimmed around the extension, .jpeg = .jpg), which
+catches near-misses like "class diagram.png" for "class diagram .png".
+Directories are re-scanned only when their mtime changes, and references that
+can't be resolved are collected and reported in one batch
+"""
+
+import os
+import unicodedata
+from dataclasses import dataclass
+from urllib.parse import unquote
+
+from image_cache import source_hash
+
+EXTENSION_ALIASES = {'jpeg': 'jpg', 'tif': 'tiff'}
+
+
+@dataclass(slots=True)
+class Asset:
+    """One indexed file; size and mtime are from the scan"""
+    path: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def digest(self):
+        """SHA-256 of the file (memoized per size and mtime)"""
+        return source_hash(self.path)
+
+
+def normalize_name(name):
+    """Lookup key for one path component: 'Class  Diagram .PNG' -> 'class diagram.png'"""
+    name = unicodedata.normalize('NFC', unquote(name)).casefold()
+    stem, dot, extension = name.rpartition('.')
+    if not dot or not stem.strip():
+        return ' '.join(name.split())
+    extension = extension.strip()
+    return f"{' '.join(stem.split())}.{EXTENSION_ALIASES.get(extension, extension)}"
+
+
+def normalize_path(relative_path):
+    return '/'.join(normalize_name(part) for part in relative_path.split('/') if part)
+
+
+class AssetIndex:
+    """Files under one asset directory, by relative path and by normalized path"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.assets = {}
+        self.normalized = {}
+        # directory -> (mtime_ns when scanned, relative paths of its files)
+        self.directories = {}
+        # src -> places it was referenced from, for report_missing()
+        self.missing = {}
+        self._scan(self.root)
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def _forget(self, directory):
+        _, files = self.directories.pop(directory, (None, []))
+        for relative_path in files:
+            asset = self.assets.pop(relative_path, None)
+            key = normalize_path(relative_path)
+            if asset is not None and self.normalized.get(key) is asset:
+                del self.normalized[key]
+
+    def _scan(self, directory):
+        """(Re)index the files of directory, and subdirectories not indexed yet"""
+        self._forget(directory)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        files = []
+        for entry in entries:
+            if entry.is_dir():
+                if entry.path not in self.directories:
+                    self._scan(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                relative_path = self._relative(entry.path)
+                asset = Asset(entry.path, stat.st_size, stat.st_mtime_ns)
+                self.assets[relative_path] = asset
+                # First file wins when two names normalize the same way
+                self.normalized.setdefault(normalize_path(relative_path), asset)
+                files.append(relative_path)
+        self.directories[directory] = (mtime_ns, files)
+
+    def refresh(self):
+        """Re-scan directories whose mtime changed (files added, removed or renamed)
+
+        Returns the number of directories re-scanned.
+        """
+        rescanned = 0
+        for directory, (mtime_ns, _) in list(self.directories.items()):
+            try:
+                changed = os.stat(directory).st_mtime_ns != mtime_ns
+            except FileNotFoundError:
+                self._forget(directory)
+                rescanned += 1
+                continue
+            if changed:
+                self._scan(directory)
+                rescanned += 1
+        if self.root not in self.directories and os.path.isdir(self.root):
+            self._scan(self.root)
+            rescanned += 1
+        return rescanned
+
+    def lookup(self, src):
+        """Asset for an <img src> (relative to the root or to its parent), or None"""
+        relative_path = src.strip().replace('\\', '/')
+        if os.path.isabs(relative_path):
+            relative_path = self._relative(relative_path)
+        while relative_path.startswith('./'):
+            relative_path = relative_path[2:]
+        # 'images/x.png' in the HTML is relative to the images directory's parent
+        prefix = os.path.basename(self.root) + '/'
+        if relative_path.startswith(prefix) and relative_path not in self.assets:
+            relative_path = relative_path[len(prefix):]
+
+        asset = self.assets.get(relative_path)
+        if asset is None:
+            asset = self.normalized.get(normalize_path(relative_path))
+        return asset
+
+    def resolve(self, src, where=None):
+        """Path of the file src refers to, or None (recorded for report_missing())"""
+        asset = self.lookup(src)
+        if asset is None and self.refresh():
+            asset = self.lookup(src)
+        if asset is None:
+            places = self.missing.setdefault(src, [])
+            if where is not None and where not in places:
+                places.append(where)
+            return None
+        return asset.path
+
+
+# Root directory -> AssetIndex, shared by everything in this process
+_indexes = {}
+
+
+def asset_index(root):
+    """The process-wide AssetIndex of root, scanned on first use"""
+    root = os.path.abspath(str(root))
+    index = _indexes.get(root)
+    if index is None:
+        index = _indexes[root] = AssetIndex(root)
+    return index
+
+
+def resolve_asset(root, src, where=None):
+    """Path of src under the asset directory root, or None if it can't be found"""
+    return asset_index(root).resolve(src, where)
+
+
+def report_missing_assets():
+    """Print every unresolved reference of this run in one block; returns how many"""
+    missing = [(index, src, places) for index in _indexes.values()
+               for src, places in index.missing.items()]
+    if not missing:
+        return 0
+
+    print(f"\n⚠️  {len(missing)} asset reference(s) could not be resolved:")
+    for index, src, places in missing:
+        where = f" ({', '.join(places)})" if places else ''
+        print(f"   {src}{where} — not in {index.root}")
+    return len(missing)
+
+
+def missing_assets():
+    """{root: {src: places}} of this process, for a parent process to merge_missing_assets()"""
+    return {root: {src: list(places) for src, places in index.missing.items()}
+            for root, index in _indexes.items() if index.missing}
+
+
+def merge_missing_assets(missing):
+    """Add references a worker process couldn't resolve to this run's report"""
+    for root, references in missing.items():
+        index = asset_index(root)
+        for src, places in references.items():
+            known = index.missing.setdefault(src, [])
+            known.extend(place for place in places if place not in known)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Offline asset vendoring
+External fonts, stylesheets and scripts (Google Fonts, the Tailwind CDN) are
+kept in a content-addressed AssetStore: objects/<sha256> plus a manifest of
+original URL -> digest and digest -> content type. The store is filled ahead
+of time, from a local mirror directory (the host/path layout `wget -x`
+writes) or by --fetch on a machine with network access, and decks are
+rewritten to point at https://pfe-assets.invalid/<sha256> URLs. Stylesheets
+are stored with their relative url(...)/@import references made absolute, so
+they still resolve when served from that origin.
+
+At render time route_page() answers every http(s) request of a Playwright
+page from the store, by those URLs or by the original ones (e.g. the font
+files a vendored stylesheet links to); anything not in the store is aborted
+instead of fetched. The .invalid domain never resolves, so a vendored deck
+opened without the router fails fast rather than waiting on the network.
+
+    python asset_vendor.py --from=/mnt/mirror presentation_print.html
+    python asset_vendor.py --fetch presentation_print.html
+"""
+
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import re
+import sys
+import tempfile
+import urllib.request
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+ASSET_STORE_DIR = os.environ.get('PFE_ASSET_STORE',
+                                 os.path.join(os.path.expanduser('~'), '.cache', 'pfe-oracle', 'assets'))
+
+# Origin of rewritten URLs; .invalid is reserved and never resolves
+VENDOR_ORIGIN = 'https://pfe-assets.invalid/'
+
+# External URLs a deck loads: <script src>, <link href> (but not resource
+# hints, which load nothing), url(...) and @import in CSS
+TAG = re.compile(r'<(?:script|link)\b[^>]*>', re.I)
+TAG_URL = re.compile(r'''(\b(?:src|href)\s*=\s*["'])(https?://[^"']+)''', re.I)
+HINT_REL = re.compile(r'''\brel\s*=\s*["'][^"']*\b(?:preconnect|dns-prefetch)\b''', re.I)
+CSS_URL = re.compile(r'''(url\(\s*["']?|@import\s+["'])([^"')\s]+)''', re.I)
+
+# Google Fonts serves woff2 @font-face rules only to browsers that support them
+FETCH_USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                    '(KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+
+FONT_SIGNATURES = {b'wOF2': 'font/woff2', b'wOFF': 'font/woff', b'OTTO': 'font/otf',
+                   b'\x00\x01\x00\x00': 'font/ttf'}
+
+
+def normalize_url(url):
+    """URL as the browser requests it: no fragment, '/' for an empty path"""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=parts.path or '/', fragment=''))
+
+
+def guess_content_type(url, data):
+    """Content type of an asset, from the URL's extension or else the bytes"""
+    content_type, _ = mimetypes.guess_type(urlsplit(url).path)
+    if content_type:
+        return content_type
+    if data[:4] in FONT_SIGNATURES:
+        return FONT_SIGNATURES[data[:4]]
+
+    head = data[:4096].lstrip()
+    if head.startswith(b'<'):
+        return 'text/html'
+    if head.startswith(b'@') or b'@font-face' in head:
+        return 'text/css'
+    return 'application/javascript'
+
+
+def css_urls(css_text, base_url):
+    """Absolute http(s) URLs referenced by url(...) and @import in a stylesheet"""
+    urls = []
+    for _, ref in CSS_URL.findall(css_text):
+        url = urljoin(base_url, ref)
+        if url.startswith(('http://', 'https://')):
+            urls.append(url)
+    return urls
+
+
+def absolutize_css(css_text, base_url):
+    """css_text with its relative url(...) and @import references made absolute
+
+    A vendored stylesheet is served from VENDOR_ORIGIN, where a reference
+    like ../webfonts/x.woff2 would no longer point under its original URL.
+    """
+    def absolutize(match):
+        ref = match.group(2)
+        if ref.startswith('#'):
+            return match.group(0)  # fragment of the document using the style (SVG filters...)
+        return match.group(1) + urljoin(base_url, ref)
+
+    return CSS_URL.sub(absolutize, css_text)
+
+
+def external_urls(html_text):
+    """External script, stylesheet and font URLs of a deck, in document order"""
+    urls = [url for tag in TAG.findall(html_text) if not HINT_REL.search(tag)
+            for _, url in TAG_URL.findall(html.unescape(tag))]
+    return list(dict.fromkeys(urls + css_urls(html_text, '')))
+
+
+class AssetStore:
+    """Content-addressed store of external assets, looked up by original or vendored URL"""
+
+    def __init__(self, store_dir=ASSET_STORE_DIR):
+        self.store_dir = store_dir
+        self.manifest_path = os.path.join(store_dir, 'manifest.json')
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        # original URL -> digest; digest -> content type
+        self.urls = manifest.get('urls', {})
+        self.types = manifest.get('types', {})
+        self._objects = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.store_dir, 'objects', digest[:2], digest)
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def add(self, url, data, content_type=None):
+        """Store data as the content of url; returns its digest
+
+        Stylesheets are stored with absolute references (see absolutize_css()).
+        """
+        content_type = content_type or guess_content_type(url, data)
+        if content_type == 'text/css':
+            css_text = data.decode('utf-8', 'surrogateescape')
+            data = absolutize_css(css_text, url).encode('utf-8', 'surrogateescape')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_atomic(path, data)
+        self.urls[normalize_url(url)] = digest
+        self.types[digest] = content_type
+        return digest
+
+    def save(self):
+        """Write the manifest (atomic rename)"""
+        manifest = {'urls': dict(sorted(self.urls.items())), 'types': dict(sorted(self.types.items()))}
+        self._write_atomic(self.manifest_path, json.dumps(manifest, indent=1).encode('utf-8'))
+
+    def digest_for(self, url):
+        """Digest behind an original or vendored URL, or None"""
+        if url.startswith(VENDOR_ORIGIN):
+            digest = urlsplit(url).path.rsplit('/', 1)[-1]
+            return digest if digest in self.types else None
+        return self.urls.get(normalize_url(url))
+
+    def get(self, url):
+        """(bytes, content type) for an original or vendored URL, or None"""
+        digest = self.digest_for(url)
+        if digest is None:
+            return None
+        data = self._objects.get(digest)
+        if data is None:
+            try:
+                with open(self._object_path(digest), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return None
+            self._objects[digest] = data
+        return data, self.types[digest]
+
+    def missing(self, urls, vendored=False):
+        """The URLs of urls (and of the stylesheets among them) not in the store
+
+        vendored: urls are original URLs that a vendor_html() copy loads through
+        their vendored URLs, so references inside those stylesheets are resolved
+        against the vendored URL, as the browser will.
+        """
+        missing = []
+        pending = []
+        for url in urls:
+            digest = self.digest_for(url) if vendored else None
+            pending.append((url, VENDOR_ORIGIN + digest if digest else url))
+        seen = set()
+        while pending:
+            url, base_url = pending.pop(0)
+            if url in seen:
+                continue
+            seen.add(url)
+            asset = self.get(url)
+            if asset is None:
+                missing.append(url)
+            elif asset[1] == 'text/css':
+                pending += [(ref, ref) for ref in css_urls(asset[0].decode('utf-8', 'replace'), base_url)]
+        return missing
+
+
+# ---------------------------------------------------------------------------
+# Populating the store
+# ---------------------------------------------------------------------------
+
+def populate_from_directory(store, mirror_dir, scheme='https'):
+    """Add every file of a host/path mirror (as `wget -x` lays it out); returns the count
+
+    mirror/fonts.googleapis.com/css2?family=Inter becomes
+    https://fonts.googleapis.com/css2?family=Inter and host/index.html the
+    host's root URL.
+    """
+    added = 0
+    for directory, _, files in os.walk(mirror_dir):
+        for name in files:
+            path = os.path.join(directory, name)
+            relative_path = os.path.relpath(path, mirror_dir).replace(os.sep, '/')
+            if '/' not in relative_path:
+                continue  # files outside a host directory
+            if relative_path.endswith('/index.html'):
+                relative_path = relative_path[:-len('index.html')]
+            with open(path, 'rb') as f:
+                data = f.read()
+            url = f"{scheme}://{relative_path}"
+            store.add(url, data)
+            added += 1
+    return added
+
+
+def fetch_missing(store, urls):
+    """Download the URLs of urls missing from the store, following stylesheets
+
+    For connected machines only, ahead of time; rendering never downloads.
+    Returns the URLs that could not be fetched.
+    """
+    failed = []
+    for url in store.missing(urls):
+        try:
+            request = urllib.request.Request(url, headers={'User-Agent': FETCH_USER_AGENT})
+            with urllib.request.urlopen(request, timeout=30) as response:
+                data = response.read()
+                content_type = response.headers.get_content_type()
+        except OSError as e:
+            print(f"   ✗ {url}: {e}")
+            failed.append(url)
+            continue
+
+        store.add(url, data, content_type)
+        print(f"   ✓ {url} ({len(data) / 1024:.0f} KB)")
+        if content_type == 'text/css':
+            failed += fetch_missing(store, css_urls(data.decode('utf-8', 'replace'), url))
+    return failed
+
+
+# ---------------------------------------------------------------------------
+# Rewriting and serving
+# ---------------------------------------------------------------------------
+
+def vendor_html(html_path, store, output_path=None):
+    """Rewrite a deck's external URLs to vendored ones; returns (output path, missing URLs)
+
+    The copy is written next to the original (<name>_offline.html) so its
+    relative image paths still resolve.
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html_text = f.read()
+
+    def rewrite(match):
+        url = html.unescape(match.group(2))
+        digest = store.digest_for(url) if url.startswith(('http://', 'https://')) else None
+        return match.group(1) + (VENDOR_ORIGIN + digest if digest else match.group(2))
+
+    def rewrite_tag(match):
+        tag = match.group(0)
+        return tag if HINT_REL.search(tag) else TAG_URL.sub(rewrite, tag)
+
+    vendored = TAG.sub(rewrite_tag, html_text)
+    vendored = CSS_URL.sub(rewrite, vendored)
+
+    if output_path is None:
+        root, extension = os.path.splitext(html_path)
+        output_path = f"{root}_offline{extension}"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(vendored)
+    return output_path, store.missing(external_urls(html_text), vendored=True)
+
+
+async def route_page(page, store):
+    """Serve every http(s) request of page from store; block the rest
+
+    Call before page.goto(). Local (file:, data:) requests pass through.
+    """
+    async def handle(route):
+        url = route.request.url
+        if not url.startswith(('http://', 'https://')):
+            await route.continue_()
+            return
+        asset = store.get(url)
+        if asset is None:
+            await route.abort('blockedbyclient')
+            return
+        data, content_type = asset
+        # Fonts are loaded cross-origin from a file:// page
+        await route.fulfill(status=200, body=data, content_type=content_type,
+                            headers={'Access-Control-Allow-Origin': '*'})
+
+    await page.route('**/*', handle)
+
+
+def main():
+    fetch = '--fetch' in sys.argv[1:]
+    mirror_dir = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--from=')), None)
+    html_paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not html_paths:
+        html_paths = ['/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation_print.html']
+
+    print("=" * 60)
+    print("Offline asset vendoring")
+    print("=" * 60)
+
+    store = AssetStore()
+    print(f"\n📦 Store: {store.store_dir} ({len(store.urls)} URLs)")
+
+    if mirror_dir:
+        print(f"\n📂 Importing mirror {mirror_dir}...")
+        print(f"   {populate_from_directory(store, mirror_dir)} file(s) imported")
+
+    if fetch:
+        print("\n🌐 Fetching missing assets...")
+        for html_path in html_paths:
+            with open(html_path, 'r', encoding='utf-8') as f:
+                fetch_missing(store, external_urls(f.read()))
+    store.save()
+
+    print("\n✏️  Rewriting decks...")
+    all_missing = {}
+    for html_path in html_paths:
+        output_path, missing = vendor_html(html_path, store)
+        print(f"   {os.path.basename(html_path)} → {os.path.basename(output_path)}")
+        for url in missing:
+            all_missing.setdefault(url, []).append(os.path.basename(html_path))
+
+    if all_missing:
+        print(f"\n⚠️  {len(all_missing)} asset(s) not in the store (they will be blocked when rendering):")
+        for url, decks in all_missing.items():
+            print(f"   {url} ({', '.join(decks)})")
+        sys.exit(1)
+    print("\n✅ Every external asset is vendored")
+
+
+if __name__ == "__main__":
+    main()
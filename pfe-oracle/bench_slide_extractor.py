@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: backtracking slide regex vs single-pass slide extractor
+Builds synthetic card-heavy decks of growing size and times both approaches
+"""
+
+import re
+import time
+
+from slide_extractor import extract_slides
+
+# The pattern previously used by add_images_to_pptx.parse_html_for_images
+LEGACY_SLIDES_PATTERN = r'<div class="slide[^"]*"[^>]*>(.*?)</div>\s*(?=<div class="slide|<script)'
+LEGACY_IMG_PATTERN = r'<img[^>]+src="([^"]+)"'
+
+
+def build_deck(num_slides, cards_per_slide):
+    """Build a synthetic deck with card grids and one image per slide"""
+    parts = ['<html><body><div id="slides-container">']
+    for idx in range(num_slides):
+        parts.append(f'<!-- Slide {idx + 1} -->')
+        parts.append('<div class="slide content-slide">')
+        parts.append(f'<h2 class="slide-title">Slide {idx}</h2>')
+        parts.append('<div class="slide-content"><div class="card-grid">')
+        for card in range(cards_per_slide):
+            parts.append('<div class="card">')
+            parts.append(f'<div class="card-title">Card {card}</div>')
+            parts.append('<div class="card-content">Lorem ipsum dolor sit amet</div>')
+            parts.append('</div>')
+        parts.append('</div>')
+        parts.append(f'<div class="image-container"><img src="images/img_{idx}.png" alt="Image {idx}"></div>')
+        parts.append('</div></div>')
+    parts.append('</div><script>console.log("end")</script></body></html>')
+    return '\n'.join(parts)
+
+
+def legacy_extract(html_content):
+    """Slide/image extraction as done by the old regex"""
+    slides = re.findall(LEGACY_SLIDES_PATTERN, html_content, re.DOTALL)
+    return [re.findall(LEGACY_IMG_PATTERN, slide) for slide in slides]
+
+
+def legacy_extract_uncommented(html_content):
+    """Old regex on a deck without comments between slides (its best case)"""
+    return legacy_extract(re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL))
+
+
+def time_call(func, *args, repeat=3):
+    """Best-of-N wall clock time in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    print("=" * 70)
+    print("Slide extraction benchmark: legacy regex vs single-pass extractor")
+    print("=" * 70)
+    print(f"{'slides':>7} {'cards':>6} {'KB':>6} | {'regex ms':>9} {'found':>6} | "
+          f"{'no-comment ms':>13} {'found':>6} | {'extractor ms':>12} {'found':>6}")
+
+    for num_slides in (25, 50, 100, 200, 400):
+        for cards in (6, 24):
+            html_content = build_deck(num_slides, cards)
+            regex_ms, regex_slides = time_call(legacy_extract, html_content)
+            bare_ms, bare_slides = time_call(legacy_extract_uncommented, html_content)
+            extractor_ms, slides = time_call(extract_slides, html_content)
+
+            print(f"{num_slides:>7} {cards:>6} {len(html_content) / 1024:>6.0f} | "
+                  f"{regex_ms:>9.1f} {len(regex_slides):>6} | "
+                  f"{bare_ms:>13.1f} {len(bare_slides):>6} | "
+                  f"{extractor_ms:>12.1f} {len(slides):>6}")
+
+    print("=" * 70)
+    print("'found' is the number of slides each approach splits the deck into.")
+    print("With comments between slides (as in presentation.html) the regex")
+    print("lookahead never matches and the whole deck collapses into one slide.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Pool of pre-warmed Chromium browsers (async Playwright)
+Launching Chromium costs far more than printing a deck, so a BrowserPool
+launches its browsers once and hands out pages on them. Each browser serves
+up to pages_per_browser pages at a time and is closed and relaunched in the
+background after max_jobs pages (or as soon as it disconnects) to bound
+leaks; if a relaunch fails the pool carries on with one browser less, and
+page() raises once no browser is left. Defaults come from the environment:
+
+    PFE_BROWSER_POOL_SIZE     browsers kept running (default: min(4, CPUs))
+    PFE_PAGES_PER_BROWSER     concurrent pages per browser (default: 2)
+    PFE_BROWSER_MAX_JOBS      pages served before a browser is recycled (default: 50)
+
+    async with BrowserPool() as pool:
+        async with pool.page() as page:
+            await page.goto(url)
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"{name} must be at least 1, got {value!r}")
+    return number
+
+
+@dataclass(slots=True, eq=False)
+class _PooledBrowser:
+    """One launched browser and its bookkeeping"""
+    browser: object
+    active: int = 0
+    jobs: int = 0
+    retiring: bool = False
+
+
+class BrowserPool:
+    """Pre-launched Chromium browsers handing out pages, recycled every max_jobs pages"""
+
+    def __init__(self, size=None, pages_per_browser=None, max_jobs=None, launch_options=None):
+        self.size = size or _env_int('PFE_BROWSER_POOL_SIZE', min(4, os.cpu_count() or 1))
+        self.pages_per_browser = pages_per_browser or _env_int('PFE_PAGES_PER_BROWSER', 2)
+        self.max_jobs = max_jobs or _env_int('PFE_BROWSER_MAX_JOBS', 50)
+        self.launch_options = launch_options or {}
+        self.launches = 0
+        self.jobs = 0
+        self._playwright = None
+        self._browsers = []
+        self._launching = 0
+        self._replacing = set()  # background _replace() tasks
+        self._changed = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _launch(self):
+        browser = await self._playwright.chromium.launch(**self.launch_options)
+        self.launches += 1
+        return _PooledBrowser(browser)
+
+    async def start(self):
+        """Start Playwright and launch every browser of the pool in parallel"""
+        from playwright.async_api import async_playwright
+
+        self._changed = asyncio.Condition()
+        self._playwright = await async_playwright().start()
+        try:
+            self._browsers = list(await asyncio.gather(*(self._launch() for _ in range(self.size))))
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self):
+        """Wait for pending relaunches, then close every browser and stop Playwright"""
+        await asyncio.gather(*self._replacing, return_exceptions=True)
+        browsers, self._browsers = self._browsers, []
+        await asyncio.gather(*(pooled.browser.close() for pooled in browsers), return_exceptions=True)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _acquire(self):
+        """The least busy browser with a free page slot, waiting for one if needed"""
+        async with self._changed:
+            while True:
+                ready = [pooled for pooled in self._browsers
+                         if not pooled.retiring and pooled.active < self.pages_per_browser]
+                if ready:
+                    pooled = min(ready, key=lambda candidate: candidate.active)
+                    pooled.active += 1
+                    return pooled
+                if not self._browsers and not self._launching:
+                    raise RuntimeError("No browser left in the pool (relaunching failed)")
+                await self._changed.wait()
+
+    async def _release(self, pooled):
+        async with self._changed:
+            pooled.active -= 1
+            pooled.jobs += 1
+            self.jobs += 1
+            if pooled.jobs >= self.max_jobs or not pooled.browser.is_connected():
+                pooled.retiring = True
+            recycle = pooled.retiring and pooled.active == 0 and pooled in self._browsers
+            if recycle:
+                self._browsers.remove(pooled)
+                self._launching += 1
+            self._changed.notify_all()
+
+        if recycle:
+            # In the background: the job that retired the browser doesn't wait for a launch
+            task = asyncio.create_task(self._replace(pooled))
+            self._replacing.add(task)
+            task.add_done_callback(self._replacing.discard)
+
+    async def _replace(self, pooled):
+        """Close a retired browser and launch its replacement; the pool shrinks if that fails
+
+        Never raises for a failed launch: the job that retired the browser has
+        already succeeded.
+        """
+        replacement = None
+        try:
+            replacement = await self._launch()
+        except Exception as e:
+            print(f"⚠️  Couldn't relaunch a pooled browser ({self.size - 1} left): {e}")
+        finally:
+            await asyncio.gather(pooled.browser.close(), return_exceptions=True)
+            async with self._changed:
+                self._launching -= 1
+                if replacement is None:
+                    self.size -= 1
+                else:
+                    self._browsers.append(replacement)
+                self._changed.notify_all()
+
+    @asynccontextmanager
+    async def page(self, **page_options):
+        """A fresh page (in its own context) on a pooled browser, closed on exit
+
+        page_options go to browser.new_page() (viewport, device_scale_factor...).
+        """
+        pooled = await self._acquire()
+        try:
+            page = await pooled.browser.new_page(**page_options)
+        except BaseException:
+            pooled.retiring = True
+            await self._release(pooled)
+            raise
+        try:
+            yield page
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pooled.retiring = True
+            await self._release(pooled)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+One-pass CSS class / tag index over a BeautifulSoup tree
+Replaces repeated find()/find_all() subtree walks: the tree is walked once,
+every Tag gets its pre-order position and subtree span, and lookups
+(optionally restricted to the subtree of any indexed Tag) become a dict
+access plus a bisect
+"""
+
+from bisect import bisect_right
+
+
+class ClassIndex:
+    """Index of a tree's Tags by CSS class and by tag name, in document order"""
+
+    def __init__(self, root):
+        self.root = root
+        self._spans = {}      # id(tag) -> [position, last descendant position]
+        self._by_class = {}   # class -> ([positions], [tags])
+        self._by_tag = {}     # tag name -> ([positions], [tags])
+        self._build()
+
+    def _add(self, table, key, position, tag):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = ([], [])
+        entry[0].append(position)
+        entry[1].append(tag)
+
+    def _build(self):
+        position = 0
+        self._spans[id(self.root)] = [0, 0]
+        stack = [(self.root, iter(self.root.children))]
+
+        while stack:
+            elem, children = stack[-1]
+            for child in children:
+                if child.name is None:  # Text, comment, ...
+                    continue
+                position += 1
+                self._spans[id(child)] = [position, position]
+                self._add(self._by_tag, child.name, position, child)
+                for css_class in child.get('class', []):
+                    self._add(self._by_class, css_class, position, child)
+                stack.append((child, iter(child.children)))
+                break
+            else:
+                stack.pop()
+                self._spans[id(elem)][1] = position
+
+    def _candidates(self, class_, name):
+        """Smallest position/tag lists that can satisfy the query"""
+        if class_ is not None:
+            return self._by_class.get(class_, ((), ())), name
+        return self._by_tag.get(name, ((), ())), None
+
+    def _range(self, positions, within):
+        """Slice of positions strictly inside within's subtree"""
+        if within is None:
+            return 0, len(positions)
+        start, end = self._spans[id(within)]
+        return bisect_right(positions, start), bisect_right(positions, end)
+
+    def find_all(self, name=None, class_=None, within=None):
+        """All Tags matching name and/or class_, in document order
+
+        With within, only descendants of that (indexed) Tag are returned,
+        like within.find_all(name, class_=class_).
+        """
+        (positions, tags), name_filter = self._candidates(class_, name)
+        lo, hi = self._range(positions, within)
+        if name_filter is None:
+            return list(tags[lo:hi])
+        return [tag for tag in tags[lo:hi] if tag.name == name_filter]
+
+    def find(self, name=None, class_=None, within=None):
+        """First Tag matching name and/or class_, or None (like Tag.find)"""
+        (positions, tags), name_filter = self._candidates(class_, name)
+        lo, hi = self._range(positions, within)
+        for idx in range(lo, hi):
+            if name_filter is None or tags[idx].name == name_filter:
+                return tags[idx]
+        return None
+
+    def classes(self):
+        """Every CSS class present in the tree with its element count"""
+        return {css_class: len(entry[1]) for css_class, entry in self._by_class.items()}
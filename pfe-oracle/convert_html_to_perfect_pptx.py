@@ -6,11 +6,21 @@ Creates a pixel-perfect PPTX that matches the HTML presentation exactly
 
 import os
 import re
+import sys
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
-from bs4 import BeautifulSoup
+
+from asset_index import asset_index, report_missing_assets, resolve_asset
+from deck_variants import VARIANTS, PictureLog, parse_variants, variant_path
+from image_geometry import fit, probe
+from image_pipeline import ImagePrefetcher, add_fitted_picture, add_picture, display_size, print_image_report
+from incremental_pptx import convert_incremental
+from slide_ir import load_deck
+
+# Identifies this renderer in incremental builds; bump when slide rendering changes
+RENDERER_ID = 'convert_html_to_perfect_pptx/1'
 
 # Colors from HTML
 TEAL = RGBColor(20, 83, 95)  # #14535F
@@ -20,40 +30,19 @@ GRAY = RGBColor(51, 65, 85)  # #334155
 LIGHT_GRAY = RGBColor(248, 250, 252)  # #f8fafc
 WHITE = RGBColor(255, 255, 255)
 
+BASE_DIR = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle'
+
+# Picture sizes, shared by the slide builders and image_requests()
+LOGO_HEIGHT = Inches(1.0)
+TOOL_ICON_HEIGHT = Inches(0.8)
+FULL_IMAGE_MARGIN = Inches(1.0)
+FULL_IMAGE_HEIGHT = Inches(6.0)
+
 def parse_html_slides():
-    """Parse HTML and extract all slides with their content"""
-    with open('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html', 'r', encoding='utf-8') as f:
-        html_content = f.read()
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    slides_container = soup.find('div', id='slides-container')
-    slides = slides_container.find_all('div', class_='slide', recursive=False)
-
-    parsed_slides = []
-
-    for idx, slide in enumerate(slides, 1):
-        slide_data = {
-            'number': idx,
-            'classes': slide.get('class', []),
-            'content': slide,
-            'type': None
-        }
-
-        # Determine slide type
-        if 'title-slide' in slide_data['classes']:
-            slide_data['type'] = 'title'
-        elif 'divider-slide' in slide_data['classes']:
-            slide_data['type'] = 'divider'
-        elif 'full-image-slide' in slide_data['classes']:
-            slide_data['type'] = 'full-image'
-        elif 'content-slide' in slide_data['classes']:
-            slide_data['type'] = 'content'
-
-        parsed_slides.append(slide_data)
-
-    return parsed_slides
-
-def create_title_slide(prs, slide_data):
+    """Parse HTML and extract all slides into the compact slide IR"""
+    return load_deck('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html')
+
+def create_title_slide(prs, slide_data, images_dir):
     """Create title slide with logos"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
 
@@ -64,47 +53,41 @@ def create_title_slide(prs, slide_data):
     fill.fore_color.rgb = TEAL
 
     # Add logos
-    logo_container = slide_data['content'].find('div', class_='logo-container')
-    if logo_container:
-        imgs = logo_container.find_all('img')
+    if slide_data.logos:
         x_pos = Inches(2.5)
-        for img in imgs:
-            img_src = img.get('src', '')
-            img_path = os.path.join('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle', img_src)
-            if os.path.exists(img_path):
+        for logo in slide_data.logos:
+            img_path = resolve_asset(images_dir, logo.src, f"slide {slide_data.number}")
+            if img_path:
                 try:
-                    slide.shapes.add_picture(img_path, x_pos, Inches(0.5), height=Inches(1.0))
+                    add_picture(slide.shapes, img_path, x_pos, Inches(0.5), height=LOGO_HEIGHT)
                     x_pos += Inches(2.5)
                 except:
                     pass
 
     # Main title
-    title_elem = slide_data['content'].find('h1', class_='main-title')
-    if title_elem:
+    if slide_data.title is not None:
         title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.5), Inches(12.5), Inches(1.5))
         title_frame = title_box.text_frame
-        title_frame.text = title_elem.get_text(separator='\n').strip()
+        title_frame.text = slide_data.title
         title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
         title_frame.paragraphs[0].font.size = Pt(44)
         title_frame.paragraphs[0].font.bold = True
         title_frame.paragraphs[0].font.color.rgb = WHITE
 
     # Subtitle
-    subtitle_elem = slide_data['content'].find('p', class_='subtitle')
-    if subtitle_elem:
+    if slide_data.subtitle is not None:
         subtitle_box = slide.shapes.add_textbox(Inches(0.5), Inches(4.0), Inches(12.5), Inches(0.8))
         subtitle_frame = subtitle_box.text_frame
-        subtitle_frame.text = subtitle_elem.get_text().strip()
+        subtitle_frame.text = slide_data.subtitle
         subtitle_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
         subtitle_frame.paragraphs[0].font.size = Pt(20)
         subtitle_frame.paragraphs[0].font.color.rgb = WHITE
 
     # Author info
-    author_elem = slide_data['content'].find('div', class_='author-info')
-    if author_elem:
+    if slide_data.author is not None:
         author_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.0), Inches(12.5), Inches(2.0))
         author_frame = author_box.text_frame
-        author_frame.text = author_elem.get_text(separator='\n').strip()
+        author_frame.text = slide_data.author
         author_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
         author_frame.paragraphs[0].font.size = Pt(18)
         author_frame.paragraphs[0].font.color.rgb = WHITE
@@ -120,16 +103,20 @@ def create_divider_slide(prs, slide_data):
     fill.fore_color.rgb = TEAL
 
     # Title
-    title_elem = slide_data['content'].find('h2', class_='divider-title')
-    if title_elem:
+    if slide_data.title is not None:
         title_box = slide.shapes.add_textbox(Inches(0.5), Inches(3.0), Inches(12.5), Inches(1.5))
         title_frame = title_box.text_frame
-        title_frame.text = title_elem.get_text().strip()
+        title_frame.text = slide_data.title
         title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
         title_frame.paragraphs[0].font.size = Pt(54)
         title_frame.paragraphs[0].font.bold = True
         title_frame.paragraphs[0].font.color.rgb = WHITE
 
+def full_image_box(prs):
+    """(left, top, width, height) full-image pictures are fitted into"""
+    return (FULL_IMAGE_MARGIN, FULL_IMAGE_MARGIN,
+            prs.slide_width - 2 * FULL_IMAGE_MARGIN, FULL_IMAGE_HEIGHT)
+
 def create_full_image_slide(prs, slide_data, images_dir):
     """Create slide with full-size image"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -141,16 +128,15 @@ def create_full_image_slide(prs, slide_data, images_dir):
     fill.fore_color.rgb = LIGHT_GRAY
 
     # Find image
-    img_elem = slide_data['content'].find('img')
-    if img_elem:
-        img_src = img_elem.get('src', '')
-        img_path = os.path.join(images_dir, img_src.replace('images/', ''))
-        if os.path.exists(img_path):
+    if slide_data.image:
+        img_src = slide_data.image.src
+        img_path = resolve_asset(images_dir, img_src, f"slide {slide_data.number}")
+        if img_path:
             try:
-                # Center large image
-                slide.shapes.add_picture(img_path, Inches(1.0), Inches(1.0), height=Inches(6.0))
-            except:
-                pass
+                # Center large image inside the slide margins
+                add_fitted_picture(slide.shapes, img_path, *full_image_box(prs))
+            except Exception as e:
+                print(f"⚠️  Could not add image {img_src}: {e}")
 
 def create_content_slide(prs, slide_data, images_dir):
     """Create content slide with various layouts"""
@@ -163,40 +149,37 @@ def create_content_slide(prs, slide_data, images_dir):
     fill.fore_color.rgb = LIGHT_GRAY
 
     # Title
-    title_elem = slide_data['content'].find('h2', class_='slide-title')
-    if title_elem:
+    if slide_data.title is not None:
         title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.5), Inches(0.8))
         title_frame = title_box.text_frame
-        title_frame.text = title_elem.get_text().strip()
+        title_frame.text = slide_data.title
         title_frame.paragraphs[0].font.size = Pt(36)
         title_frame.paragraphs[0].font.bold = True
         title_frame.paragraphs[0].font.color.rgb = TEAL
 
     # Content area
-    content_elem = slide_data['content'].find('div', class_='slide-content')
-    if not content_elem:
+    if slide_data.text is None:
         return
 
     # Check for different content types
-    bullet_list = content_elem.find('ul', class_='bullet-list')
-    card_grid = content_elem.find('div', class_='card-grid')
-    two_column = content_elem.find('div', class_='two-column')
-    tool_grid = content_elem.find('div', class_='tool-grid')
-    highlight_box = content_elem.find('div', class_='highlight-box')
+    bullet_list = slide_data.bullet_list
+    card_grid = slide_data.card_grid
+    two_column = slide_data.two_column
+    tool_grid = slide_data.tool_grid
+    highlight_box = slide_data.highlight_box
 
     y_offset = Inches(1.3)
 
     if bullet_list:
         # Bullet list layout
-        items = bullet_list.find_all('li', recursive=False)
-        for item in items:
+        for item in bullet_list.items:
             text_box = slide.shapes.add_textbox(Inches(0.7), y_offset, Inches(12.0), Inches(0.6))
             text_frame = text_box.text_frame
             text_frame.word_wrap = True
 
             # Add text
             p = text_frame.paragraphs[0]
-            p.text = item.get_text().strip()
+            p.text = item.text
             p.font.size = Pt(16)
             p.font.color.rgb = GRAY
             p.level = 0
@@ -205,7 +188,7 @@ def create_content_slide(prs, slide_data, images_dir):
 
     elif card_grid:
         # Card grid layout (2x2 or 2x3)
-        cards = card_grid.find_all('div', class_='card')
+        cards = card_grid.cards
         cards_per_row = 2
         card_width = Inches(5.8)
         card_height = Inches(2.2)
@@ -232,21 +215,19 @@ def create_content_slide(prs, slide_data, images_dir):
             card_shape.line.width = Pt(2)
 
             # Card title
-            card_title = card.find('div', class_='card-title')
-            if card_title:
+            if card.title is not None:
                 title_box = slide.shapes.add_textbox(x + Inches(0.2), y + Inches(0.15), card_width - Inches(0.4), Inches(0.4))
                 tf = title_box.text_frame
-                tf.text = card_title.get_text().strip()
+                tf.text = card.title
                 tf.paragraphs[0].font.size = Pt(16)
                 tf.paragraphs[0].font.bold = True
                 tf.paragraphs[0].font.color.rgb = TEAL
 
             # Card content
-            card_content = card.find('div', class_='card-content')
-            if card_content:
+            if card.content is not None:
                 content_box = slide.shapes.add_textbox(x + Inches(0.2), y + Inches(0.6), card_width - Inches(0.4), card_height - Inches(0.7))
                 tf = content_box.text_frame
-                tf.text = card_content.get_text().strip()
+                tf.text = card.content
                 tf.paragraphs[0].font.size = Pt(13)
                 tf.paragraphs[0].font.color.rgb = GRAY
                 tf.word_wrap = True
@@ -263,7 +244,7 @@ def create_content_slide(prs, slide_data, images_dir):
 
     elif tool_grid:
         # Tool grid (4 columns)
-        tools = tool_grid.find_all('div', class_='tool-item')
+        tools = tool_grid.tools
         tools_per_row = 4
         tool_width = Inches(2.8)
         x_start = Inches(0.7)
@@ -278,71 +259,143 @@ def create_content_slide(prs, slide_data, images_dir):
             y = y_start + row * Inches(2.0)
 
             # Tool image
-            img = tool.find('img')
-            if img:
-                img_src = img.get('src', '')
-                img_path = os.path.join(images_dir, img_src.replace('images/', ''))
-                if os.path.exists(img_path):
+            if tool.image:
+                img_path = resolve_asset(images_dir, tool.image.src, f"slide {slide_data.number}")
+                if img_path:
                     try:
-                        slide.shapes.add_picture(img_path, x + Inches(0.8), y, height=Inches(0.8))
+                        add_picture(slide.shapes, img_path, x + Inches(0.8), y, height=TOOL_ICON_HEIGHT)
                     except:
                         pass
 
             # Tool name
-            tool_name = tool.find('div', class_='tool-name')
-            if tool_name:
+            if tool.name is not None:
                 name_box = slide.shapes.add_textbox(x, y + Inches(1.0), tool_width, Inches(0.3))
                 tf = name_box.text_frame
-                tf.text = tool_name.get_text().strip()
+                tf.text = tool.name
                 tf.paragraphs[0].alignment = PP_ALIGN.CENTER
                 tf.paragraphs[0].font.size = Pt(14)
                 tf.paragraphs[0].font.bold = True
                 tf.paragraphs[0].font.color.rgb = TEAL
 
+def new_presentation():
+    """Empty 16:9 presentation all slides are rendered into"""
+    prs = Presentation()
+    prs.slide_width = Inches(13.333)
+    prs.slide_height = Inches(7.5)
+    return prs
+
+def render_slide(prs, slide_data, images_dir):
+    """Render one IR slide into prs"""
+    if slide_data.kind == 'title':
+        create_title_slide(prs, slide_data, images_dir)
+    elif slide_data.kind == 'divider':
+        create_divider_slide(prs, slide_data)
+    elif slide_data.kind == 'full-image':
+        create_full_image_slide(prs, slide_data, images_dir)
+    elif slide_data.kind == 'content':
+        create_content_slide(prs, slide_data, images_dir)
+
+def image_requests(prs, slide_data, images_dir):
+    """Yield (image path, EMU width, EMU height) for every picture render_slide() embeds"""
+    assets = asset_index(images_dir)
+    if slide_data.kind == 'title':
+        for logo in slide_data.logos or []:
+            asset = assets.lookup(logo.src)
+            if asset:
+                yield (asset.path, *display_size(asset.path, height=LOGO_HEIGHT))
+    elif slide_data.kind == 'full-image':
+        if slide_data.image:
+            asset = assets.lookup(slide_data.image.src)
+            if asset:
+                yield (asset.path, *fit(probe(asset.path), *full_image_box(prs)).image_size)
+    elif slide_data.kind == 'content' and slide_data.text is not None and slide_data.tool_grid:
+        # Tool icons are only drawn when no other content layout takes the slide
+        if slide_data.bullet_list or slide_data.card_grid or slide_data.two_column:
+            return
+        for tool in slide_data.tool_grid.tools:
+            if tool.image:
+                asset = assets.lookup(tool.image.src)
+                if asset:
+                    yield (asset.path, *display_size(asset.path, height=TOOL_ICON_HEIGHT))
+
 def main():
+    incremental = '--incremental' in sys.argv[1:]
+    variants = next((parse_variants(arg.split('=', 1)[1]) for arg in sys.argv[1:]
+                     if arg.startswith('--variants=')), None)
+    if variants and incremental:
+        # Variants are always built in full; don't let --incremental be dropped silently
+        print("✗ --variants and --incremental can't be combined")
+        sys.exit(2)
+
     print("="*70)
     print("HTML to PPTX Perfect Converter")
     print("="*70)
 
-    base_dir = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle'
-    images_dir = os.path.join(base_dir, 'images')
-    output_path = os.path.join(base_dir, 'presentation_perfect.pptx')
+    images_dir = os.path.join(BASE_DIR, 'images')
+    output_path = os.path.join(BASE_DIR, 'presentation_perfect.pptx')
 
     print("\n📖 Step 1: Parsing HTML slides...")
     slides = parse_html_slides()
     print(f"   Found {len(slides)} slides")
 
-    print("\n🎨 Step 2: Creating PPTX with exact styling...")
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-
-    for slide_data in slides:
-        print(f"   Creating slide {slide_data['number']}: {slide_data['type']}")
-
-        if slide_data['type'] == 'title':
-            create_title_slide(prs, slide_data)
-        elif slide_data['type'] == 'divider':
-            create_divider_slide(prs, slide_data)
-        elif slide_data['type'] == 'full-image':
-            create_full_image_slide(prs, slide_data, images_dir)
-        elif slide_data['type'] == 'content':
-            create_content_slide(prs, slide_data, images_dir)
-
-    print(f"\n💾 Step 3: Saving PPTX...")
-    prs.save(output_path)
-
-    file_size = os.path.getsize(output_path) / (1024*1024)
+    outputs = [output_path]
+    if variants:
+        print(f"\n🎨 Step 2: Creating PPTX with exact styling (shared by {', '.join(variants)})...")
+        prs = new_presentation()
+        outputs = [variant_path(output_path, variant) for variant in variants]
+
+        # Every image profile's renditions are prefetched together
+        profiles = [VARIANTS[variant] for variant in variants if VARIANTS[variant]]
+        with ImagePrefetcher(profiles=profiles) as prefetcher:
+            for slide_data in slides:
+                for img_path, cx, cy in image_requests(prs, slide_data, images_dir):
+                    prefetcher.submit(img_path, cx, cy)
+
+            with PictureLog() as pictures:
+                for slide_data in slides:
+                    print(f"   Creating slide {slide_data.number}: {slide_data.kind}")
+                    render_slide(prs, slide_data, images_dir)
+
+            print(f"\n💾 Step 3: Saving {len(variants)} variants...")
+            for variant, path in zip(variants, outputs):
+                pictures.save(prs, variant, path)
+                print(f"   {variant}: {os.path.basename(path)}")
+    elif incremental:
+        print("\n🎨 Step 2: Updating changed slides in existing PPTX...")
+        rendered = convert_incremental(
+            output_path, slides, RENDERER_ID, new_presentation,
+            lambda prs, slide_data: render_slide(prs, slide_data, images_dir),
+            images_dir=images_dir)
+        print(f"   Re-rendered {len(rendered)} slide(s): {rendered}")
+    else:
+        print("\n🎨 Step 2: Creating PPTX with exact styling...")
+        prs = new_presentation()
+
+        # Images are decoded and resized in worker processes while slides are built
+        with ImagePrefetcher() as prefetcher:
+            for slide_data in slides:
+                for img_path, cx, cy in image_requests(prs, slide_data, images_dir):
+                    prefetcher.submit(img_path, cx, cy)
+
+            for slide_data in slides:
+                print(f"   Creating slide {slide_data.number}: {slide_data.kind}")
+                render_slide(prs, slide_data, images_dir)
+
+        print(f"\n💾 Step 3: Saving PPTX...")
+        prs.save(output_path)
 
     print("\n" + "="*70)
     print("✅ PERFECT REPLICA CREATED!")
     print("="*70)
-    print(f"📁 File: {output_path}")
-    print(f"📊 Size: {file_size:.1f} MB")
+    for path in outputs:
+        print(f"📁 File: {path}")
+        print(f"📊 Size: {os.path.getsize(path) / (1024*1024):.1f} MB")
     print(f"📄 Slides: {len(slides)}")
     print(f"🎨 Colors: Oracle Teal (#14535F) + Red (#C74634)")
     print(f"🖼️  Images: Embedded")
     print("="*70)
+    print_image_report()
+    report_missing_assets()
 
 if __name__ == "__main__":
     main()
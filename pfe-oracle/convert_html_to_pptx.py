@@ -10,9 +10,23 @@ from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR, MSO_AUTO_SIZE
 from pptx.dml.color import RGBColor
 from bs4 import BeautifulSoup
+from lxml import etree
 from pathlib import Path
 import re
 import os
+import sys
+
+from asset_index import report_missing_assets, resolve_asset
+from image_pipeline import add_picture, print_image_report
+from incremental_pptx import convert_incremental
+from slide_ir import ContentSlide, DividerSlide, TitleSlide, extract_slide, load_deck
+
+# Identifies this renderer in incremental builds; bump when slide rendering changes
+RENDERER_ID = 'convert_html_to_pptx/1'
+
+# Images the renderer adds on its own, by slide kind (fingerprinted by incremental builds)
+TITLE_LOGOS = ('logo_ehtp.jpg', 'logo_graalvm.png')
+SLIDE_KIND_ASSETS = {TitleSlide: TITLE_LOGOS}
 
 # Color scheme extracted from CSS
 PRIMARY_COLOR = RGBColor(20, 83, 95)  # #14535F
@@ -30,31 +44,56 @@ class HTMLToPowerPointConverter:
         self.html_path = Path(html_path)
         self.output_path = Path(output_path)
         self.images_dir = Path(images_dir)
-        self.prs = Presentation()
-        self.prs.slide_width = Inches(13.333)  # 16:9 aspect ratio
-        self.prs.slide_height = Inches(7.5)
+        self.prs = self.new_presentation()
+        # Number of the slide being rendered, for missing-asset reports
+        self.slide_number = None
+
+    def new_presentation(self):
+        """Empty 16:9 presentation slides are rendered into"""
+        prs = Presentation()
+        prs.slide_width = Inches(13.333)  # 16:9 aspect ratio
+        prs.slide_height = Inches(7.5)
+        return prs
 
     def parse_html(self):
-        """Parse the HTML file and extract slide content"""
-        with open(self.html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        """Parse the HTML file (or load it from the parse cache) into the slide IR"""
+        self.slides_data = load_deck(self.html_path)
 
-        self.soup = BeautifulSoup(html_content, 'html.parser')
-        self.slides_data = []
+        return self.slides_data
 
-        # Find all slide divs
-        slides = self.soup.find_all('div', class_='slide')
+    def iter_slides_streaming(self):
+        """Stream slides one at a time from #slides-container with lxml iterparse
 
-        for slide in slides:
-            slide_data = {
-                'classes': slide.get('class', []),
-                'content': slide,
-                'is_divider': 'divider-slide' in slide.get('class', []),
-                'is_title': 'title-slide' in slide.get('class', []),
-            }
-            self.slides_data.append(slide_data)
+        Each slide subtree is converted to its IR node through a small
+        standalone BeautifulSoup tag and then cleared from the lxml tree,
+        keeping peak memory flat regardless of deck size.
+        """
+        context = etree.iterparse(str(self.html_path), events=('end',), tag='div',
+                                  html=True, encoding='utf-8')
+        number = 0
 
-        return self.slides_data
+        for _, elem in context:
+            parent = elem.getparent()
+            if parent is None or parent.get('id') != 'slides-container':
+                continue
+
+            if 'slide' not in (elem.get('class') or '').split():
+                continue
+
+            number += 1
+            slide_html = etree.tostring(elem, encoding='unicode', method='html', with_tail=False)
+            slide_soup = BeautifulSoup(slide_html, 'html.parser')
+            slide = extract_slide(slide_soup.find('div'), number)
+            slide_soup.decompose()
+
+            yield slide
+
+            # Drop the rendered slide and everything parsed before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        del context
 
     def clean_text(self, text):
         """Clean and normalize text content"""
@@ -75,17 +114,16 @@ class HTMLToPowerPointConverter:
         fill.fore_color.rgb = PRIMARY_COLOR
 
         # Add logos
-        logo_ehtp_path = self.images_dir / "logo_ehtp.jpg"
-        logo_graalvm_path = self.images_dir / "logo_graalvm.png"
+        logo_ehtp_path, logo_graalvm_path = map(self._image_path, TITLE_LOGOS)
 
         left_margin = Inches(0.5)
         logo_top = Inches(0.5)
 
-        if logo_ehtp_path.exists():
-            slide.shapes.add_picture(str(logo_ehtp_path), left_margin, logo_top, height=Inches(1.2))
+        if logo_ehtp_path:
+            add_picture(slide.shapes, logo_ehtp_path, left_margin, logo_top, height=Inches(1.2))
 
-        if logo_graalvm_path.exists():
-            slide.shapes.add_picture(str(logo_graalvm_path), Inches(11.5), logo_top, height=Inches(1.2))
+        if logo_graalvm_path:
+            add_picture(slide.shapes, logo_graalvm_path, Inches(11.5), logo_top, height=Inches(1.2))
 
         # Add main title
         title_box = slide.shapes.add_textbox(Inches(1.5), Inches(2.5), Inches(10.3), Inches(1.5))
@@ -155,7 +193,7 @@ class HTMLToPowerPointConverter:
         title_para.alignment = PP_ALIGN.CENTER
 
     def add_content_slide(self, slide_data):
-        """Create a content slide with bullet points"""
+        """Create a content slide with bullet points (full-image slides only get the background)"""
         slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
 
         # Set background
@@ -164,12 +202,9 @@ class HTMLToPowerPointConverter:
         fill.solid()
         fill.fore_color.rgb = BACKGROUND_COLOR
 
-        content = slide_data['content']
-
         # Extract title
-        title_elem = content.find('h2', class_='slide-title')
-        if title_elem:
-            title_text = self.clean_text(title_elem.get_text())
+        if slide_data.title is not None:
+            title_text = self.clean_text(slide_data.title)
 
             # Add title with accent underline
             title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.3), Inches(0.8))
@@ -191,25 +226,23 @@ class HTMLToPowerPointConverter:
             line.line.fill.background()
 
         # Extract content
-        slide_content = content.find('div', class_='slide-content')
-
-        if slide_content:
+        if isinstance(slide_data, ContentSlide) and slide_data.text is not None:
             # Check for special layouts
-            if slide_content.find('div', class_='card-grid'):
-                self._add_card_grid_content(slide, slide_content)
-            elif slide_content.find('div', class_='two-column'):
-                self._add_two_column_content(slide, slide_content)
-            elif slide_content.find('ul', class_='bullet-list'):
-                self._add_bullet_list_content(slide, slide_content)
-            elif slide_content.find('img'):
-                self._add_image_content(slide, slide_content)
+            if slide_data.card_grid:
+                self._add_card_grid_content(slide, slide_data)
+            elif slide_data.two_column:
+                self._add_two_column_content(slide, slide_data)
+            elif slide_data.bullet_list:
+                self._add_bullet_list_content(slide, slide_data)
+            elif slide_data.image:
+                self._add_image_content(slide, slide_data)
             else:
                 # Generic content
-                self._add_generic_content(slide, slide_content)
+                self._add_generic_content(slide, slide_data)
 
-    def _add_bullet_list_content(self, slide, content_div):
+    def _add_bullet_list_content(self, slide, slide_data):
         """Add bullet list content to slide"""
-        bullet_list = content_div.find('ul', class_='bullet-list')
+        bullet_list = slide_data.bullet_list
         if not bullet_list:
             return
 
@@ -218,28 +251,14 @@ class HTMLToPowerPointConverter:
         text_frame = text_box.text_frame
         text_frame.word_wrap = True
 
-        items = bullet_list.find_all('li', recursive=False)
-
-        for idx, item in enumerate(items):
+        for idx, item in enumerate(bullet_list.items):
             if idx > 0:
                 text_frame.add_paragraph()
 
             para = text_frame.paragraphs[idx]
 
-            # Extract text, handling <strong> tags
-            item_text = ""
-            for child in item.children:
-                if child.name == 'strong':
-                    item_text += child.get_text()
-                elif child.name is None:  # Text node
-                    item_text += child
-                elif child.name == 'ul':
-                    # Skip nested lists for now
-                    pass
-                else:
-                    item_text += child.get_text()
-
-            item_text = self.clean_text(item_text)
+            # Item text without nested lists (skipped for now)
+            item_text = self.clean_text(item.lead_text)
             para.text = item_text
             para.level = 0
             para.font.size = Pt(18)
@@ -248,9 +267,9 @@ class HTMLToPowerPointConverter:
             para.space_after = Pt(8)
 
         # Add highlight box if present
-        highlight = content_div.find('div', class_='highlight-box')
+        highlight = slide_data.highlight_box
         if highlight:
-            highlight_text = self.clean_text(highlight.get_text())
+            highlight_text = self.clean_text(highlight.text)
 
             # Create highlight box
             box = slide.shapes.add_shape(
@@ -275,10 +294,9 @@ class HTMLToPowerPointConverter:
             para.font.color.rgb = WHITE
             para.alignment = PP_ALIGN.CENTER
 
-    def _add_card_grid_content(self, slide, content_div):
+    def _add_card_grid_content(self, slide, slide_data):
         """Add card grid layout to slide"""
-        card_grid = content_div.find('div', class_='card-grid')
-        cards = card_grid.find_all('div', class_='card')
+        cards = slide_data.card_grid.cards
 
         # Calculate card positions (2x3 grid)
         card_width = Inches(5.5)
@@ -314,9 +332,8 @@ class HTMLToPowerPointConverter:
             text_frame.margin_bottom = Inches(0.1)
 
             # Card title
-            card_title = card.find('div', class_='card-title')
-            if card_title:
-                title_text = self.clean_text(card_title.get_text())
+            if card.title is not None:
+                title_text = self.clean_text(card.title)
                 para = text_frame.paragraphs[0]
                 para.text = title_text
                 para.font.size = Pt(16)
@@ -325,9 +342,8 @@ class HTMLToPowerPointConverter:
                 para.space_after = Pt(6)
 
             # Card content
-            card_content = card.find('div', class_='card-content')
-            if card_content:
-                content_text = self.clean_text(card_content.get_text())
+            if card.content is not None:
+                content_text = self.clean_text(card.content)
                 text_frame.add_paragraph()
                 para = text_frame.paragraphs[1]
                 para.text = content_text
@@ -335,10 +351,9 @@ class HTMLToPowerPointConverter:
                 para.font.color.rgb = TEXT_DARK
                 para.line_spacing = 1.2
 
-    def _add_two_column_content(self, slide, content_div):
+    def _add_two_column_content(self, slide, slide_data):
         """Add two-column layout to slide"""
-        two_col = content_div.find('div', class_='two-column')
-        columns = two_col.find_all(['div'], recursive=False)
+        columns = slide_data.two_column.columns
 
         if len(columns) >= 2:
             # Left column
@@ -348,7 +363,7 @@ class HTMLToPowerPointConverter:
             # Right column
             right_col = columns[1]
             # Check if it contains an image
-            if right_col.find('img'):
+            if right_col.has_image:
                 self._add_image_to_column(slide, right_col, Inches(7.2), Inches(1.5), Inches(5.6))
             else:
                 self._add_column_content(slide, right_col, Inches(7.2), Inches(1.5), Inches(5.6))
@@ -356,19 +371,18 @@ class HTMLToPowerPointConverter:
     def _add_column_content(self, slide, column, left, top, width):
         """Add content to a column"""
         # Check for bullet list
-        bullet_list = column.find('ul', class_='bullet-list')
+        bullet_list = column.bullet_list
         if bullet_list:
             text_box = slide.shapes.add_textbox(left, top, width, Inches(5.5))
             text_frame = text_box.text_frame
             text_frame.word_wrap = True
 
-            items = bullet_list.find_all('li', recursive=False)
-            for idx, item in enumerate(items):
+            for idx, item in enumerate(bullet_list.items):
                 if idx > 0:
                     text_frame.add_paragraph()
 
                 para = text_frame.paragraphs[idx]
-                item_text = self.clean_text(item.get_text())
+                item_text = self.clean_text(item.text)
                 para.text = item_text
                 para.level = 0
                 para.font.size = Pt(16)
@@ -376,7 +390,7 @@ class HTMLToPowerPointConverter:
                 para.space_after = Pt(6)
 
         # Check for cards
-        cards = column.find_all('div', class_='card')
+        cards = column.cards
         if cards:
             current_top = top
             for card in cards:
@@ -399,9 +413,8 @@ class HTMLToPowerPointConverter:
                 text_frame.margin_top = Inches(0.1)
 
                 # Card title
-                card_title = card.find('div', class_='card-title')
-                if card_title:
-                    title_text = self.clean_text(card_title.get_text())
+                if card.title is not None:
+                    title_text = self.clean_text(card.title)
                     para = text_frame.paragraphs[0]
                     para.text = title_text
                     para.font.size = Pt(14)
@@ -409,9 +422,8 @@ class HTMLToPowerPointConverter:
                     para.font.color.rgb = PRIMARY_COLOR
 
                 # Card content
-                card_content = card.find('div', class_='card-content')
-                if card_content:
-                    content_text = self.clean_text(card_content.get_text())
+                if card.content is not None:
+                    content_text = self.clean_text(card.content)
                     text_frame.add_paragraph()
                     para = text_frame.paragraphs[1]
                     para.text = content_text
@@ -421,15 +433,14 @@ class HTMLToPowerPointConverter:
                 current_top += card_height + Inches(0.15)
 
         # Check for highlight box
-        highlight = column.find('div', class_='highlight-box')
+        highlight = column.highlight_box
         if highlight:
-            highlight_text = self.clean_text(highlight.get_text())
+            highlight_text = self.clean_text(highlight.text)
 
             # Check if there's a title (h3)
-            h3_title = highlight.find('h3')
             title_text = ""
-            if h3_title:
-                title_text = self.clean_text(h3_title.get_text())
+            if highlight.title is not None:
+                title_text = self.clean_text(highlight.title)
                 # Remove title from highlight text
                 highlight_text = highlight_text.replace(title_text, "").strip()
 
@@ -469,21 +480,16 @@ class HTMLToPowerPointConverter:
 
     def _add_image_to_column(self, slide, column, left, top, width):
         """Add image to a column"""
-        img_container = column.find('div', class_='image-container')
+        img_container = column.image_container
         if img_container:
-            img_elem = img_container.find('img')
+            img_elem = img_container.image
             if img_elem:
-                img_src = img_elem.get('src', '')
-                # Handle relative path
-                if img_src.startswith('images/'):
-                    img_path = self.images_dir / img_src.replace('images/', '')
-                else:
-                    img_path = self.images_dir / img_src
-
-                if img_path.exists():
+                img_path = self._image_path(img_elem.src)
+                if img_path:
                     try:
-                        slide.shapes.add_picture(
-                            str(img_path),
+                        add_picture(
+                            slide.shapes,
+                            img_path,
                             left, top,
                             width=width,
                             height=Inches(5)
@@ -491,31 +497,26 @@ class HTMLToPowerPointConverter:
                     except Exception as e:
                         print(f"Warning: Could not add image {img_path}: {e}")
 
-    def _add_image_content(self, slide, content_div):
+    def _add_image_content(self, slide, slide_data):
         """Add full-width image content"""
-        img_elem = content_div.find('img')
+        img_elem = slide_data.image
         if img_elem:
-            img_src = img_elem.get('src', '')
-            # Handle relative path
-            if img_src.startswith('images/'):
-                img_path = self.images_dir / img_src.replace('images/', '')
-            else:
-                img_path = self.images_dir / img_src
-
-            if img_path.exists():
+            img_path = self._image_path(img_elem.src)
+            if img_path:
                 try:
                     # Center the image
-                    slide.shapes.add_picture(
-                        str(img_path),
+                    add_picture(
+                        slide.shapes,
+                        img_path,
                         Inches(1.5), Inches(1.5),
                         width=Inches(10.3)
                     )
                 except Exception as e:
                     print(f"Warning: Could not add image {img_path}: {e}")
 
-    def _add_generic_content(self, slide, content_div):
+    def _add_generic_content(self, slide, slide_data):
         """Add generic text content"""
-        text_content = self.clean_text(content_div.get_text())
+        text_content = self.clean_text(slide_data.text)
 
         if text_content:
             text_box = slide.shapes.add_textbox(Inches(0.7), Inches(1.5), Inches(11.9), Inches(5.5))
@@ -527,27 +528,61 @@ class HTMLToPowerPointConverter:
             para.font.size = Pt(18)
             para.font.color.rgb = TEXT_DARK
 
-    def convert(self):
-        """Main conversion process"""
+    def _image_path(self, src):
+        """Path of an <img src> in the images directory, or None (reported at the end)"""
+        return resolve_asset(self.images_dir, src, f"slide {self.slide_number}")
+
+    def render_slide(self, slide_data):
+        """Render one parsed slide into the presentation"""
+        self.slide_number = slide_data.number
+        if isinstance(slide_data, TitleSlide):
+            self.add_title_slide(slide_data)
+        elif isinstance(slide_data, DividerSlide):
+            # Extract divider title
+            if slide_data.title is not None:
+                title_text = self.clean_text(slide_data.title)
+                self.add_divider_slide(title_text)
+        else:
+            # Content slide
+            self.add_content_slide(slide_data)
+
+    def slide_assets(self, slide_data):
+        """Images render_slide() adds to slide_data besides the ones in its IR"""
+        return SLIDE_KIND_ASSETS.get(type(slide_data), ())
+
+    def _render_into(self, prs, slide_data):
+        """Render one slide into another presentation (used by incremental builds)"""
+        self.prs = prs
+        self.render_slide(slide_data)
+
+    def convert_incremental(self):
+        """Update an existing output, re-rendering only slides whose IR changed"""
         print("Parsing HTML file...")
         self.parse_html()
-
         print(f"Found {len(self.slides_data)} slides")
 
-        for idx, slide_data in enumerate(self.slides_data):
-            print(f"Processing slide {idx + 1}/{len(self.slides_data)}...")
-
-            if slide_data['is_title']:
-                self.add_title_slide(slide_data)
-            elif slide_data['is_divider']:
-                # Extract divider title
-                divider_title = slide_data['content'].find('h2', class_='divider-title')
-                if divider_title:
-                    title_text = self.clean_text(divider_title.get_text())
-                    self.add_divider_slide(title_text)
-            else:
-                # Content slide
-                self.add_content_slide(slide_data)
+        rendered = convert_incremental(str(self.output_path), self.slides_data, RENDERER_ID,
+                                       self.new_presentation, self._render_into,
+                                       images_dir=str(self.images_dir), slide_assets=self.slide_assets)
+        print(f"Re-rendered {len(rendered)} slide(s): {rendered}")
+        print(f"Updated {self.output_path}")
+
+    def convert(self, streaming=False):
+        """Main conversion process"""
+        if streaming:
+            print("Streaming slides from HTML file...")
+            for idx, slide_data in enumerate(self.iter_slides_streaming()):
+                print(f"Processing slide {idx + 1}...")
+                self.render_slide(slide_data)
+        else:
+            print("Parsing HTML file...")
+            self.parse_html()
+
+            print(f"Found {len(self.slides_data)} slides")
+
+            for idx, slide_data in enumerate(self.slides_data):
+                print(f"Processing slide {idx + 1}/{len(self.slides_data)}...")
+                self.render_slide(slide_data)
 
         print(f"Saving presentation to {self.output_path}...")
         self.prs.save(str(self.output_path))
@@ -570,12 +605,18 @@ def main():
     if not images_dir.exists():
         print(f"Warning: Images directory not found at {images_dir}")
 
-    # Create converter and run
+    # Create converter and run (--stream keeps one slide in memory at a time,
+    # --incremental only re-renders slides changed since the last run)
     converter = HTMLToPowerPointConverter(html_path, output_path, images_dir)
-    converter.convert()
+    if '--incremental' in sys.argv[1:]:
+        converter.convert_incremental()
+    else:
+        converter.convert(streaming='--stream' in sys.argv[1:])
 
     print(f"\nPowerPoint presentation created successfully!")
     print(f"Output file: {output_path}")
+    print_image_report()
+    report_missing_assets()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,69 @@
 #!/usr/bin/env python3
 """
 HTML Presentation to PDF Converter
-Converts the HTML slide presentation to a high-quality PDF document
+Converts the HTML slide presentation to a high-quality PDF document.
+Several decks can be given at once; they are printed concurrently on a pool
+of pre-launched browsers (see browser_pool.py) instead of one Chromium launch
+per deck:
+
+    python convert_to_pdf.py deck1.html deck2.html ...
+
+With --split (or --split=N) a deck's slides are cut into contiguous ranges,
+each range is printed on its own page concurrently (the other slides hidden)
+and the partial PDFs are merged in order with pypdf, outlines (Playwright
+1.42+) and links included. Chromium prints one page.pdf() call on a single
+thread, so this is what spreads a long deck over several cores:
+
+    python convert_to_pdf.py --split presentation_print.html
+
+With --offline every http(s) request is answered from the vendored asset
+store (see asset_vendor.py) and nothing is downloaded; the page is printed
+once it has loaded and its fonts are ready, with no network-idle wait.
+
+With --incremental each slide is printed into its own cached PDF, keyed by a
+fingerprint of its DOM, images and styles, and only slides whose fingerprint
+changed are printed again (see incremental_pdf.py):
+
+    python convert_to_pdf.py --incremental presentation_print.html
+
+With --optimize each PDF is post-processed in place (see pdf_optimizer.py):
+identical images and fonts are merged, images above the image profile's DPI
+resampled and streams re-deflated, with a per-object savings report.
+
+For quick repeated exports (editors, pre-commit hooks) use render_client.py,
+which sends the job to a render_daemon.py that keeps its browsers running.
 """
 
+import asyncio
 import subprocess
 import sys
 import os
+import tempfile
+import time
+
+# Every slide of the deck, in document order
+SLIDE_SELECTOR = '.slide'
+
+# Beats the printable deck's ".slide { display: block !important }"
+HIDE_OUT_OF_RANGE_CSS = '.slide.pfe-out-of-range { display: none !important; }'
+
+# Page settings of every exported PDF
+PDF_OPTIONS = {
+    'format': "A4",
+    'landscape': True,
+    'print_background': True,
+    'margin': {
+        "top": "0mm",
+        "right": "0mm",
+        "bottom": "0mm",
+        "left": "0mm"
+    },
+    'scale': 0.9  # Slightly scale down for better fit
+}
+
+# page.pdf(outline=True) prints bookmarks from the headings, which
+# merge_pdfs() carries over; older Playwright versions reject the option
+OUTLINE_MIN_PLAYWRIGHT = (1, 42)
 
 def check_playwright_installed():
     """Check if playwright is installed"""
@@ -16,6 +73,16 @@ def check_playwright_installed():
     except ImportError:
         return False
 
+def playwright_supports_outline():
+    """Whether the installed Playwright accepts page.pdf(outline=True)"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        major, minor = version('playwright').split('.')[:2]
+        return (int(major), int(minor)) >= OUTLINE_MIN_PLAYWRIGHT
+    except (PackageNotFoundError, ValueError):
+        return False
+
 def install_playwright():
     """Install playwright and chromium browser"""
     print("Installing playwright...")
@@ -23,53 +90,205 @@ def install_playwright():
     print("Installing chromium browser...")
     subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
 
-def convert_html_to_pdf():
-    """Convert HTML presentation to PDF using playwright"""
-    from playwright.sync_api import sync_playwright
+def check_pypdf_installed():
+    """Check if pypdf (used to merge split renders) is installed"""
+    try:
+        import pypdf
+        return True
+    except ImportError:
+        return False
 
-    # Get the directory where this script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    html_path = os.path.join(script_dir, "presentation.html")
-    pdf_path = os.path.join(script_dir, "presentation.pdf")
+def install_pypdf():
+    """Install pypdf"""
+    print("Installing pypdf...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "pypdf"])
 
-    print(f"Converting {html_path} to PDF...")
+async def load_deck(page, html_path, assets=None):
+    """Open html_path in page and wait for it to load completely
 
-    with sync_playwright() as p:
-        # Launch browser
-        browser = p.chromium.launch()
-        page = browser.new_page()
+    assets: an AssetStore to serve external requests from, offline.
+    """
+    if assets is None:
+        await page.goto(f"file://{os.path.abspath(html_path)}")
+        await page.wait_for_load_state("networkidle")
+        return
 
-        # Load the HTML file
-        page.goto(f"file://{html_path}")
+    from asset_vendor import route_page
 
-        # Wait for page to load completely
-        page.wait_for_load_state("networkidle")
+    await route_page(page, assets)
+    await page.goto(f"file://{os.path.abspath(html_path)}", wait_until="load")
+    await page.evaluate("document.fonts.ready.then(() => true)")
+
+async def render_pdf(pool, html_path, pdf_path, assets=None):
+    """Print one HTML file to pdf_path on a page of the browser pool"""
+    async with pool.page() as page:
+        await load_deck(page, html_path, assets)
 
         # Generate PDF with high quality settings
-        page.pdf(
-            path=pdf_path,
-            format="A4",
-            landscape=True,
-            print_background=True,
-            margin={
-                "top": "0mm",
-                "right": "0mm",
-                "bottom": "0mm",
-                "left": "0mm"
-            },
-            scale=0.9  # Slightly scale down for better fit
-        )
-
-        browser.close()
-
-    print(f"✓ PDF created successfully: {pdf_path}")
-
-    # Get file size
+        await page.pdf(path=pdf_path, **PDF_OPTIONS)
+
+    size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+    print(f"✓ {os.path.basename(pdf_path)} ({size_mb:.2f} MB)")
+    return pdf_path
+
+def slide_ranges(count, parts):
+    """Split slides 0..count-1 into at most parts contiguous (start, end) ranges"""
+    parts = max(1, min(parts, count))
+    size, extra = divmod(count, parts)
+    ranges = []
+    start = 0
+    for idx in range(parts):
+        end = start + size + (1 if idx < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+async def add_range_style(page):
+    """Add the rule show_slides() hides slides with; once per loaded deck"""
+    await page.add_style_tag(content=HIDE_OUT_OF_RANGE_CSS)
+
+async def show_slides(page, start, end):
+    """Hide every slide of the loaded deck but start..end-1 (end None: up to the last one)
+
+    Needs add_range_style() on the page first. Returns how many slides are left.
+    """
+    return await page.evaluate(
+        """([selector, start, end]) => {
+            const slides = document.querySelectorAll(selector);
+            end = end === null ? slides.length : end;
+            slides.forEach((slide, idx) => slide.classList.toggle('pfe-out-of-range', idx < start || idx >= end));
+            return Math.max(0, Math.min(end, slides.length) - start);
+        }""",
+        [SLIDE_SELECTOR, start, end])
+
+async def render_job(pool, html_path, output_path, slides=None, pdf_options=None, page_options=None,
+                     assets=None):
+    """Print html_path to output_path: a PDF, or a full-page screenshot for a .png path
+
+    slides: (start, end) to keep only slides start..end-1 (end None: to the last).
+    pdf_options: overrides of PDF_OPTIONS (format, scale, landscape...).
+    page_options: browser.new_page() options (viewport, device_scale_factor).
+    """
+    async with pool.page(**(page_options or {})) as page:
+        await load_deck(page, html_path, assets)
+        if slides:
+            await add_range_style(page)
+            if not await show_slides(page, *slides):
+                raise ValueError(f"No slide in range {slides[0] + 1}-{slides[1] or 'end'}")
+        if output_path.lower().endswith('.png'):
+            await page.screenshot(path=output_path, full_page=True)
+        else:
+            await page.pdf(path=output_path, **dict(PDF_OPTIONS, **(pdf_options or {})))
+    return output_path
+
+async def render_range(pool, html_path, start, end, pdf_path, assets=None, pdf_options=None):
+    """Print only slides start..end-1 of html_path to pdf_path"""
+    return await render_job(pool, html_path, pdf_path, (start, end), pdf_options, assets=assets)
+
+def merge_pdfs(partial_paths, pdf_path):
+    """Concatenate partial_paths (paths or file objects) into pdf_path, with outlines and links"""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for partial_path in partial_paths:
+        writer.append(partial_path)
+    with open(pdf_path, 'wb') as f:
+        writer.write(f)
+    writer.close()
+
+async def render_pdf_split(pool, html_path, pdf_path, parts=None, assets=None):
+    """render_pdf() with the slides printed in parts concurrent ranges, then merged
+
+    parts defaults to one range per page slot of the pool.
+    """
+    from slide_extractor import load_slides
+
+    # Counted from the HTML (cached), so every range starts loading at once
+    count = len(load_slides(html_path))
+    if not count:
+        return await render_pdf(pool, html_path, pdf_path, assets)
+
+    ranges = slide_ranges(count, parts or pool.size * pool.pages_per_browser)
+    # The DOM can hold more .slide elements (nested ones): the last range takes them all
+    ranges[-1] = (ranges[-1][0], None)
+    # Bookmarks of every range, when Playwright can print them
+    pdf_options = {'outline': True} if playwright_supports_outline() else None
+    with tempfile.TemporaryDirectory(prefix='pfe-pdf-') as scratch:
+        partial_paths = await asyncio.gather(*(
+            render_range(pool, html_path, start, end, os.path.join(scratch, f"slides_{start:04d}.pdf"),
+                         assets, pdf_options)
+            for start, end in ranges))
+        # pypdf is pure Python; keep the event loop free for the other decks
+        await asyncio.to_thread(merge_pdfs, partial_paths, pdf_path)
+
     size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
-    print(f"✓ File size: {size_mb:.2f} MB")
+    print(f"✓ {os.path.basename(pdf_path)} ({size_mb:.2f} MB, {count} slides in {len(ranges)} ranges)")
+    return pdf_path
+
+async def convert_batch(jobs, pool=None, split=None, assets=None, incremental=False):
+    """Convert every (html_path, pdf_path) of jobs; returns the PDF paths in order
+
+    Uses pool when given (a started BrowserPool), else a pool for this batch.
+    split: None prints each deck in one go, True splits it into one range per
+    page slot, a number into that many ranges (see render_pdf_split()).
+    assets: an AssetStore to render offline from (see load_deck()).
+    incremental: only print the slides that changed since they were last
+    printed (see incremental_pdf.py); split is ignored.
+    A failed deck doesn't stop the others; its error is raised at the end.
+    """
+    from browser_pool import BrowserPool
+
+    if pool is None:
+        pool = BrowserPool()
+        # A small batch doesn't need every browser of a full pool
+        pages = len(jobs)
+        if split and not incremental:
+            pages *= pool.size * pool.pages_per_browser if split is True else split
+        pool.size = max(1, min(pool.size, -(-pages // pool.pages_per_browser)))
+        async with pool:
+            pdf_paths = await convert_batch(jobs, pool, split, assets, incremental)
+        print(f"✓ {pool.jobs} page(s) printed on {pool.launches} browser launch(es)")
+        return pdf_paths
 
+    if incremental:
+        from incremental_pdf import render_pdf_incremental
+
+        renders = [render_pdf_incremental(pool, html_path, pdf_path, assets) for html_path, pdf_path in jobs]
+    elif split:
+        parts = None if split is True else split
+        renders = [render_pdf_split(pool, html_path, pdf_path, parts, assets) for html_path, pdf_path in jobs]
+    else:
+        renders = [render_pdf(pool, html_path, pdf_path, assets) for html_path, pdf_path in jobs]
+    results = await asyncio.gather(*renders, return_exceptions=True)
+    for (html_path, _), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            raise RuntimeError(f"{html_path}: {result}") from result
+    return results
+
+def convert_html_to_pdf(html_path=None, pdf_path=None, incremental=False, optimize=False):
+    """Convert HTML presentation to PDF using playwright
+
+    incremental: re-print only the slides that changed (see incremental_pdf.py)
+    optimize: shrink the PDF afterwards (see pdf_optimizer.py)
+    """
+    # Default to the presentation next to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    html_path = html_path or os.path.join(script_dir, "presentation.html")
+    pdf_path = pdf_path or os.path.splitext(html_path)[0] + ".pdf"
+
+    print(f"Converting {html_path} to PDF...")
+    pdf_path = asyncio.run(convert_batch([(html_path, pdf_path)], incremental=incremental))[0]
+    if optimize:
+        optimize_pdfs([pdf_path])
     return pdf_path
 
+def optimize_pdfs(pdf_paths):
+    """Post-process every PDF of pdf_paths in place and print what was saved"""
+    from pdf_optimizer import optimize_pdf, print_optimization_report
+
+    for pdf_path in pdf_paths:
+        print_optimization_report(optimize_pdf(pdf_path, pdf_path), top=5)
+
 def main():
     print("=" * 60)
     print("HTML Presentation to PDF Converter")
@@ -82,15 +301,65 @@ def main():
     else:
         print("\n✓ Playwright is already installed")
 
+    # --split prints slide ranges concurrently; --split=N into N ranges
+    split = None
+    for arg in sys.argv[1:]:
+        if arg == '--split':
+            split = True
+        elif arg.startswith('--split='):
+            value = arg.split('=', 1)[1]
+            try:
+                split = int(value)
+            except ValueError:
+                split = 0
+            if split < 1:
+                print(f"\n✗ --split=N needs a number of ranges of at least 1, got {value!r}")
+                sys.exit(2)
+    # --incremental re-prints only the slides changed since the last export
+    incremental = '--incremental' in sys.argv[1:]
+    if incremental and split:
+        print("\n⚠️  --split is ignored with --incremental")
+        split = None
+    # --optimize shrinks every PDF afterwards, without another browser pass
+    optimize = '--optimize' in sys.argv[1:]
+    if (split or incremental or optimize) and not check_pypdf_installed():
+        print("\npypdf not found. Installing...")
+        install_pypdf()
+
     # Convert to PDF
-    print("\nStarting conversion...")
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_deck = "presentation_print.html" if split or incremental else "presentation.html"
+    html_paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    html_paths = html_paths or [os.path.join(script_dir, default_deck)]
+    jobs = [(html_path, os.path.splitext(html_path)[0] + ".pdf") for html_path in html_paths]
+
+    # --offline serves fonts, CSS and scripts from the vendored asset store
+    assets = None
+    if '--offline' in sys.argv[1:]:
+        from asset_vendor import AssetStore, external_urls
+
+        assets = AssetStore()
+        for html_path, _ in jobs:
+            with open(html_path, 'r', encoding='utf-8') as f:
+                missing = assets.missing(external_urls(f.read()))
+            if missing:
+                print(f"\n⚠️  {os.path.basename(html_path)}: {len(missing)} asset(s) not vendored, "
+                      f"they will be blocked (run asset_vendor.py first):")
+                for url in missing:
+                    print(f"   {url}")
+
+    print(f"\nStarting conversion of {len(jobs)} deck(s)...")
     try:
-        pdf_path = convert_html_to_pdf()
+        started = time.perf_counter()
+        pdf_paths = asyncio.run(convert_batch(jobs, split=split, assets=assets, incremental=incremental))
+        if optimize:
+            optimize_pdfs(pdf_paths)
         print("\n" + "=" * 60)
         print("CONVERSION COMPLETE!")
         print("=" * 60)
-        print(f"\nYour PDF is ready at:")
-        print(f"  {pdf_path}")
+        print(f"\n{len(pdf_paths)} PDF(s) ready in {time.perf_counter() - started:.1f}s:")
+        for pdf_path in pdf_paths:
+            print(f"  {pdf_path}")
         print("\nYou can now:")
         print("  - Present using any PDF reader")
         print("  - Share via email or cloud storage")
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """
 Create a printable version of the HTML presentation with all slides visible
+With --static-css the Tailwind CDN script is replaced by a precompiled
+stylesheet (see tailwind_static.py), so printing runs no Tailwind JavaScript
 """
 
 import re
+import sys
 
-def create_printable_html():
+def create_printable_html(static_css=False):
     """Read the original HTML and create a version with all slides visible"""
 
     # Read the original HTML
@@ -59,6 +62,15 @@ def create_printable_html():
     # Remove the 'active' class from first slide to make all equal
     # Actually, keep them all visible
 
+    if static_css:
+        from tailwind_static import inline_static_css
+
+        try:
+            html_content, utilities = inline_static_css(html_content)
+            print(f"✓ Tailwind compiled ahead of time: {len(utilities)} utilities, CDN script removed")
+        except ValueError as e:
+            print(f"⚠ Keeping the Tailwind CDN script: {e}")
+
     # Write the modified HTML
     output_path = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation_print.html'
     with open(output_path, 'w') as f:
@@ -69,4 +81,4 @@ def create_printable_html():
     return output_path
 
 if __name__ == "__main__":
-    create_printable_html()
+    create_printable_html(static_css='--static-css' in sys.argv[1:])
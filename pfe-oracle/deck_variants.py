@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Several output decks from one build
+The deck is parsed, laid out and filled with text once. Inside a PictureLog
+block every picture is embedded as its original file and logged with the
+size it is drawn at; each variant then only re-embeds those pictures for its
+image profile and saves. A text-only variant (handout) drops the pictures
+instead, so it is always saved last.
+
+    python convert_html_to_perfect_pptx.py --variants=web,print,handout
+"""
+
+import io
+import os
+
+from image_pipeline import PROFILES, downscale, log_pictures
+
+# Variant name -> image profile it embeds with; None = text only
+VARIANTS = dict({name: name for name in PROFILES}, handout=None)
+
+
+def parse_variants(value):
+    """Variant names from 'web,print,handout', in save order (text-only last)"""
+    names = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names if name not in VARIANTS]
+    if unknown or not names:
+        raise ValueError(f"Unknown output variant(s) {', '.join(unknown) or value!r} "
+                         f"(expected some of {', '.join(VARIANTS)})")
+    return sorted(names, key=lambda name: VARIANTS[name] is None)
+
+
+def variant_path(output_path, variant):
+    """presentation_perfect.pptx -> presentation_perfect_print.pptx"""
+    root, extension = os.path.splitext(output_path)
+    return f"{root}_{variant}{extension}"
+
+
+class PictureLog:
+    """Pictures added through image_pipeline inside the with-block, for re-embedding"""
+
+    def __init__(self):
+        self.pictures = []
+
+    def __enter__(self):
+        log_pictures(self.pictures)
+        return self
+
+    def __exit__(self, *exc_info):
+        log_pictures(None)
+
+    def _drop_image_rels(self):
+        """Unlink the logged pictures' images, so their parts are left out of the next save"""
+        for picture, _, _ in self.pictures:
+            rels = picture.part.rels
+            rId = picture.element.blip_rId
+            if rId in rels:
+                rels.pop(rId)
+
+    def embed(self, profile):
+        """Point every logged picture at its image for profile
+
+        All old links go first, so rIds and media part names are handed out
+        in the same order as a build that embedded for profile directly.
+        """
+        self._drop_image_rels()
+        for picture, image_path, image_size in self.pictures:
+            data = downscale(image_path, *image_size, profile)
+            image_part, rId = picture.part.get_or_add_image_part(
+                image_path if data is None else io.BytesIO(data))
+            picture.element.blipFill.blip.rEmbed = rId
+            picture.element.nvPicPr.cNvPr.set('descr', image_part.desc)
+
+    def strip(self):
+        """Remove every logged picture (text-only output); the log is emptied"""
+        self._drop_image_rels()
+        for picture, _, _ in self.pictures:
+            picture.element.getparent().remove(picture.element)
+        self.pictures.clear()
+
+    def save(self, prs, variant, output_path):
+        """Save prs as variant to output_path"""
+        profile = VARIANTS[variant]
+        if profile is None:
+            self.strip()
+        else:
+            self.embed(profile)
+        prs.save(output_path)
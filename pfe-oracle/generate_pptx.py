@@ -9,7 +9,16 @@ from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
+from functools import partial
 import os
+import sys
+
+import ooxml_shapes
+from asset_index import report_missing_assets, resolve_asset
+from image_pipeline import add_fitted_picture, add_picture, print_image_report
+from ooxml_shapes import ShapeWriter
+from parallel_pptx import render_parallel
+from slide_layouts import add_slide_layout, background, title_placeholder
 
 # Exact color palette from HTML
 TEAL_PRIMARY = RGBColor(20, 83, 95)      # #14535F
@@ -26,42 +35,97 @@ SLIDE_WIDTH = Inches(10)
 SLIDE_HEIGHT = Inches(5.625)
 
 class PresentationBuilder:
-    def __init__(self, images_dir):
+    def __init__(self, images_dir, use_layouts=False):
         self.prs = Presentation()
         self.prs.slide_width = SLIDE_WIDTH
         self.prs.slide_height = SLIDE_HEIGHT
         self.images_dir = images_dir
+        # Slides before this builder's first one (render_parallel() chunks)
+        self.slide_offset = 0
+        # With use_layouts, backgrounds, title styling and the red underline
+        # live on custom layouts instead of being repeated on every slide
+        self.layouts = self._create_layouts() if use_layouts else None
+
+    def _create_layouts(self):
+        """Title, divider, content and full-image layouts carrying the shared chrome"""
+        dark_background = background(ooxml_shapes.gradient_fill(TEAL_PRIMARY, TEAL_DARK, 135))
+        light_background = background(ooxml_shapes.solid_fill(LIGHT_GRAY_BG))
+
+        return {
+            'title': add_slide_layout(self.prs, 'PFE Title', dark_background, title_placeholder(
+                2, Inches(0.5), Inches(2.0), Inches(9), Inches(1.2),
+                ooxml_shapes.font('defRPr', 44, True, WHITE, '+mn-lt'), align='ctr')),
+            'divider': add_slide_layout(self.prs, 'PFE Divider', dark_background, title_placeholder(
+                2, Inches(1), Inches(2), Inches(8), Inches(1.5),
+                ooxml_shapes.font('defRPr', 56, True, WHITE, '+mn-lt'), align='ctr', word_wrap=True)),
+            'content': add_slide_layout(self.prs, 'PFE Content', light_background, title_placeholder(
+                2, Inches(0.5), Inches(0.3), Inches(9), Inches(0.6),
+                ooxml_shapes.font('defRPr', 32, True, TEAL_PRIMARY, '+mn-lt'))
+                + ooxml_shapes.autoshape(3, ooxml_shapes.RECTANGLE, Inches(0.5), Inches(0.95), Inches(9), Inches(0.08),
+                                         ooxml_shapes.solid_fill(RED_ACCENT), ooxml_shapes.line())),
+            'full-image': add_slide_layout(self.prs, 'PFE Full Image', light_background),
+        }
+
+    def _new_content_slide(self, title_text):
+        """Light content slide with the teal title and red underline"""
+        if self.layouts:
+            slide = self.prs.slides.add_slide(self.layouts['content'])
+            slide.shapes.title.text = title_text
+            return slide
 
-    def add_title_slide(self):
-        """Slide 1: Title slide with logos"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # Blank layout
+        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide.background.fill.solid()
+        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
+        self._add_content_title(slide, title_text)
+        return slide
+
+    def _new_full_image_slide(self):
+        """Light slide without title"""
+        if self.layouts:
+            return self.prs.slides.add_slide(self.layouts['full-image'])
+
+        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide.background.fill.solid()
+        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
+        return slide
 
-        # Dark teal gradient background
-        background = slide.background
-        fill = background.fill
+    def _add_dark_background(self, slide):
+        """Dark teal gradient background"""
+        fill = slide.background.fill
         fill.gradient()
         fill.gradient_angle = 135
         fill.gradient_stops[0].color.rgb = TEAL_PRIMARY
         fill.gradient_stops[1].color.rgb = TEAL_DARK
 
+    def add_title_slide(self):
+        """Slide 1: Title slide with logos"""
+        title_text = "Infrastructure as Code Support\nin Graal CI"
+        if self.layouts:
+            slide = self.prs.slides.add_slide(self.layouts['title'])
+            slide.shapes.title.text = title_text
+        else:
+            slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # Blank layout
+            self._add_dark_background(slide)
+
         # Logos at top
         logo_top = Inches(0.8)
-        logo1_path = os.path.join(self.images_dir, "logo_ehtp.jpg")
-        logo2_path = os.path.join(self.images_dir, "logo_graalvm.png")
+        logo1_path = self._image_path("logo_ehtp.jpg")
+        logo2_path = self._image_path("logo_graalvm.png")
 
-        if os.path.exists(logo1_path):
-            slide.shapes.add_picture(logo1_path, Inches(3.0), logo_top, height=Inches(0.8))
-        if os.path.exists(logo2_path):
-            slide.shapes.add_picture(logo2_path, Inches(6.0), logo_top, height=Inches(0.8))
+        if logo1_path:
+            add_picture(slide.shapes, logo1_path, Inches(3.0), logo_top, height=Inches(0.8))
+        if logo2_path:
+            add_picture(slide.shapes, logo2_path, Inches(6.0), logo_top, height=Inches(0.8))
 
         # Main title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.0), Inches(9), Inches(1.2))
-        title_frame = title_box.text_frame
-        title_frame.text = "Infrastructure as Code Support\nin Graal CI"
-        title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        title_frame.paragraphs[0].font.size = Pt(44)
-        title_frame.paragraphs[0].font.bold = True
-        title_frame.paragraphs[0].font.color.rgb = WHITE
+        if not self.layouts:
+            title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.0), Inches(9), Inches(1.2))
+            title_frame = title_box.text_frame
+            title_frame.text = title_text
+            title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            title_frame.paragraphs[0].font.size = Pt(44)
+            title_frame.paragraphs[0].font.bold = True
+            title_frame.paragraphs[0].font.color.rgb = WHITE
 
         # Subtitle
         subtitle_box = slide.shapes.add_textbox(Inches(0.5), Inches(3.3), Inches(9), Inches(0.5))
@@ -84,12 +148,7 @@ class PresentationBuilder:
 
     def add_agenda_slide(self):
         """Slide 2: Table of Contents with 2x3 card grid"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        # Title with red underline
-        self._add_content_title(slide, "Agenda")
+        slide = self._new_content_slide("Agenda")
 
         # 2x3 card grid
         cards_data = [
@@ -105,15 +164,13 @@ class PresentationBuilder:
 
     def add_divider_slide(self, title_text):
         """Divider slide with dark teal gradient"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        if self.layouts:
+            slide = self.prs.slides.add_slide(self.layouts['divider'])
+            slide.shapes.title.text = title_text
+            return
 
-        # Dark teal gradient background
-        background = slide.background
-        fill = background.fill
-        fill.gradient()
-        fill.gradient_angle = 135
-        fill.gradient_stops[0].color.rgb = TEAL_PRIMARY
-        fill.gradient_stops[1].color.rgb = TEAL_DARK
+        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        self._add_dark_background(slide)
 
         # Large centered title
         title_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(1.5))
@@ -127,11 +184,7 @@ class PresentationBuilder:
 
     def add_bullet_list_slide(self, title, bullets):
         """Content slide with bullet list"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, title)
+        slide = self._new_content_slide(title)
 
         # Bullet list with white cards and teal left border
         top = Inches(1.5)
@@ -145,20 +198,12 @@ class PresentationBuilder:
 
     def add_card_grid_slide(self, title, cards_data, cols=2):
         """Content slide with card grid"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, title)
+        slide = self._new_content_slide(title)
         self._add_card_grid(slide, cards_data, cols, top=Inches(1.5))
 
     def add_two_column_slide(self, title, left_bullets, right_content_type, right_data):
         """Two-column slide with text and image/cards"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, title)
+        slide = self._new_content_slide(title)
 
         # Left column - bullets
         left_top = Inches(1.5)
@@ -175,22 +220,14 @@ class PresentationBuilder:
 
     def add_full_image_slide(self, image_name):
         """Full-screen image slide"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
+        slide = self._new_full_image_slide()
 
-        img_path = os.path.join(self.images_dir, image_name)
-        if os.path.exists(img_path):
-            # Center image with shadow effect
-            self._add_image(slide, image_name, Inches(0.5), Inches(0.4), Inches(9), Inches(4.8))
+        # Center image with shadow effect
+        self._add_image(slide, image_name, Inches(0.5), Inches(0.4), Inches(9), Inches(4.8))
 
     def add_tool_grid_slide(self, title, tools):
         """4-column tool grid slide"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, title)
+        slide = self._new_content_slide(title)
 
         # 4-column grid layout - adjusted to fit 6 tools in 2 rows
         col_width = Inches(2.2)
@@ -216,9 +253,9 @@ class PresentationBuilder:
 
             # Tool icon/logo
             if tool.get("image"):
-                img_path = os.path.join(self.images_dir, tool["image"])
-                if os.path.exists(img_path):
-                    slide.shapes.add_picture(img_path, left + Inches(0.7), top + Inches(0.2), height=Inches(0.5))
+                img_path = self._image_path(tool["image"])
+                if img_path:
+                    add_picture(slide.shapes, img_path, left + Inches(0.7), top + Inches(0.2), height=Inches(0.5))
             elif tool.get("placeholder"):
                 # Create gradient placeholder for Git
                 placeholder = slide.shapes.add_shape(
@@ -250,11 +287,7 @@ class PresentationBuilder:
 
     def add_timeline_slide(self):
         """Timeline slide with 3-column phase grid"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, "Project Timeline & Key Milestones")
+        slide = self._new_content_slide("Project Timeline & Key Milestones")
 
         phases = [
             ("Phase 1: Research (2 weeks)", ["OCI API exploration", "Pulumi SDK study", "Requirements gathering", "Architecture design"], RGBColor(59, 130, 246)),
@@ -315,11 +348,7 @@ class PresentationBuilder:
 
     def add_performance_metrics_slide(self):
         """Performance metrics with large numbers and comparison"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-
-        self._add_content_title(slide, "Performance Metrics & Improvements")
+        slide = self._new_content_slide("Performance Metrics & Improvements")
 
         # Three big metric boxes
         metrics = [
@@ -419,24 +448,24 @@ class PresentationBuilder:
 
     def add_thank_you_slide(self):
         """Final thank you slide with logos"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-
-        # Dark teal gradient background
-        background = slide.background
-        fill = background.fill
-        fill.gradient()
-        fill.gradient_angle = 135
-        fill.gradient_stops[0].color.rgb = TEAL_PRIMARY
-        fill.gradient_stops[1].color.rgb = TEAL_DARK
+        if self.layouts:
+            # Divider layout, with the title moved up to make room for the author block
+            slide = self.prs.slides.add_slide(self.layouts['divider'])
+            title = slide.shapes.title
+            title.text = "Thank You"
+            title.left, title.top, title.width, title.height = Inches(1), Inches(1.2), Inches(8), Inches(0.8)
+        else:
+            slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+            self._add_dark_background(slide)
 
-        # Thank You title
-        title_box = slide.shapes.add_textbox(Inches(1), Inches(1.2), Inches(8), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "Thank You"
-        title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        title_frame.paragraphs[0].font.size = Pt(56)
-        title_frame.paragraphs[0].font.bold = True
-        title_frame.paragraphs[0].font.color.rgb = WHITE
+            # Thank You title
+            title_box = slide.shapes.add_textbox(Inches(1), Inches(1.2), Inches(8), Inches(0.8))
+            title_frame = title_box.text_frame
+            title_frame.text = "Thank You"
+            title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            title_frame.paragraphs[0].font.size = Pt(56)
+            title_frame.paragraphs[0].font.bold = True
+            title_frame.paragraphs[0].font.color.rgb = WHITE
 
         # Subtitle
         subtitle_box = slide.shapes.add_textbox(Inches(1), Inches(2.1), Inches(8), Inches(0.5))
@@ -459,13 +488,13 @@ class PresentationBuilder:
 
         # Logos at bottom
         logo_bottom = Inches(4.6)
-        logo1_path = os.path.join(self.images_dir, "logo_ehtp.jpg")
-        logo2_path = os.path.join(self.images_dir, "logo_graalvm.png")
+        logo1_path = self._image_path("logo_ehtp.jpg")
+        logo2_path = self._image_path("logo_graalvm.png")
 
-        if os.path.exists(logo1_path):
-            slide.shapes.add_picture(logo1_path, Inches(3.5), logo_bottom, height=Inches(0.65))
-        if os.path.exists(logo2_path):
-            slide.shapes.add_picture(logo2_path, Inches(5.8), logo_bottom, height=Inches(0.65))
+        if logo1_path:
+            add_picture(slide.shapes, logo1_path, Inches(3.5), logo_bottom, height=Inches(0.65))
+        if logo2_path:
+            add_picture(slide.shapes, logo2_path, Inches(5.8), logo_bottom, height=Inches(0.65))
 
     # Helper methods
     def _add_content_title(self, slide, title_text):
@@ -621,14 +650,14 @@ class PresentationBuilder:
         content_frame.word_wrap = True
 
     def _add_image(self, slide, image_name, left, top, width, height):
-        """Add image to slide"""
-        img_path = os.path.join(self.images_dir, image_name)
-        if os.path.exists(img_path):
-            try:
-                slide.shapes.add_picture(img_path, left, top, width=width, height=height)
-            except:
-                # If image can't fit exact dimensions, let it scale
-                slide.shapes.add_picture(img_path, left, top, width=width)
+        """Add image to slide, as large as fits in the box without distortion (centered)"""
+        img_path = self._image_path(image_name)
+        if img_path:
+            add_fitted_picture(slide.shapes, img_path, left, top, width, height)
+
+    def _image_path(self, image_name):
+        """Path of image_name in the images directory, or None (reported at the end)"""
+        return resolve_asset(self.images_dir, image_name, f"slide {self.slide_offset + len(self.prs.slides)}")
 
     def save(self, output_path):
         """Save presentation to file"""
@@ -636,28 +665,107 @@ class PresentationBuilder:
         return output_path
 
 
-def main():
-    images_dir = "/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images"
-    output_path = "/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation_final_perfect.pptx"
+class XmlPresentationBuilder(PresentationBuilder):
+    """PresentationBuilder whose composite helpers write slide XML directly
 
-    print("Generating pixel-perfect PowerPoint presentation...")
-    print(f"Images directory: {images_dir}")
+    Title bars, bullet cards, card grids and highlight boxes are emitted from
+    ooxml_shapes templates, one parse per helper call instead of one python-pptx
+    proxy per shape and property. The slide XML is identical to the python-pptx path.
+    """
+
+    def _add_content_title(self, slide, title_text):
+        """Add title with teal color and red underline"""
+        writer = ShapeWriter(slide)
+        writer.textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.6),
+                       ooxml_shapes.text_paragraphs(title_text, ooxml_shapes.font('defRPr', 32, True, TEAL_PRIMARY)))
+        writer.autoshape(ooxml_shapes.RECTANGLE, Inches(0.5), Inches(0.95), Inches(9), Inches(0.08),
+                         ooxml_shapes.solid_fill(RED_ACCENT), ooxml_shapes.line())
+        writer.flush()
+
+    def _add_bullet_card(self, slide, text, top, left=Inches(0.5), width=Inches(9)):
+        """Add white card with teal left border for bullet point"""
+        card_height = Inches(0.55)
+        default_font = ooxml_shapes.font('defRPr', 14, color=TEXT_GRAY)
+
+        if "<strong>" in text:
+            parts = text.split("<strong>")
+            content = ooxml_shapes.paragraph_runs(parts[0]) if parts[0] else ''
+            for part in parts[1:]:
+                bold_text, normal_text = part.split("</strong>", 1)
+                content += ooxml_shapes.run(bold_text, ooxml_shapes.font('rPr', 14, True, TEXT_GRAY))
+                if normal_text:
+                    content += ooxml_shapes.run(normal_text, ooxml_shapes.font('rPr', 14, color=TEXT_GRAY))
+            paragraphs = ooxml_shapes.paragraph(content, default_font if parts[0] else None)
+        else:
+            paragraphs = ooxml_shapes.text_paragraphs(text, default_font)
+
+        writer = ShapeWriter(slide)
+        writer.autoshape(ooxml_shapes.ROUNDED_RECTANGLE, left, top, width, card_height,
+                         ooxml_shapes.solid_fill(WHITE), ooxml_shapes.line(RGBColor(226, 232, 240)))
+        writer.autoshape(ooxml_shapes.RECTANGLE, left, top, Inches(0.08), card_height,
+                         ooxml_shapes.solid_fill(TEAL_PRIMARY), ooxml_shapes.line())
+        writer.textbox(left + Inches(0.2), top + Inches(0.05), width - Inches(0.3), card_height - Inches(0.1),
+                       paragraphs, word_wrap=True, anchor='ctr')
+        writer.flush()
+
+    def _add_card_grid(self, slide, cards_data, cols, top):
+        """Add grid of cards"""
+        card_width = Inches((9 / cols) - 0.2)
+        card_height = Inches(1.2)
+        title_font = ooxml_shapes.font('defRPr', 13, True, TEAL_PRIMARY)
+        content_font = ooxml_shapes.font('defRPr', 11, color=TEXT_GRAY)
+
+        writer = ShapeWriter(slide)
+        for idx, (title, content) in enumerate(cards_data):
+            row = idx // cols
+            col = idx % cols
+            left = Inches(0.5) + (col * (card_width + Inches(0.2)))
+            card_top = top + (row * (card_height + Inches(0.15)))
+
+            writer.autoshape(ooxml_shapes.ROUNDED_RECTANGLE, left, card_top, card_width, card_height,
+                             ooxml_shapes.solid_fill(WHITE), ooxml_shapes.line(RGBColor(226, 232, 240)))
+            writer.autoshape(ooxml_shapes.RECTANGLE, left, card_top, card_width, Inches(0.08),
+                             ooxml_shapes.solid_fill(TEAL_PRIMARY), ooxml_shapes.line())
+            writer.textbox(left + Inches(0.15), card_top + Inches(0.12), card_width - Inches(0.3), Inches(0.25),
+                           ooxml_shapes.text_paragraphs(title, title_font), word_wrap=True)
+            writer.textbox(left + Inches(0.15), card_top + Inches(0.42), card_width - Inches(0.3), Inches(0.7),
+                           ooxml_shapes.text_paragraphs(content, content_font), word_wrap=True)
+        writer.flush()
 
-    builder = PresentationBuilder(images_dir)
+    def _add_highlight_box(self, slide, title, content, left, top, width):
+        """Add gradient highlight box"""
+        box_height = Inches(1.5)
 
-    # Slide 1: Title
-    print("  [1/58] Title slide...")
+        writer = ShapeWriter(slide)
+        writer.autoshape(ooxml_shapes.ROUNDED_RECTANGLE, left, top, width, box_height,
+                         ooxml_shapes.gradient_fill(TEAL_PRIMARY, TEAL_LIGHT, 135), ooxml_shapes.line())
+        writer.textbox(left + Inches(0.2), top + Inches(0.15), width - Inches(0.4), Inches(0.3),
+                       ooxml_shapes.text_paragraphs(title, ooxml_shapes.font('defRPr', 18, True, WHITE)))
+        writer.textbox(left + Inches(0.2), top + Inches(0.5), width - Inches(0.4), Inches(0.9),
+                       ooxml_shapes.text_paragraphs(content, ooxml_shapes.font('defRPr', 12, color=WHITE)),
+                       word_wrap=True)
+        writer.flush()
+
+
+def slide_01(builder):
+    """Title slide"""
     builder.add_title_slide()
 
-    # Slide 2: Agenda
-    print("  [2/58] Agenda...")
+
+def slide_02(builder):
+    """Agenda"""
     builder.add_agenda_slide()
 
-    # SECTION 1: COMPANY & TEAM CONTEXT
-    print("  [3/58] Divider: Company & Team Context...")
+
+# SECTION 1: COMPANY & TEAM CONTEXT
+
+def slide_03(builder):
+    """Divider: Company & Team Context"""
     builder.add_divider_slide("Company & Team Context")
 
-    print("  [4/58] Oracle Corporation...")
+
+def slide_04(builder):
+    """Oracle Corporation"""
     builder.add_bullet_list_slide("Oracle Corporation", [
         "<strong>Global Technology Leader:</strong> Multinational computer technology corporation specializing in database software and cloud solutions",
         "<strong>Founded:</strong> 1977 by Larry Ellison, Bob Miner, and Ed Oates",
@@ -667,11 +775,10 @@ def main():
         "<strong>Revenue:</strong> $50+ billion annually with 430,000+ employees globally"
     ])
 
-    print("  [5/58] Oracle Labs...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "Oracle Labs - Research & Innovation")
+
+def slide_05(builder):
+    """Oracle Labs"""
+    slide = builder._new_content_slide("Oracle Labs - Research & Innovation")
 
     # Left column bullets
     left_bullets = [
@@ -712,11 +819,10 @@ def main():
     content_box.text_frame.paragraphs[0].font.color.rgb = TEXT_GRAY
     content_box.text_frame.word_wrap = True
 
-    print("  [6/58] GraalVM Overview...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "GraalVM - High-Performance Polyglot Runtime")
+
+def slide_06(builder):
+    """GraalVM Overview"""
+    slide = builder._new_content_slide("GraalVM - High-Performance Polyglot Runtime")
 
     # Left bullets
     left_bullets = [
@@ -732,7 +838,9 @@ def main():
     # Right image
     builder._add_image(slide, "logo_graalvm.png", Inches(5.3), Inches(1.8), Inches(4.2), Inches(3.0))
 
-    print("  [7/58] GraalVM RISQ Team...")
+
+def slide_07(builder):
+    """GraalVM RISQ Team"""
     builder.add_bullet_list_slide("GraalVM RISQ Team", [
         "<strong>Team Name:</strong> RISQ (Release Infrastructure, Systems & Quality)",
         "<strong>Mission:</strong> Ensure reliability, scalability, and quality of GraalVM infrastructure and development workflows",
@@ -746,7 +854,9 @@ def main():
                                "The RISQ team acts as the backbone supporting GraalVM development, ensuring smooth operations for hundreds of developers",
                                Inches(0.5), Inches(4.4), Inches(9))
 
-    print("  [8/58] Project Context & My Role...")
+
+def slide_08(builder):
+    """Project Context & My Role"""
     builder.add_card_grid_slide("Project Context & Internship Focus", [
         ("Team Challenge", "GraalVM requires frequent infrastructure provisioning for testing, CI/CD, and development environments across multiple cloud regions"),
         ("Manual Bottleneck", "Infrastructure management was manual, error-prone, and time-consuming - limiting team agility"),
@@ -754,11 +864,16 @@ def main():
         ("My Role", "Lead developer responsible for architecture design, implementation, and GitLab CI/CD integration")
     ], cols=2)
 
-    # SECTION 2: PROBLEM & SOLUTION
-    print("  [9/58] Divider: Problem & Solution Overview...")
+
+# SECTION 2: PROBLEM & SOLUTION
+
+def slide_09(builder):
+    """Divider: Problem & Solution Overview"""
     builder.add_divider_slide("Problem & Solution Overview")
 
-    print("  [10/58] Current Challenges...")
+
+def slide_10(builder):
+    """Current Challenges"""
     builder.add_bullet_list_slide("Current Infrastructure Management Challenges", [
         "<strong>Manual Console Operations:</strong> Team members had to manually create resources through OCI web console - time-consuming and repetitive",
         "<strong>Lack of Version Control:</strong> No tracking of infrastructure changes, making rollbacks and audits difficult",
@@ -773,7 +888,9 @@ def main():
                                "Result: Slow deployment cycles, increased error rates, and reduced team productivity",
                                Inches(0.5), Inches(4.8), Inches(9))
 
-    print("  [11/58] Functional Requirements...")
+
+def slide_11(builder):
+    """Functional Requirements"""
     builder.add_bullet_list_slide("Functional Requirements", [
         "<strong>FR1 - Declarative Configuration:</strong> Users define infrastructure in human-readable format (JSON) without writing Python/Terraform code",
         "<strong>FR2 - Resource Support:</strong> Support for essential OCI resources (VCN, Subnets, Compute Instances, Storage Buckets, Security Lists, Routing)",
@@ -783,18 +900,19 @@ def main():
         "<strong>FR6 - Multi-Environment:</strong> Support for development, staging, and production configurations"
     ])
 
-    print("  [12/58] Non-Functional Requirements...")
+
+def slide_12(builder):
+    """Non-Functional Requirements"""
     builder.add_card_grid_slide("Non-Functional Requirements", [
         ("Performance", "• Provision infrastructure in <5 minutes\n• Support concurrent deployments\n• Minimal API calls to OCI"),
         ("Security", "• Credentials stored securely (GitLab secrets)\n• No hardcoded sensitive data\n• Audit trail via Git commits"),
         ("Extensibility", "• Plugin architecture for new resources\n• Support for future cloud providers\n• Custom validation rules"),
     ], cols=2)
 
-    print("  [13/58] Technology Comparison...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "IaC Technology Selection: Terraform vs Pulumi")
+
+def slide_13(builder):
+    """Technology Comparison"""
+    slide = builder._new_content_slide("IaC Technology Selection: Terraform vs Pulumi")
 
     # Two large comparison cards
     # Terraform card (left)
@@ -888,7 +1006,9 @@ def main():
     p.font.color.rgb = TEAL_PRIMARY
     p.font.italic = True
 
-    print("  [14/58] How does Pulumi work...")
+
+def slide_14(builder):
+    """How does Pulumi work"""
     builder.add_card_grid_slide("How does Pulumi work?", [
         ("1. Write Code", "Define infrastructure using Python - loops, functions, conditionals available"),
         ("2. Preview", "Run 'pulumi preview' to see what will change before applying"),
@@ -908,17 +1028,26 @@ def main():
         builder._add_bullet_card(slide, bullet, top, Inches(0.5), Inches(9))
         top += Inches(0.55)
 
-    print("  [15/58] Framework Solution Pillars...")
+
+def slide_15(builder):
+    """Framework Solution Pillars"""
     builder.add_full_image_slide("the framework pillars , features.png")
 
-    print("  [16/58] Layer Architecture...")
+
+def slide_16(builder):
+    """Layer Architecture"""
     builder.add_full_image_slide("arch_layer architecture_system.png")
 
-    # SECTION 3: PROJECT MANAGEMENT
-    print("  [17/58] Divider: Project Management...")
+
+# SECTION 3: PROJECT MANAGEMENT
+
+def slide_17(builder):
+    """Divider: Project Management"""
     builder.add_divider_slide("Project Management")
 
-    print("  [18/58] Management Approach...")
+
+def slide_18(builder):
+    """Management Approach"""
     builder.add_bullet_list_slide("Project Management Approach", [
         "<strong>Methodology:</strong> Kanban Agile - visual workflow management with continuous delivery",
         "<strong>Project Tracker:</strong> Task board for tracking work items (To Do, In Progress, Done)",
@@ -927,10 +1056,14 @@ def main():
         "<strong>Focus on Delivery:</strong> Prioritize completing tasks over starting new ones"
     ])
 
-    print("  [19/58] Development Workflow...")
+
+def slide_19(builder):
+    """Development Workflow"""
     builder.add_full_image_slide("mgmt_task_workflow.png")
 
-    print("  [20/58] Communication Tools...")
+
+def slide_20(builder):
+    """Communication Tools"""
     builder.add_tool_grid_slide("Communication & Collaboration Tools", [
         {"name": "Slack", "image": "tool_slack.png", "description": "Daily communication, quick questions"},
         {"name": "Zoom", "image": "tool_zoom.png", "description": "Weekly sync meetings, discussions"},
@@ -940,11 +1073,10 @@ def main():
         {"name": "GitLab", "placeholder": True, "description": "Code repository, CI/CD, MRs"}
     ])
 
-    print("  [21/58] Mentor Sessions...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "Mentor Check-ins & Team Meetings")
+
+def slide_21(builder):
+    """Mentor Sessions"""
+    slide = builder._new_content_slide("Mentor Check-ins & Team Meetings")
 
     # Left - image
     builder._add_image(slide, "mgmt_mentor_session.png", Inches(0.5), Inches(1.5), Inches(4.3), Inches(3.0))
@@ -1008,24 +1140,32 @@ def main():
                                "Communication Style: Open-door policy via Slack - quick responses and collaborative problem-solving",
                                Inches(5.3), Inches(4.15), Inches(4.2))
 
-    print("  [22/58] Timeline & Milestones...")
+
+def slide_22(builder):
+    """Timeline & Milestones"""
     builder.add_timeline_slide()
 
-    # SECTION 4: TECHNICAL IMPLEMENTATION
-    print("  [23/58] Divider: Technical Implementation...")
+
+# SECTION 4: TECHNICAL IMPLEMENTATION
+
+def slide_23(builder):
+    """Divider: Technical Implementation"""
     builder.add_divider_slide("Technical Implementation")
 
-    print("  [24/58] Use Case Diagram...")
+
+def slide_24(builder):
+    """Use Case Diagram"""
     builder.add_full_image_slide("design_usecase_diagram.png")
 
-    print("  [25/58] Project Structure...")
+
+def slide_25(builder):
+    """Project Structure"""
     builder.add_full_image_slide("project folders .png")
 
-    print("  [26/58] JSON Configuration Example...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "JSON Configuration Example")
+
+def slide_26(builder):
+    """JSON Configuration Example"""
+    slide = builder._new_content_slide("JSON Configuration Example")
 
     # Code card
     card = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.5), Inches(1.5), Inches(9), Inches(2.0))
@@ -1073,7 +1213,9 @@ def main():
         builder._add_bullet_card(slide, bullet, top)
         top += Inches(0.55)
 
-    print("  [27/58] Core Framework Components...")
+
+def slide_27(builder):
+    """Core Framework Components"""
     builder.add_card_grid_slide("Core Framework Components", [
         ("BaseResource (Abstract)", "File: core/base_resource.py (21 lines)\nPurpose: Abstract base class defining resource interface\nMethods: create() - Factory method, build() - Abstract (must implement)"),
         ("ResourceFactory", "File: core/resource_factory.py (38 lines)\nPurpose: Factory pattern for dynamic instantiation\nRegistry: Maps type strings → Python classes\n7 resource types registered"),
@@ -1081,16 +1223,24 @@ def main():
         ("ConfigLoader", "File: config/config_loader.py (25 lines)\nPurpose: Parse infrastructure.json\nMethods: get_vcns_config(), get_instances_config(), get_image_config()")
     ], cols=2)
 
-    print("  [28/58] Class Diagram...")
+
+def slide_28(builder):
+    """Class Diagram"""
     builder.add_full_image_slide("class diagram .png")
 
-    print("  [29/58] Factory Pattern...")
+
+def slide_29(builder):
+    """Factory Pattern"""
     builder.add_full_image_slide("arch_factory_pattern.png")
 
-    print("  [30/58] Dependency Resolver...")
+
+def slide_30(builder):
+    """Dependency Resolver"""
     builder.add_full_image_slide("arch_dependency_resolution.png")
 
-    print("  [31/58] Implemented Resources...")
+
+def slide_31(builder):
+    """Implemented Resources"""
     builder.add_card_grid_slide("Implemented Resource Types", [
         ("1. VCN (Virtual Cloud Network)", "Purpose: Foundation network container"),
         ("2. Internet Gateway", "Purpose: Enable internet connectivity"),
@@ -1101,34 +1251,46 @@ def main():
         ("7. Object Storage Bucket", "Purpose: S3-compatible object storage")
     ], cols=2)
 
-    print("  [32/58] Workflow Design...")
+
+def slide_32(builder):
+    """Workflow Design"""
     builder.add_full_image_slide("workflow_design.png")
 
-    print("  [33/58] GitLab Pipeline Stages...")
+
+def slide_33(builder):
+    """GitLab Pipeline Stages"""
     builder.add_full_image_slide("cicd_gitlab_pipeline plan and deploy stages.png")
 
-    print("  [34/58] Pull Request Workflow...")
+
+def slide_34(builder):
+    """Pull Request Workflow"""
     builder.add_full_image_slide("workflow_pull_request.png")
 
-    # SECTION 5: RESULTS & VALIDATIONS
-    print("  [35/58] Divider: Results & Validations...")
+
+# SECTION 5: RESULTS & VALIDATIONS
+
+def slide_35(builder):
+    """Divider: Results & Validations"""
     builder.add_divider_slide("Results & Validations")
 
-    print("  [36/58] Implementation Results...")
+
+def slide_36(builder):
+    """Implementation Results"""
     builder.add_card_grid_slide("Implementation Results", [
         ("✓ Deliverables Completed", "• Python framework (800 LOC)\n• 7 OCI resource types\n• JSON configuration system\n• GitLab CI/CD pipeline\n• Documentation & diagrams"),
         ("✓ Requirements Met", "• Declarative JSON config\n• Dependency resolution\n• CI/CD integration\n• Multi-environment support\n• State management"),
         ("✓ Production Ready", "• Error handling implemented\n• Tested on dev & staging\n• Documentation complete\n• Team training delivered\n• Now in active use by RISQ team")
     ], cols=2)
 
-    print("  [37/58] Deployment Success...")
+
+def slide_37(builder):
+    """Deployment Success"""
     builder.add_full_image_slide("result_instance_deployed.png")
 
-    print("  [38/58] Testing Results...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "Testing & Validation Results")
+
+def slide_38(builder):
+    """Testing Results"""
+    slide = builder._new_content_slide("Testing & Validation Results")
 
     # Two column layout with 4 cards total
     cards_left = [
@@ -1191,10 +1353,14 @@ def main():
         content_box.text_frame.paragraphs[0].font.color.rgb = TEXT_GRAY
         content_box.text_frame.word_wrap = True
 
-    print("  [39/58] Performance Metrics...")
+
+def slide_39(builder):
+    """Performance Metrics"""
     builder.add_performance_metrics_slide()
 
-    print("  [40/58] Business Impact...")
+
+def slide_40(builder):
+    """Business Impact"""
     builder.add_bullet_list_slide("Business Impact & Team Benefits", [
         "<strong>Developer Productivity:</strong> Team members can now focus on GraalVM development instead of infrastructure management - estimated 10+ hours saved per week across the team",
         "<strong>Faster Testing Cycles:</strong> Spin up test environments in minutes instead of hours - enables rapid experimentation and bug fixes",
@@ -1202,35 +1368,79 @@ def main():
         "<strong>Cost Optimization:</strong> All infrastructure tracked in Git - easier to identify and delete unused resources, preventing budget overruns"
     ])
 
-    # SECTION 6: FUTURE ENHANCEMENTS
-    print("  [41/58] Divider: Future Enhancements...")
+
+# SECTION 6: FUTURE ENHANCEMENTS
+
+def slide_41(builder):
+    """Divider: Future Enhancements"""
     builder.add_divider_slide("Future Enhancements")
 
-    print("  [42/58] Future Improvements...")
+
+def slide_42(builder):
+    """Future Improvements"""
     builder.add_card_grid_slide("Future Improvements", [
         ("More Resource Coverage", "Expand framework to support additional OCI resources like Load Balancers, Databases, and File Storage"),
         ("Schema Validation", "Implement JSON schema validation to catch configuration errors before deployment"),
         ("Role Identification", "Define clear roles within the team on how to use the framework and establish best practices")
     ], cols=2)
 
-    print("  [43/58] Conclusion...")
-    slide = builder.prs.slides.add_slide(builder.prs.slide_layouts[6])
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = LIGHT_GRAY_BG
-    builder._add_content_title(slide, "Conclusion")
+
+def slide_43(builder):
+    """Conclusion"""
+    slide = builder._new_content_slide("Conclusion")
 
     builder._add_highlight_box(slide, "",
                                "Successfully delivered a production-ready IaC framework that transforms infrastructure management for the GraalVM RISQ team",
                                Inches(1.5), Inches(2.5), Inches(7))
 
-    print("  [44/58] Thank You...")
+
+def slide_44(builder):
+    """Thank You"""
     builder.add_thank_you_slide()
 
-    # Save presentation
-    print("\nSaving presentation...")
-    output = builder.save(output_path)
+# Slide builders in deck order; each appends exactly one slide to the builder
+DECK = [
+    slide_01, slide_02, slide_03, slide_04, slide_05, slide_06,
+    slide_07, slide_08, slide_09, slide_10, slide_11, slide_12,
+    slide_13, slide_14, slide_15, slide_16, slide_17, slide_18,
+    slide_19, slide_20, slide_21, slide_22, slide_23, slide_24,
+    slide_25, slide_26, slide_27, slide_28, slide_29, slide_30,
+    slide_31, slide_32, slide_33, slide_34, slide_35, slide_36,
+    slide_37, slide_38, slide_39, slide_40, slide_41, slide_42,
+    slide_43, slide_44,
+]
+
+
+def main():
+    images_dir = "/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images"
+    output_path = "/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation_final_perfect.pptx"
+    parallel = '--parallel' in sys.argv[1:]
+    # --fast-xml writes cards, title bars and highlight boxes as raw slide XML
+    builder_class = XmlPresentationBuilder if '--fast-xml' in sys.argv[1:] else PresentationBuilder
+    # --layouts moves backgrounds, titles and the title underline onto custom slide layouts
+    new_builder = partial(builder_class, images_dir, use_layouts='--layouts' in sys.argv[1:])
+
+    print("Generating pixel-perfect PowerPoint presentation...")
+    print(f"Images directory: {images_dir}")
+
+    if parallel:
+        # Each worker renders a contiguous chunk of DECK; chunks are merged on save
+        print(f"  Rendering {len(DECK)} slides on {os.cpu_count()} worker processes...")
+        output = render_parallel(new_builder, DECK, output_path)
+    else:
+        builder = new_builder()
+        for number, slide_func in enumerate(DECK, 1):
+            print(f"  [{number}/{len(DECK)}] {slide_func.__doc__}...")
+            slide_func(builder)
+
+        # Save presentation
+        print("\nSaving presentation...")
+        output = builder.save(output_path)
+
     print(f"✓ Presentation saved: {output}")
-    print(f"\nTotal slides: {len(builder.prs.slides)}")
+    print(f"\nTotal slides: {len(DECK)}")
+    print_image_report()
+    report_missing_assets()
 
     return output
 
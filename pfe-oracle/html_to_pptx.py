@@ -10,6 +10,9 @@ from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 from lxml import html
 
+from asset_index import report_missing_assets, resolve_asset
+from image_pipeline import add_picture
+
 # Initialize presentation
 prs = Presentation()
 prs.slide_width = Inches(13.333)  # 16:9 aspect ratio
@@ -20,6 +23,8 @@ html_file = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html
 with open(html_file, 'r', encoding='utf-8') as f:
     content = f.read()
 
+IMAGES_DIR = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images'
+
 # Parse HTML
 tree = html.fromstring(content)
 
@@ -58,13 +63,13 @@ def add_content_slide(title, body_text=""):
 # Helper function to add image to slide
 def add_image_to_slide(slide, img_path, left, top, width=None, height=None):
     try:
-        if os.path.exists(img_path):
+        if img_path:
             if width and height:
-                slide.shapes.add_picture(img_path, left, top, width, height)
+                add_picture(slide.shapes, img_path, left, top, width, height)
             elif width:
-                slide.shapes.add_picture(img_path, left, top, width=width)
+                add_picture(slide.shapes, img_path, left, top, width=width)
             else:
-                slide.shapes.add_picture(img_path, left, top)
+                add_picture(slide.shapes, img_path, left, top)
             return True
     except Exception as e:
         print(f"Error adding image {img_path}: {e}")
@@ -121,7 +126,7 @@ for idx, slide_elem in enumerate(slides_elements):
             for img_elem in img_elements:
                 img_src = img_elem.get('src')
                 if img_src:
-                    img_path = os.path.join('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle', img_src)
+                    img_path = resolve_asset(IMAGES_DIR, img_src, f"slide {idx + 1}")
                     alt_text = clean_text(img_elem.get('alt', ''))
 
                     # Add image centered
@@ -162,5 +167,6 @@ for idx, slide_elem in enumerate(slides_elements):
 # Save presentation
 output_file = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.pptx'
 prs.save(output_file)
+report_missing_assets()
 print(f"\nPresentation saved to: {output_file}")
 print(f"Total slides created: {len(prs.slides)}")
@@ -9,15 +9,43 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
+from lxml import etree
 from lxml import html as lxml_html
 from pptx.enum.shapes import MSO_SHAPE
 
-# Read and parse HTML
-html_file = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html'
-with open(html_file, 'r', encoding='utf-8') as f:
-    content = f.read()
+from asset_index import report_missing_assets, resolve_asset
+from image_pipeline import add_picture
+from parse_cache import cached_parse
+
+IMAGES_DIR = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images'
+
+# Bump when extract_slide() output changes so cached parses are invalidated
+PARSER_VERSION = 2
+
+def has_class(name):
+    """XPath predicate: @class contains the whole token name"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
 
-tree = lxml_html.fromstring(content)
+def has_class_prefix(prefix):
+    """XPath predicate: @class has a token starting with prefix"""
+    return f'contains(concat(" ", normalize-space(@class)), " {prefix}")'
+
+# XPath expressions compiled once instead of on every slide
+XPATH_SLIDES = etree.XPath('//div[@class="slide"]')
+XPATH_H2 = etree.XPath('.//h2')
+XPATH_SUBTITLE = etree.XPath('.//p[@class="text-2xl"]')
+XPATH_AUTHOR = etree.XPath('.//div[contains(., "Presented By")]/following-sibling::p')
+XPATH_SUPERVISORS = etree.XPath('.//div[contains(., "Supervisors")]/following-sibling::p')
+XPATH_YEAR = etree.XPath('.//p[contains(., "Academic year")]')
+XPATH_STAT_VALUE = etree.XPath(f'.//div[{has_class("font-bold")}]')
+XPATH_STAT_LABEL = etree.XPath(f'.//p[{has_class("font-medium")}]')
+XPATH_GRID_BOXES = etree.XPath(f'.//div[{has_class("grid")}]//div[{has_class_prefix("bg-")}]')
+XPATH_BOX_HEADINGS = etree.XPath('.//h3 | .//h4')
+XPATH_BOX_PARAGRAPHS = etree.XPath('.//p')
+
+STAT_CLASSES = {'bg-blue-50', 'bg-green-50', 'bg-purple-50'}
+
+html_file = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html'
 
 # Initialize presentation with widescreen format
 prs = Presentation()
@@ -65,13 +93,13 @@ def create_title_slide(title, subtitle, author, supervisors, year):
     add_background(slide, is_gradient=True)
 
     # Add logos (if images exist)
-    logo_oracle = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images/logo_oracle.png'
-    logo_ehtp = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/images/logo_ehtp.jpg'
+    logo_oracle = resolve_asset(IMAGES_DIR, 'logo_oracle.png', 'title slide')
+    logo_ehtp = resolve_asset(IMAGES_DIR, 'logo_ehtp.jpg', 'title slide')
 
-    if os.path.exists(logo_oracle):
-        slide.shapes.add_picture(logo_oracle, Inches(0.5), Inches(0.5), height=Inches(0.8))
-    if os.path.exists(logo_ehtp):
-        slide.shapes.add_picture(logo_ehtp, Inches(12), Inches(0.5), height=Inches(1))
+    if logo_oracle:
+        add_picture(slide.shapes, logo_oracle, Inches(0.5), Inches(0.5), height=Inches(0.8))
+    if logo_ehtp:
+        add_picture(slide.shapes, logo_ehtp, Inches(12), Inches(0.5), height=Inches(1))
 
     # Main title
     title_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(11.333), Inches(2))
@@ -229,124 +257,190 @@ def add_stat_boxes(slide, stats, top_position):
         p2.font.size = Pt(14)
         p2.font.color.rgb = GRAY_MED
 
-# Extract slides from HTML
-slides_elements = tree.xpath('//div[@class="slide"]')
-print(f"Found {len(slides_elements)} slides in HTML")
+def extract_slide(idx, slide_elem):
+    """Extract the data of one slide element into a plain dict"""
+    # Check if it's a divider slide
+    is_divider = slide_elem.get('data-divider') == 'true'
+
+    # One walk over the slide collects what the title, image, stat-box and
+    # bullet passes need, instead of one XPath query per pass
+    h1_elem = None
+    h2_elem = None
+    img_elements = []
+    stat_divs = []
+    li_elements = []
+
+    for elem in slide_elem.iterdescendants():
+        tag = elem.tag
+        if tag == 'li':
+            li_elements.append(elem)
+        elif tag == 'div':
+            if not STAT_CLASSES.isdisjoint((elem.get('class') or '').split()):
+                stat_divs.append(elem)
+        elif tag == 'img':
+            if 'images/' in (elem.get('src') or ''):
+                img_elements.append(elem)
+        elif tag == 'h2':
+            if h2_elem is None:
+                h2_elem = elem
+        elif tag == 'h1':
+            if h1_elem is None:
+                h1_elem = elem
+
+    if idx == 0:
+        # Title slide (text scans only run on this one slide)
+        title_elem = h1_elem
+        subtitle_elem = XPATH_SUBTITLE(slide_elem)
+        author_elem = XPATH_AUTHOR(slide_elem)
+        supervisor_elem = XPATH_SUPERVISORS(slide_elem)
+        year_elem = XPATH_YEAR(slide_elem)
+
+        return {
+            'kind': 'title',
+            'title': clean_text(title_elem.text_content()) if title_elem is not None else "Presentation",
+            'subtitle': clean_text(subtitle_elem[0].text_content()) if subtitle_elem else "",
+            'author': clean_text(author_elem[0].text_content()) if author_elem else "",
+            'supervisors': "\n".join([clean_text(p.text_content()) for p in supervisor_elem[:2]]),
+            'year': clean_text(year_elem[0].text_content()) if year_elem else "",
+        }
+
+    if is_divider:
+        # Section divider
+        return {
+            'kind': 'divider',
+            'title': clean_text(h2_elem.text_content()) if h2_elem is not None else f"Section {idx}",
+        }
+
+    # Regular content slide
+    slide_data = {
+        'kind': 'content',
+        'title': clean_text(h2_elem.text_content()) if h2_elem is not None else f"Slide {idx + 1}",
+        'images': [],
+        'stats': [],
+        'has_stat_divs': False,
+        'has_list_items': False,
+        'bullets': [],
+        'grid_items': [],
+    }
+
+    # Extract images
+    for img_elem in img_elements:
+        img_src = img_elem.get('src')
+        if img_src and 'logo' not in img_src.lower():
+            slide_data['images'].append(img_src)
+
+    # Extract stat boxes (colored boxes with numbers)
+    slide_data['has_stat_divs'] = bool(stat_divs)
+    if len(stat_divs) >= 3:
+        for stat_div in stat_divs[:5]:
+            value_elem = XPATH_STAT_VALUE(stat_div)
+            label_elem = XPATH_STAT_LABEL(stat_div)
+            if value_elem and label_elem:
+                slide_data['stats'].append({
+                    'value': clean_text(value_elem[0].text_content()),
+                    'label': clean_text(label_elem[0].text_content())
+                })
+
+    # Extract bullet points
+    slide_data['has_list_items'] = bool(li_elements)
+    for li in li_elements[:10]:
+        text = clean_text(li.text_content())
+        if text and len(text) > 3:
+            slide_data['bullets'].append(text)
+
+    # Extract grid content boxes
+    if not li_elements and not stat_divs:
+        content_boxes = XPATH_GRID_BOXES(slide_elem)
+        for box in content_boxes[:6]:
+            h3 = XPATH_BOX_HEADINGS(box)
+            p = XPATH_BOX_PARAGRAPHS(box)
+            if h3:
+                title_text = clean_text(h3[0].text_content())
+                desc_text = " ".join([clean_text(par.text_content()) for par in p[:2]])
+                if title_text:
+                    slide_data['grid_items'].append(f"{title_text}: {desc_text}" if desc_text else title_text)
+
+    return slide_data
+
+def extract_slides(html_content):
+    """Parse the HTML and extract every slide into plain dicts (cacheable)"""
+    tree = lxml_html.fromstring(html_content)
+    slides_data = []
+
+    for idx, slide_elem in enumerate(XPATH_SLIDES(tree)):
+        try:
+            slides_data.append(extract_slide(idx, slide_elem))
+        except Exception as e:
+            # Keep the slide with just its title, as the renderer did before
+            h2_elements = XPATH_H2(slide_elem)
+            slides_data.append({
+                'kind': 'error',
+                'error': str(e),
+                'title': clean_text(h2_elements[0].text_content()) if h2_elements else f"Slide {idx + 1}",
+            })
+
+    return slides_data
+
+# Extract slides from HTML (served from the parse cache when unchanged)
+slides_data = cached_parse(html_file, 'html_to_pptx_v2', PARSER_VERSION, extract_slides)
+print(f"Found {len(slides_data)} slides in HTML")
 
 # Process each slide
-for idx, slide_elem in enumerate(slides_elements):
+for idx, slide_data in enumerate(slides_data):
     print(f"Processing slide {idx + 1}...")
 
+    if slide_data['kind'] == 'error':
+        print(f"  Error processing slide {idx + 1}: {slide_data['error']}")
+        # Create a simple slide with just the title
+        create_content_slide(slide_data['title'], {})
+        continue
+
     try:
-        # Check if it's a divider slide
-        is_divider = slide_elem.get('data-divider') == 'true'
-
-        # Get title
-        h2_elements = slide_elem.xpath('.//h2')
-        h1_elements = slide_elem.xpath('.//h1')
-
-        if idx == 0:
-            # Title slide
-            title_elem = h1_elements[0] if h1_elements else None
-            subtitle_elem = slide_elem.xpath('.//p[@class="text-2xl"]')
-            author_elem = slide_elem.xpath('.//div[contains(., "Presented By")]/following-sibling::p')
-            supervisor_elem = slide_elem.xpath('.//div[contains(., "Supervisors")]/following-sibling::p')
-            year_elem = slide_elem.xpath('.//p[contains(., "Academic year")]')
-
-            title = clean_text(title_elem.text_content()) if title_elem is not None else "Presentation"
-            subtitle = clean_text(subtitle_elem[0].text_content()) if subtitle_elem else ""
-            author = clean_text(author_elem[0].text_content()) if author_elem else ""
-            supervisors = "\n".join([clean_text(p.text_content()) for p in supervisor_elem[:2]])
-            year = clean_text(year_elem[0].text_content()) if year_elem else ""
-
-            create_title_slide(title, subtitle, author, supervisors, year)
-
-        elif is_divider:
-            # Section divider
-            title = clean_text(h2_elements[0].text_content()) if h2_elements else f"Section {idx}"
-            create_section_divider(title)
+        if slide_data['kind'] == 'title':
+            create_title_slide(slide_data['title'], slide_data['subtitle'], slide_data['author'],
+                               slide_data['supervisors'], slide_data['year'])
 
-        else:
-            # Regular content slide
-            title = clean_text(h2_elements[0].text_content()) if h2_elements else f"Slide {idx + 1}"
-            slide = create_content_slide(title, {})
+        elif slide_data['kind'] == 'divider':
+            create_section_divider(slide_data['title'])
 
-            # Extract images
-            img_elements = slide_elem.xpath('.//img[contains(@src, "images/")]')
+        else:
+            slide = create_content_slide(slide_data['title'], {})
             has_large_image = False
 
-            for img_elem in img_elements:
-                img_src = img_elem.get('src')
-                if img_src and 'logo' not in img_src.lower():
-                    img_path = os.path.join('/Users/anasabounouar/Downloads/dbaichi/pfe-oracle', img_src)
-                    if os.path.exists(img_path):
-                        try:
-                            # Check if image should be constrained
-                            if 'factory_pattern' in img_src or 'dependency_resolution' in img_src:
-                                slide.shapes.add_picture(img_path, Inches(3.5), Inches(1.5), width=Inches(6.5))
-                            else:
-                                slide.shapes.add_picture(img_path, Inches(1), Inches(1.5), width=Inches(11.333))
-                            has_large_image = True
-                        except Exception as e:
-                            print(f"  Warning: Could not add image {img_src}: {e}")
-
-            # Extract stat boxes (colored boxes with numbers)
-            stat_divs = slide_elem.xpath('.//div[contains(@class, "bg-blue-50") or contains(@class, "bg-green-50") or contains(@class, "bg-purple-50")]')
-            if len(stat_divs) >= 3 and not has_large_image:
-                stats = []
-                for stat_div in stat_divs[:5]:
-                    value_elem = stat_div.xpath('.//div[contains(@class, "font-bold")]')
-                    label_elem = stat_div.xpath('.//p[contains(@class, "font-medium")]')
-                    if value_elem and label_elem:
-                        stats.append({
-                            'value': clean_text(value_elem[0].text_content()),
-                            'label': clean_text(label_elem[0].text_content())
-                        })
-                if stats:
-                    add_stat_boxes(slide, stats, Inches(2))
-
-            # Extract bullet points
-            li_elements = slide_elem.xpath('.//li')
-            if li_elements and not has_large_image:
-                bullets = []
-                for li in li_elements[:10]:
-                    text = clean_text(li.text_content())
-                    if text and len(text) > 3:
-                        bullets.append(text)
-
-                if bullets:
-                    top_pos = Inches(5.5) if stat_divs else Inches(1.8)
-                    add_bullet_points(slide, bullets, Inches(0.8), top_pos, Inches(11.5), Inches(4.5), 14)
-
-            # Extract grid content boxes
-            if not has_large_image and not li_elements and not stat_divs:
-                content_boxes = slide_elem.xpath('.//div[contains(@class, "grid")]//div[contains(@class, "bg-")]')
-                if content_boxes:
-                    content_items = []
-                    for box in content_boxes[:6]:
-                        h3 = box.xpath('.//h3 | .//h4')
-                        p = box.xpath('.//p')
-                        if h3:
-                            title_text = clean_text(h3[0].text_content())
-                            desc_text = " ".join([clean_text(par.text_content()) for par in p[:2]])
-                            if title_text:
-                                content_items.append(f"{title_text}: {desc_text}" if desc_text else title_text)
-
-                    if content_items:
-                        add_bullet_points(slide, content_items, Inches(0.8), Inches(1.8), Inches(11.5), Inches(5), 14)
+            for img_src in slide_data['images']:
+                img_path = resolve_asset(IMAGES_DIR, img_src, f"slide {idx + 1}")
+                if img_path:
+                    try:
+                        # Check if image should be constrained
+                        if 'factory_pattern' in img_src or 'dependency_resolution' in img_src:
+                            add_picture(slide.shapes, img_path, Inches(3.5), Inches(1.5), width=Inches(6.5))
+                        else:
+                            add_picture(slide.shapes, img_path, Inches(1), Inches(1.5), width=Inches(11.333))
+                        has_large_image = True
+                    except Exception as e:
+                        print(f"  Warning: Could not add image {img_src}: {e}")
+
+            if slide_data['stats'] and not has_large_image:
+                add_stat_boxes(slide, slide_data['stats'], Inches(2))
+
+            if slide_data['has_list_items'] and not has_large_image and slide_data['bullets']:
+                top_pos = Inches(5.5) if slide_data['has_stat_divs'] else Inches(1.8)
+                add_bullet_points(slide, slide_data['bullets'], Inches(0.8), top_pos, Inches(11.5), Inches(4.5), 14)
+
+            if not has_large_image and slide_data['grid_items']:
+                add_bullet_points(slide, slide_data['grid_items'], Inches(0.8), Inches(1.8), Inches(11.5), Inches(5), 14)
 
     except Exception as e:
         print(f"  Error processing slide {idx + 1}: {e}")
         # Create a simple slide with just the title
         try:
-            h2_elements = slide_elem.xpath('.//h2')
-            title = clean_text(h2_elements[0].text_content()) if h2_elements else f"Slide {idx + 1}"
-            create_content_slide(title, {})
+            create_content_slide(slide_data['title'], {})
         except:
             pass
 
 # Save presentation
 output_file = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation_quality.pptx'
 prs.save(output_file)
+report_missing_assets()
 print(f"\n✓ High-quality presentation saved to: {output_file}")
 print(f"✓ Total slides created: {len(prs.slides)}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache of processed images
+Entries are keyed by SHA-256 of the source image bytes plus the target pixel
+size, output format and quality, and hold ready-to-embed bytes (plus a one-line
+note on how they were produced), so shared
+assets (logos, diagrams reused across decks) are decoded and resampled once.
+Writes are atomic renames and eviction is size-capped LRU, shared with the
+parse cache, so parallel workers can use the same directory
+"""
+
+import hashlib
+import os
+
+from parse_cache import ParseCache
+
+IMAGE_CACHE_DIR = os.environ.get('PFE_IMAGE_CACHE_DIR',
+                                 os.path.join(os.path.expanduser('~'), '.cache', 'pfe-oracle', 'images'))
+MAX_IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Source path -> ((size, mtime_ns), sha256) for this process, so unchanged
+# files are only hashed once per run
+_source_hashes = {}
+
+
+def source_hash(image_path):
+    """SHA-256 of a file's bytes, memoized per (path, size, mtime)"""
+    stat = os.stat(image_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _source_hashes.get(image_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    _source_hashes[image_path] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+
+class ImageCache(ParseCache):
+    """Directory of processed image bytes, one file per (source, size, format, quality)
+
+    Entries are a note line followed by the bytes; empty bytes record that the
+    source should be embedded unchanged.
+    """
+
+    magic = b'PFEIC2\n'
+    entry_suffix = '.pfeimg'
+
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, max_bytes=MAX_IMAGE_CACHE_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(source_digest, pixel_size, image_format, quality, version):
+        """SHA-256 over the source hash and every processing parameter"""
+        width, height = pixel_size
+        params = f"{version}:{width}x{height}:{image_format}:{quality}\0"
+        return hashlib.sha256(params.encode('utf-8') + source_digest.encode('ascii')).hexdigest()
+
+    def get(self, key):
+        """Cached (bytes, note) for key (b'' = keep the original), or None on a miss"""
+        payload = self._read(key)
+        if payload is None:
+            return None
+        note, _, data = payload.partition(b'\n')
+        return data, note.decode('utf-8')
+
+    def put(self, key, data, note=''):
+        self._write(key, note.replace('\n', ' ').encode('utf-8') + b'\n' + (data or b''))
+
+    def load_image(self, image_path, pixel_size, image_format, quality, version, process_func):
+        """Return process_func() for these parameters, from the cache when possible
+
+        process_func returns (processed bytes or None to keep the original, note);
+        the same pair is returned, with None for the original.
+        """
+        key = self.make_key(source_hash(image_path), pixel_size, image_format, quality, version)
+        cached = self.get(key)
+        if cached is None:
+            cached = process_func()
+            self.put(key, *cached)
+        data, note = cached
+        return data or None, note
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Image geometry without decoding
+probe() reads only the PNG / JPEG headers (IHDR + pHYs, SOFn + JFIF/Exif
+density) to get pixel size and DPI, with the same DPI rules python-pptx uses,
+and caches the result per path and mtime. fit() turns that into contain or
+cover placements inside a target box, as ready EMU rectangles
+"""
+
+import io
+import os
+import struct
+from dataclasses import dataclass
+
+EMU_PER_INCH = 914400
+DEFAULT_DPI = 72
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# SOFn markers carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) don't
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+@dataclass(slots=True, frozen=True)
+class ImageInfo:
+    """Pixel size, resolution and format ('PNG', 'JPEG', ...) of an image file"""
+    width: int
+    height: int
+    horz_dpi: int = DEFAULT_DPI
+    vert_dpi: int = DEFAULT_DPI
+    format: str = ''
+
+
+@dataclass(slots=True)
+class Placement:
+    """Where a picture goes, in EMU, plus the crop fractions cover fits need"""
+    left: int
+    top: int
+    width: int
+    height: int
+    crop_left: float = 0.0
+    crop_top: float = 0.0
+    crop_right: float = 0.0
+    crop_bottom: float = 0.0
+
+    @property
+    def image_size(self):
+        """EMU size of the whole (uncropped) image at this placement's scale"""
+        return (int(round(self.width / (1.0 - self.crop_left - self.crop_right))),
+                int(round(self.height / (1.0 - self.crop_top - self.crop_bottom))))
+
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+
+def _dpi(value, per_cm):
+    """Integer DPI from a density value; 72 when missing or outside 1..2048 (python-pptx's rule)"""
+    if not value:
+        return DEFAULT_DPI
+    dpi = int(round(value * 2.54 if per_cm else value))
+    return dpi if 1 <= dpi <= 2048 else DEFAULT_DPI
+
+
+def _probe_png(f):
+    f.seek(16)
+    width, height = struct.unpack('>II', f.read(8))
+    horz_dpi = vert_dpi = DEFAULT_DPI
+
+    # pHYs, when present, comes before the first IDAT
+    f.seek(8)
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, chunk_type = struct.unpack('>I4s', header)
+        if chunk_type == b'pHYs':
+            horz_ppu, vert_ppu, unit = struct.unpack('>IIB', f.read(9))
+            if unit == 1:  # pixels per meter
+                horz_dpi = _dpi(horz_ppu * 0.0254, False)
+                vert_dpi = _dpi(vert_ppu * 0.0254, False)
+            break
+        if chunk_type in (b'IDAT', b'IEND'):
+            break
+        f.seek(length + 4, os.SEEK_CUR)  # data + CRC
+
+    return ImageInfo(width, height, horz_dpi, vert_dpi, 'PNG')
+
+
+def _exif_dpi(data):
+    """(horz_dpi, vert_dpi) from the TIFF IFD0 inside an Exif APP1 segment, or None
+
+    Like Pillow, XResolution is used for both axes, ResolutionUnit 3 means
+    per centimeter and a missing ResolutionUnit means no usable density.
+    """
+    if not data.startswith(b'Exif\0\0') or len(data) < 14:
+        return None
+    tiff = data[6:]
+    order = '<' if tiff[:2] == b'II' else '>'
+    resolution = unit = None
+    try:
+        (ifd_offset,) = struct.unpack(order + 'I', tiff[4:8])
+        (count,) = struct.unpack(order + 'H', tiff[ifd_offset:ifd_offset + 2])
+        for idx in range(count):
+            entry = tiff[ifd_offset + 2 + idx * 12:ifd_offset + 14 + idx * 12]
+            tag, field_type, _, value = struct.unpack(order + 'HHI4s', entry)
+            if tag == 0x011A and field_type == 5:  # XResolution, RATIONAL
+                (offset,) = struct.unpack(order + 'I', value)
+                numerator, denominator = struct.unpack(order + 'II', tiff[offset:offset + 8])
+                resolution = numerator / denominator if denominator else None
+            elif tag == 0x0128 and field_type == 3:  # ResolutionUnit, SHORT
+                unit = struct.unpack(order + 'H', value[:2])[0]
+    except struct.error:
+        pass
+
+    if unit is None:
+        return DEFAULT_DPI, DEFAULT_DPI
+    dpi = _dpi(resolution, unit == 3)
+    return dpi, dpi
+
+
+def _probe_jpeg(f):
+    """ImageInfo from the JPEG frame header, or None when the file is cut short"""
+    f.seek(2)
+    jfif_dpi = exif_dpi = None
+    try:
+        while True:
+            byte = f.read(1)
+            while byte and byte != b'\xff':
+                byte = f.read(1)
+            while byte == b'\xff':  # fill bytes
+                byte = f.read(1)
+            if not byte:
+                return None  # ended before the frame header
+
+            marker = byte[0]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                continue  # standalone markers
+            (length,) = struct.unpack('>H', f.read(2))
+
+            if marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack('>xHH', f.read(5))
+                horz_dpi, vert_dpi = jfif_dpi or exif_dpi or (DEFAULT_DPI, DEFAULT_DPI)
+                return ImageInfo(width, height, horz_dpi, vert_dpi, 'JPEG')
+
+            segment = f.read(length - 2)
+            if marker == 0xE0 and segment.startswith(b'JFIF\0') and len(segment) >= 12:
+                unit, horz_density, vert_density = struct.unpack('>BHH', segment[7:12])
+                if unit in (1, 2):  # 0 = aspect ratio only, so Exif may still say
+                    jfif_dpi = (_dpi(horz_density, unit == 2), _dpi(vert_density, unit == 2))
+            elif marker == 0xE1 and exif_dpi is None:
+                exif_dpi = _exif_dpi(segment)
+    except struct.error:
+        return None
+
+
+def _probe_other(image_path):
+    """Any other format: Pillow's lazy open reads the header only"""
+    from PIL import Image as PILImage
+
+    with PILImage.open(image_path) as img:
+        horz_dpi, vert_dpi = img.info.get('dpi', (DEFAULT_DPI, DEFAULT_DPI))
+        return ImageInfo(img.width, img.height, _dpi(horz_dpi, False), _dpi(vert_dpi, False), img.format)
+
+
+# path -> ((size, mtime_ns), ImageInfo)
+_probe_cache = {}
+
+
+def probe(image_path):
+    """ImageInfo of image_path from its header, cached per path and mtime
+
+    The format is sniffed from the signature, not the extension (a PNG saved
+    as .jpg is still a PNG).
+    """
+    image_path = str(image_path)
+    stat = os.stat(image_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _probe_cache.get(image_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(image_path, 'rb') as f:
+        magic = f.read(8)
+        if magic == PNG_SIGNATURE:
+            info = _probe_png(f)
+        elif magic[:2] == b'\xff\xd8':
+            info = _probe_jpeg(f)
+        else:
+            info = None
+    if info is None:
+        info = _probe_other(image_path)
+
+    _probe_cache[image_path] = (signature, info)
+    return info
+
+
+def data_format(data):
+    """Format name ('PNG', 'JPEG', ...) of in-memory image bytes, from the signature"""
+    if data.startswith(PNG_SIGNATURE):
+        return 'PNG'
+    if data[:2] == b'\xff\xd8':
+        return 'JPEG'
+    from PIL import Image as PILImage
+
+    with PILImage.open(io.BytesIO(data)) as img:
+        return img.format
+
+
+# ---------------------------------------------------------------------------
+# Sizing and fitting
+# ---------------------------------------------------------------------------
+
+def native_size(info):
+    """EMU size of the image at its own DPI (what add_picture uses with no size)"""
+    return (int(EMU_PER_INCH * info.width / info.horz_dpi),
+            int(EMU_PER_INCH * info.height / info.vert_dpi))
+
+
+def scaled_size(info, width=None, height=None):
+    """EMU size python-pptx's add_picture gives for these width/height arguments"""
+    native_cx, native_cy = native_size(info)
+    if width and height:
+        return width, height
+    if width:
+        return width, int(round(native_cy * float(width) / float(native_cx)))
+    if height:
+        return int(round(native_cx * float(height) / float(native_cy))), height
+    return native_cx, native_cy
+
+
+def fit(info, left, top, width, height, mode='contain'):
+    """Placement of an image inside the box (left, top, width, height), all EMU
+
+    contain: the whole image, as large as fits, centered in the box.
+    cover:   the box is filled; the overflow is cropped evenly on both sides.
+    The image's aspect ratio is preserved either way.
+    """
+    # The aspect ratio on the slide follows the native (DPI-aware) size
+    native_cx, native_cy = native_size(info)
+    scale_x = width / native_cx
+    scale_y = height / native_cy
+
+    if mode == 'contain':
+        scale = min(scale_x, scale_y)
+        fitted_cx = int(round(native_cx * scale))
+        fitted_cy = int(round(native_cy * scale))
+        return Placement(left + (width - fitted_cx) // 2, top + (height - fitted_cy) // 2,
+                         fitted_cx, fitted_cy)
+
+    if mode == 'cover':
+        scale = max(scale_x, scale_y)
+        crop_x = max(0.0, (1.0 - width / (native_cx * scale)) / 2)
+        crop_y = max(0.0, (1.0 - height / (native_cy * scale)) / 2)
+        return Placement(left, top, width, height, crop_x, crop_y, crop_x, crop_y)
+
+    raise ValueError(f"Unknown fit mode {mode!r} (expected 'contain' or 'cover')")
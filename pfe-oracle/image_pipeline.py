@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Placement-aware image downscaling
+Before a picture is embedded, its on-slide box (EMU) is turned into the pixel
+size the output profile needs (box inches x target DPI) and larger images are
+resampled with Pillow, so a 9-inch diagram no longer carries its full-size
+screenshot. Select the profile with PFE_IMAGE_PROFILE:
+
+    web        96 DPI (on-screen reading, smallest decks)
+    screen    150 DPI (default; projectors, email, thin clients)
+    print     300 DPI
+    original  embed files untouched
+
+PNGs are also classified as photo-like or diagram-like (color count and how
+much of the image is flat fill): photo-like ones are transcoded to the lowest
+JPEG quality whose SSIM against the lossless pixels meets the profile's
+threshold, diagrams stay lossless. Every decision and its byte savings is
+logged for print_image_report().
+
+Processed bytes are kept in the on-disk image cache (see image_cache.py).
+An ImagePrefetcher can downscale a whole deck's images in worker processes
+while slides are being assembled; downscale() then waits on those results
+instead of resampling inline.
+
+While a picture log is set (see deck_variants.py), pictures are embedded as
+their original files and logged, to be re-embedded once per output profile
+"""
+
+import array
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image as PILImage
+from PIL import ImageMath
+
+from image_cache import ImageCache
+from image_geometry import fit, probe, scaled_size
+
+EMU_PER_INCH = 914400
+
+# jpeg_quality caps the JPEG search; min_ssim is the floor a transcoded PNG must meet
+PROFILES = {
+    'web': {'dpi': 96, 'jpeg_quality': 80, 'min_ssim': 0.99},
+    'screen': {'dpi': 150, 'jpeg_quality': 85, 'min_ssim': 0.99},
+    'print': {'dpi': 300, 'jpeg_quality': 92, 'min_ssim': 0.995},
+    'original': None,
+}
+DEFAULT_PROFILE = 'screen'
+
+# Photo-like: at least this many colors, and the FLAT_COLORS most frequent
+# colors cover less than PHOTO_MAX_FLAT_SHARE of the pixels. Diagrams and UI
+# screenshots are mostly flat fills, even with anti-aliased edges.
+CLASSIFY_SIZE = 512
+FLAT_COLORS = 16
+PHOTO_MIN_COLORS = 512
+PHOTO_MAX_FLAT_SHARE = 0.90
+JPEG_MIN_QUALITY = 50
+# SSIM is averaged over windows with some detail (luminance variance above
+# this); flat background windows score ~1 and would hide ringing around text
+SSIM_BLOCK = 8
+SSIM_MIN_VARIANCE = 25
+
+# Bump whenever resampling/encoding changes, so cached images are reprocessed
+PIPELINE_VERSION = 2
+
+_image_cache = None
+
+# (image path, pixel size, profile) -> Future of (bytes, note), filled in by
+# ImagePrefetcher.submit()
+_pending = {}
+
+# (image path, pixel size, profile) -> (note, source bytes, embedded bytes) for this run
+_decisions = {}
+
+# While set, _embed() appends (picture, image path, EMU image size) here
+_picture_log = None
+
+
+def image_cache():
+    """Process-wide ImageCache, created on first use"""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
+
+
+def active_profile():
+    """Profile named by PFE_IMAGE_PROFILE (read per call so worker processes follow it)"""
+    name = os.environ.get('PFE_IMAGE_PROFILE', DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown image profile {name!r} (expected one of {', '.join(PROFILES)})")
+    return name
+
+
+def display_size(image_path, width=None, height=None):
+    """EMU size python-pptx gives a picture for these width/height arguments"""
+    return scaled_size(probe(image_path), width, height)
+
+
+def target_pixels(cx, cy, dpi):
+    """Pixel size needed to fill a cx x cy EMU box at dpi"""
+    return (max(1, math.ceil(cx / EMU_PER_INCH * dpi)),
+            max(1, math.ceil(cy / EMU_PER_INCH * dpi)))
+
+
+def classify(img):
+    """('photo' | 'diagram', reason) for a decoded image"""
+    if img.mode in ('RGBA', 'LA', 'PA') and img.getchannel('A').getextrema()[0] < 255:
+        return 'diagram', 'transparent'
+
+    # NEAREST keeps the exact colors (no new in-between shades from filtering)
+    thumb = img.convert('RGB')
+    thumb.thumbnail((CLASSIFY_SIZE, CLASSIFY_SIZE), PILImage.NEAREST)
+    pixels = thumb.width * thumb.height
+    colors = sorted(thumb.getcolors(pixels), reverse=True)
+    flat_share = sum(count for count, _ in colors[:FLAT_COLORS]) / pixels
+
+    reason = f"{len(colors)} colors, {flat_share:.0%} flat"
+    if len(colors) >= PHOTO_MIN_COLORS and flat_share < PHOTO_MAX_FLAT_SHARE:
+        return 'photo', reason
+    return 'diagram', reason
+
+
+def ssim(reference, candidate):
+    """Mean SSIM of the luminance over the detailed SSIM_BLOCK x SSIM_BLOCK windows"""
+    x = reference.convert('L').convert('F')
+    y = candidate.convert('L').convert('F')
+    blocks = (max(1, x.width // SSIM_BLOCK), max(1, x.height // SSIM_BLOCK))
+    box = (0, 0, min(x.width, blocks[0] * SSIM_BLOCK), min(x.height, blocks[1] * SSIM_BLOCK))
+    x, y = x.crop(box), y.crop(box)
+
+    def mean(image):
+        # BOX-resizing to one pixel per window gives the window means
+        return image.resize(blocks, PILImage.BOX)
+
+    stats = {
+        'mx': mean(x), 'my': mean(y),
+        'mxx': mean(ImageMath.lambda_eval(lambda a: a['x'] * a['x'], x=x)),
+        'myy': mean(ImageMath.lambda_eval(lambda a: a['y'] * a['y'], y=y)),
+        'mxy': mean(ImageMath.lambda_eval(lambda a: a['x'] * a['y'], x=x, y=y)),
+    }
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    ssim_map = ImageMath.lambda_eval(
+        lambda a: ((2 * a['mx'] * a['my'] + c1) * (2 * (a['mxy'] - a['mx'] * a['my']) + c2))
+        / ((a['mx'] * a['mx'] + a['my'] * a['my'] + c1)
+           * (a['mxx'] - a['mx'] * a['mx'] + a['myy'] - a['my'] * a['my'] + c2)),
+        **stats)
+    variance_map = ImageMath.lambda_eval(lambda a: a['mxx'] - a['mx'] * a['mx'], **stats)
+
+    values = array.array('f', ssim_map.tobytes())
+    variances = array.array('f', variance_map.tobytes())
+    detailed = [value for value, variance in zip(values, variances) if variance > SSIM_MIN_VARIANCE]
+    if not detailed:
+        detailed = values
+    return sum(detailed) / len(detailed)
+
+
+def _encode_jpeg(img, settings):
+    """(bytes, quality, ssim) at the lowest quality meeting min_ssim, or None if none does"""
+    rgb = img.convert('RGB')
+    best = None
+    low, high = JPEG_MIN_QUALITY, settings['jpeg_quality']
+    while low <= high:
+        quality = (low + high) // 2
+        buffer = io.BytesIO()
+        rgb.save(buffer, 'JPEG', quality=quality, optimize=True)
+        with PILImage.open(io.BytesIO(buffer.getvalue())) as decoded:
+            score = ssim(rgb, decoded)
+        if score >= settings['min_ssim']:
+            best = (buffer.getvalue(), quality, score)
+            high = quality - 1
+        else:
+            low = quality + 1
+    return best
+
+
+def _process(image_path, target_size, settings):
+    """(bytes, note) for image_path at target_size pixels; bytes None = keep the original
+
+    Images are resized to fit target_size when larger. Photo-like PNGs are
+    transcoded to JPEG when that passes the SSIM floor and saves bytes;
+    everything else keeps its format. The original is kept whenever the
+    result would not be smaller.
+    """
+    target_width, target_height = target_size
+    original_size = os.path.getsize(image_path)
+    with PILImage.open(image_path) as img:
+        width, height = img.size
+        image_format = img.format
+        # Fit inside the target box, keeping the source aspect ratio
+        scale = max(target_width / width, target_height / height)
+        resized = scale < 1
+
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode.endswith('A') else 'RGB')
+        # Classify the source pixels: resampling blends new in-between colors
+        kind, reason = classify(img) if image_format != 'JPEG' else (None, None)
+        if resized:
+            new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            img = img.resize(new_size, PILImage.LANCZOS)
+        size_note = f"{width}x{height} → {img.width}x{img.height}" if resized else f"{width}x{height}"
+
+        if image_format == 'JPEG':
+            if not resized:
+                return None, f"JPEG {size_note}"
+            buffer = io.BytesIO()
+            img.convert('RGB').save(buffer, 'JPEG', quality=settings['jpeg_quality'], optimize=True)
+            data, note = buffer.getvalue(), f"JPEG {size_note}, q{settings['jpeg_quality']}"
+        else:
+            data = None
+            if resized:
+                buffer = io.BytesIO()
+                img.save(buffer, 'PNG', optimize=True)
+                data = buffer.getvalue()
+            note = f"{kind} ({reason}) {size_note}, PNG"
+
+            if kind == 'photo':
+                jpeg = _encode_jpeg(img, settings)
+                lossless_size = len(data) if data is not None else original_size
+                if jpeg is None:
+                    note += f", no JPEG quality reaches SSIM {settings['min_ssim']}"
+                elif len(jpeg[0]) >= lossless_size:
+                    note += ", JPEG not smaller"
+                else:
+                    data = jpeg[0]
+                    note = f"{kind} ({reason}) {size_note}, JPEG q{jpeg[1]} SSIM {jpeg[2]:.3f}"
+
+    if data is None or len(data) >= original_size:
+        return None, note + " (original kept)"
+    return data, note
+
+
+def downscale(image_path, cx, cy, profile):
+    """Embeddable bytes of image_path for a cx x cy EMU box, or None to keep the original"""
+    settings = PROFILES[profile]
+    if settings is None:
+        return None
+
+    target_size = target_pixels(cx, cy, settings['dpi'])
+    future = _pending.get((image_path, target_size, profile))
+    if future is not None:
+        # Only blocks when the slide builder has caught up with the workers
+        data, note = future.result()
+    else:
+        data, note = _load(image_path, target_size, profile)
+
+    original_size = os.path.getsize(image_path)
+    _decisions[(image_path, target_size, profile)] = (note, original_size, len(data) if data else original_size)
+    return data
+
+
+def _load(image_path, target_size, profile):
+    """(bytes or None, note) for target_size pixels, through the image cache"""
+    settings = PROFILES[profile]
+    return image_cache().load_image(
+        image_path, target_size, 'auto', f"{settings['jpeg_quality']}/ssim{settings['min_ssim']}",
+        PIPELINE_VERSION, lambda: _process(image_path, target_size, settings))
+
+
+def print_image_report():
+    """Print what happened to every image embedded in this run and the bytes saved"""
+    for profile in sorted({profile for _, _, profile in _decisions}):
+        print(f"\n🖼️  Images ({profile} profile):")
+        total_before = total_after = 0
+        for (image_path, _, decided_for), (note, before, after) in sorted(_decisions.items()):
+            if decided_for != profile:
+                continue
+            total_before += before
+            total_after += after
+            print(f"   {os.path.basename(image_path)}: {note}")
+            print(f"      {before / 1024:.0f} KB → {after / 1024:.0f} KB ({_saving(before, after)})")
+        print(f"   Total: {total_before / (1024*1024):.2f} MB → {total_after / (1024*1024):.2f} MB "
+              f"({_saving(total_before, total_after)})")
+
+
+def image_decisions():
+    """This process's image decisions, for a parent process to merge_image_decisions()"""
+    return dict(_decisions)
+
+
+def merge_image_decisions(decisions):
+    """Add decisions made in a worker process to this run's image report"""
+    _decisions.update(decisions)
+
+
+def _saving(before, after):
+    return f"-{(before - after) / before:.0%}" if before else "-0%"
+
+
+class ImagePrefetcher:
+    """Downscales images in a process pool ahead of the slides that use them
+
+    Submit every (image, on-slide EMU size) a deck needs up front, in slide
+    order, then build the slides inside the with-block: add_picture() picks up
+    the finished bytes and only waits for images that are not done yet, so
+    decoding and resizing overlap with shape building. Images that were not
+    submitted are processed inline as usual. With several profiles, every
+    image is submitted once per profile.
+    """
+
+    def __init__(self, workers=None, profile=None, profiles=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.profiles = list(profiles or [profile or active_profile()])
+        self.executor = None
+        self.keys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, image_path, cx, cy):
+        """Start downscaling image_path for a cx x cy EMU rendition"""
+        image_path = str(image_path)
+        for profile in self.profiles:
+            settings = PROFILES[profile]
+            if settings is None:
+                continue
+
+            target_size = target_pixels(cx, cy, settings['dpi'])
+            key = (image_path, target_size, profile)
+            if key in _pending:
+                continue
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            _pending[key] = self.executor.submit(_load, image_path, target_size, profile)
+            self.keys.append(key)
+
+    def close(self):
+        """Forget this prefetcher's results and stop its workers"""
+        for key in self.keys:
+            _pending.pop(key, None)
+        self.keys = []
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+def add_picture(shapes, image_path, left, top, width=None, height=None, profile=None):
+    """Drop-in for shapes.add_picture() that embeds a copy sized for its placement
+
+    The picture gets exactly the size python-pptx would give the original
+    file; only the embedded pixels change.
+    """
+    image_path = str(image_path)
+    cx, cy = display_size(image_path, width, height)
+    return _embed(shapes, image_path, left, top, cx, cy, (cx, cy), profile)
+
+
+def add_fitted_picture(shapes, image_path, left, top, width, height, mode='contain', profile=None):
+    """Picture fitted into the box without distortion (see image_geometry.fit)
+
+    contain centers the whole image in the box; cover fills the box and crops
+    the overflow. Cover pictures are downscaled for their full, uncropped size
+    so the visible part keeps the profile's DPI.
+    """
+    image_path = str(image_path)
+    placement = fit(probe(image_path), left, top, width, height, mode)
+    picture = _embed(shapes, image_path, placement.left, placement.top,
+                     placement.width, placement.height, placement.image_size, profile)
+    if mode == 'cover':
+        picture.crop_left, picture.crop_right = placement.crop_left, placement.crop_right
+        picture.crop_top, picture.crop_bottom = placement.crop_top, placement.crop_bottom
+    return picture
+
+
+def log_pictures(log):
+    """Embed originals and append (picture, image path, EMU image size) to log; None stops"""
+    global _picture_log
+    _picture_log = log
+
+
+def _embed(shapes, image_path, left, top, cx, cy, image_size, profile):
+    """add_picture() of image_path, downscaled for an image_size EMU rendition"""
+    if _picture_log is not None:
+        picture = shapes.add_picture(image_path, left, top, cx, cy)
+        _picture_log.append((picture, image_path, image_size))
+        return picture
+    data = downscale(image_path, *image_size, profile or active_profile())
+    if data is None:
+        return shapes.add_picture(image_path, left, top, cx, cy)
+    return shapes.add_picture(io.BytesIO(data), left, top, cx, cy)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Incremental PDF export
+Every slide of the loaded deck gets a fingerprint: its DOM subtree, the
+size/mtime of the images it shows and a hash of everything it is styled by
+(all stylesheets as the browser parsed them, the <html>/<body> attributes,
+the viewport and the print options). Each slide is printed on its own into a
+single-slide PDF cached under that fingerprint, so the next export only
+prints slides whose fingerprint isn't cached and splices the cached PDFs
+into the final document with pypdf.
+
+Editing one slide therefore costs one deck load and one slide print; a
+stylesheet change re-prints everything. Slides are printed separately, so
+links from one slide to another don't survive, as with --split.
+
+    PFE_PDF_CACHE_DIR     single-slide PDFs (default: ~/.cache/pfe-oracle/pdf)
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+from urllib.parse import unquote, urlsplit
+
+from convert_to_pdf import (PDF_OPTIONS, SLIDE_SELECTOR, add_range_style, load_deck, merge_pdfs, render_pdf,
+                            show_slides)
+from parse_cache import ParseCache
+
+PDF_CACHE_DIR = os.environ.get('PFE_PDF_CACHE_DIR',
+                               os.path.join(os.path.expanduser('~'), '.cache', 'pfe-oracle', 'pdf'))
+MAX_PDF_CACHE_BYTES = 512 * 1024 * 1024
+
+# Bump when the way slides are printed changes
+RENDERER_VERSION = 1
+
+# A new page loads the whole deck again, so it only pays off for a few slides
+MIN_SLIDES_PER_PAGE = 4
+
+# What a slide's print depends on, read from the loaded page
+FINGERPRINT_SCRIPT = """selector => {
+    const styles = Array.from(document.styleSheets, sheet => {
+        try {
+            return Array.from(sheet.cssRules, rule => rule.cssText).join('\\n');
+        } catch (e) {
+            return 'href:' + sheet.href;  // cross-origin: only its URL is readable
+        }
+    }).join('\\n\\f\\n');
+    const attributes = el => Array.from(el.attributes, attr => attr.name + '=' + attr.value).join(' ');
+    const slides = Array.from(document.querySelectorAll(selector), slide => {
+        const urls = new Set();
+        for (const el of [slide, ...slide.querySelectorAll('*')]) {
+            if (el.tagName === 'IMG' && (el.currentSrc || el.src)) {
+                urls.add(el.currentSrc || el.src);
+            }
+            for (const match of getComputedStyle(el).backgroundImage.matchAll(/url\\("(.*?)"\\)/g)) {
+                urls.add(match[1]);
+            }
+        }
+        return [slide.outerHTML, Array.from(urls).sort()];
+    });
+    return {
+        root: attributes(document.documentElement) + '\\n' + attributes(document.body),
+        viewport: [window.innerWidth, window.innerHeight],
+        styles,
+        slides,
+    };
+}"""
+
+
+class SlidePdfCache(ParseCache):
+    """Directory of single-slide PDFs, one file per slide fingerprint"""
+
+    magic = b'PFESP1\n'
+    entry_suffix = '.pfepdf'
+
+    def __init__(self, cache_dir=PDF_CACHE_DIR, max_bytes=MAX_PDF_CACHE_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    def get(self, key):
+        """PDF bytes of the slide printed under key, or None on a miss"""
+        return self._read(key)
+
+    def put(self, key, pdf_bytes):
+        self._write(key, pdf_bytes)
+
+
+def _url_stamp(url, assets=None):
+    """What identifies an image's content: size/mtime of a local file, else its URL"""
+    parts = urlsplit(url)
+    if parts.scheme == 'file':
+        try:
+            stat = os.stat(unquote(parts.path))
+        except OSError:
+            return f"{url}:missing"
+        return f"{url}:{stat.st_size}:{stat.st_mtime_ns}"
+    if parts.scheme == 'data':
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    digest = assets.digest_for(url) if assets is not None else None
+    return f"{url}:{digest}" if digest else url
+
+
+def slide_fingerprints(context, pdf_options, assets=None):
+    """Fingerprint of every slide from FINGERPRINT_SCRIPT's result"""
+    shared = hashlib.sha256()
+    shared.update(f"pdf{RENDERER_VERSION}\0{json.dumps(pdf_options, sort_keys=True)}\0".encode('utf-8'))
+    shared.update(f"{context['viewport']}\0{context['root']}\0".encode('utf-8'))
+    shared.update(context['styles'].encode('utf-8'))
+
+    fingerprints = []
+    for slide_html, urls in context['slides']:
+        digest = shared.copy()
+        digest.update(b'\0' + slide_html.encode('utf-8'))
+        for url in urls:
+            digest.update(f"\0{_url_stamp(url, assets)}".encode('utf-8'))
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+async def _print_slides(page, indexes, pdf_options):
+    """{index: PDF bytes} of each slide of indexes, printed alone on the loaded page"""
+    pdfs = {}
+    await add_range_style(page)
+    for index in indexes:
+        await show_slides(page, index, index + 1)
+        pdfs[index] = await page.pdf(**pdf_options)
+    return pdfs
+
+
+async def _print_slides_on_new_page(pool, html_path, indexes, pdf_options, assets):
+    async with pool.page() as page:
+        await load_deck(page, html_path, assets)
+        return await _print_slides(page, indexes, pdf_options)
+
+
+async def render_pdf_incremental(pool, html_path, pdf_path, assets=None, cache=None, pdf_options=None):
+    """render_pdf() that only prints the slides missing from the slide PDF cache"""
+    cache = cache or SlidePdfCache()
+    pdf_options = dict(PDF_OPTIONS, **(pdf_options or {}))
+
+    async with pool.page() as page:
+        await load_deck(page, html_path, assets)
+        context = await page.evaluate(FINGERPRINT_SCRIPT, SLIDE_SELECTOR)
+        fingerprints = slide_fingerprints(context, pdf_options, assets)
+
+        # Identical slides (repeated dividers...) are printed once
+        pdfs = {}
+        missing = {}
+        for index, key in enumerate(fingerprints):
+            if key in pdfs or key in missing:
+                continue
+            pdf_bytes = cache.get(key)
+            if pdf_bytes is None:
+                missing[key] = index
+            else:
+                pdfs[key] = pdf_bytes
+        indexes = list(missing.values())
+
+        # A few slides are printed on the page that is already loaded
+        parts = max(1, min(pool.size * pool.pages_per_browser, -(-len(indexes) // MIN_SLIDES_PER_PAGE)))
+        if parts == 1:
+            printed = [await _print_slides(page, indexes, pdf_options)]
+
+    if not fingerprints:
+        return await render_pdf(pool, html_path, pdf_path, assets)
+    if parts > 1:
+        # On fresh pages only: waiting for pages while holding one could deadlock the pool
+        printed = await asyncio.gather(*(
+            _print_slides_on_new_page(pool, html_path, indexes[idx::parts], pdf_options, assets)
+            for idx in range(parts)))
+
+    for group in printed:
+        for index, pdf_bytes in group.items():
+            cache.put(fingerprints[index], pdf_bytes)
+            pdfs[fingerprints[index]] = pdf_bytes
+
+    # pypdf is pure Python; keep the event loop free for the other decks
+    await asyncio.to_thread(merge_pdfs, [io.BytesIO(pdfs[key]) for key in fingerprints], pdf_path)
+
+    size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+    print(f"✓ {os.path.basename(pdf_path)} ({size_mb:.2f} MB, "
+          f"{len(indexes)} of {len(fingerprints)} slides printed)")
+    return pdf_path
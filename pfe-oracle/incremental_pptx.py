@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Incremental PPTX re-conversion
+Every slide of the IR gets a fingerprint that is stored in the output's custom
+document properties. On the next run only slides whose fingerprint changed
+are rendered (into a scratch deck) and spliced into the existing package;
+untouched slide parts and their media are copied over unchanged
+"""
+
+import hashlib
+import json
+import os
+from itertools import chain
+
+from asset_index import asset_index
+from image_pipeline import PIPELINE_VERSION, active_profile
+from pptx_package import Package, PackageError
+from slide_ir import IR_VERSION, iter_image_refs
+
+HASHES_PROPERTY = 'pfe-slide-hashes'
+RENDERER_PROPERTY = 'pfe-renderer'
+
+
+def slide_fingerprint(slide, images_dir=None, extra_srcs=()):
+    """Hash of a slide's IR plus the size/mtime of every image it references
+
+    extra_srcs: images the renderer adds to the slide on its own (logos...).
+    """
+    digest = hashlib.sha256(repr(slide).encode('utf-8'))
+    if images_dir:
+        assets = asset_index(images_dir)
+        for src in chain((image.src for image in iter_image_refs(slide)), extra_srcs):
+            asset = assets.lookup(src)
+            if asset is not None:
+                digest.update(f"\0{src}:{asset.size}:{asset.mtime_ns}".encode('utf-8'))
+            else:
+                digest.update(f"\0{src}:missing".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _save_full(output_path, slides, renderer_key, fingerprints, new_presentation, render_slide):
+    prs = new_presentation()
+    for slide in slides:
+        render_slide(prs, slide)
+
+    package = Package.from_presentation(prs)
+    package.set_custom_properties({
+        RENDERER_PROPERTY: renderer_key,
+        HASHES_PROPERTY: json.dumps(fingerprints),
+    })
+    package.save(output_path)
+
+
+def _splice(package, target_part, scratch, scratch_part, media_by_hash):
+    """Replace target_part's XML and relationships with scratch_part's"""
+    new_rels = package.import_slide_rels(target_part, scratch, scratch_part, media_by_hash)
+    package.parts[target_part] = scratch.parts[scratch_part]
+    package.set_rels(target_part, new_rels)
+
+
+def convert_incremental(output_path, slides, renderer_id, new_presentation, render_slide, images_dir=None,
+                        slide_assets=None):
+    """Build output_path from slides, re-rendering only slides that changed
+
+    new_presentation() must return an empty Presentation set up exactly like
+    the full build; render_slide(prs, slide) appends one slide to it.
+    slide_assets(slide) lists the images render_slide() adds to a slide
+    besides the ones its IR references, so editing them re-renders it too.
+    Returns the numbers of the slides that were (re)rendered.
+    """
+    # Embedded image bytes depend on the image profile too
+    renderer_key = f"{renderer_id}/ir{IR_VERSION}/{active_profile()}/img{PIPELINE_VERSION}"
+    fingerprints = [slide_fingerprint(slide, images_dir, slide_assets(slide) if slide_assets else ())
+                    for slide in slides]
+    all_numbers = [slide.number for slide in slides]
+
+    if not os.path.exists(output_path):
+        _save_full(output_path, slides, renderer_key, fingerprints, new_presentation, render_slide)
+        return all_numbers
+
+    package = Package.open(output_path)
+    properties = package.get_custom_properties()
+    try:
+        previous = json.loads(properties.get(HASHES_PROPERTY, 'null'))
+    except ValueError:
+        previous = None
+
+    slide_parts = package.slide_parts()
+    if (properties.get(RENDERER_PROPERTY) != renderer_key or not isinstance(previous, list)
+            or len(previous) != len(fingerprints) or len(slide_parts) != len(fingerprints)):
+        _save_full(output_path, slides, renderer_key, fingerprints, new_presentation, render_slide)
+        return all_numbers
+
+    changed = [idx for idx, (old, new) in enumerate(zip(previous, fingerprints)) if old != new]
+    if not changed:
+        return []
+
+    scratch_prs = new_presentation()
+    for idx in changed:
+        render_slide(scratch_prs, slides[idx])
+    scratch = Package.from_presentation(scratch_prs)
+
+    media_by_hash = package.media_by_hash()
+
+    try:
+        for idx, scratch_part in zip(changed, scratch.slide_parts()):
+            _splice(package, slide_parts[idx], scratch, scratch_part, media_by_hash)
+    except PackageError as e:
+        print(f"⚠ Incremental update not possible ({e}), rebuilding")
+        _save_full(output_path, slides, renderer_key, fingerprints, new_presentation, render_slide)
+        return all_numbers
+
+    package.drop_unreferenced_media()
+    package.set_custom_properties({
+        RENDERER_PROPERTY: renderer_key,
+        HASHES_PROPERTY: json.dumps(fingerprints),
+    })
+    package.save(output_path)
+
+    return [slides[idx].number for idx in changed]
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Raw OOXML shape writer
+Builds <p:sp> elements as XML text from parameterized templates that mirror
+exactly what python-pptx emits for add_textbox() / add_shape() plus the usual
+fill, line and font settings, then parses a whole group of shapes once and
+appends it to the slide's shape tree. Skips python-pptx's shape proxies and
+per-property lxml edits (and its //@id scan for every new shape id)
+"""
+
+import re
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+
+NAMESPACES = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+
+# MSO_SHAPE -> (prstGeom, shape name prefix) for the autoshapes the builders use
+RECTANGLE = ('rect', 'Rectangle')
+ROUNDED_RECTANGLE = ('roundRect', 'Rounded Rectangle')
+
+AUTOSHAPE_TEMPLATE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name} {index}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="{prst}"><a:avLst/></a:prstGeom>{fill}{line}</p:spPr>'
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:pPr algn="ctr"/></a:p></p:txBody></p:sp>'
+)
+
+TEXTBOX_TEMPLATE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {index}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="{wrap}"{anchor}><a:spAutoFit/></a:bodyPr><a:lstStyle/>{paragraphs}</p:txBody></p:sp>'
+)
+
+PICTURE_TEMPLATE = (
+    '<p:pic {namespaces}><p:nvPicPr><p:cNvPr id="{id}" name="Picture {index}" descr="{descr}"/>'
+    '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+    '<p:blipFill><a:blip r:embed="{rId}"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>'
+)
+
+CTRL_CHARS = re.compile(r'([\x00-\x08\x0B-\x1F])')
+LINE_BREAKS = re.compile('\n|\v')
+
+
+def _rgb(color):
+    return '%02X%02X%02X' % tuple(color)
+
+
+def solid_fill(color):
+    return f'<a:solidFill><a:srgbClr val="{_rgb(color)}"/></a:solidFill>'
+
+
+def gradient_fill(start_color, end_color, angle):
+    """Two-stop linear gradient; angle counter-clockwise in degrees, like fill.gradient_angle"""
+    ang = int(round(((360.0 - angle) % 360) * 60000))
+    return (f'<a:gradFill rotWithShape="1"><a:gsLst>'
+            f'<a:gs pos="0"><a:srgbClr val="{_rgb(start_color)}"/></a:gs>'
+            f'<a:gs pos="100000"><a:srgbClr val="{_rgb(end_color)}"/></a:gs>'
+            f'</a:gsLst><a:lin scaled="0" ang="{ang}"/></a:gradFill>')
+
+
+def line(color=None):
+    """<a:ln> with a solid color, or no line at all when color is None"""
+    if color is None:
+        return '<a:ln><a:noFill/></a:ln>'
+    return f'<a:ln>{solid_fill(color)}</a:ln>'
+
+
+def font(tag, size=None, bold=False, color=None, typeface=None):
+    """<a:rPr>/<a:defRPr> for a size in points, bold flag, RGB color and latin typeface"""
+    attrs = ''
+    if size is not None:
+        attrs += f' sz="{int(size * 100)}"'
+    if bold:
+        attrs += ' b="1"'
+    children = solid_fill(color) if color is not None else ''
+    if typeface is not None:
+        children += f'<a:latin typeface="{typeface}"/>'
+    if not children:
+        return f'<a:{tag}{attrs}/>'
+    return f'<a:{tag}{attrs}>{children}</a:{tag}>'
+
+
+def run(text, run_font=None):
+    """<a:r>; text is escaped like python-pptx's run.text setter"""
+    text = CTRL_CHARS.sub(lambda match: '_x%04X_' % ord(match.group(1)), text)
+    return f'<a:r>{run_font or ""}<a:t>{escape(text)}</a:t></a:r>'
+
+
+def paragraph_runs(text):
+    """Runs and <a:br/> for paragraph.text = text ('\\n' / '\\v' become line breaks)"""
+    parts = []
+    for idx, piece in enumerate(LINE_BREAKS.split(text)):
+        if idx > 0:
+            parts.append('<a:br/>')
+        if piece:
+            parts.append(run(piece))
+    return ''.join(parts)
+
+
+def paragraph(content, default_font=None):
+    """<a:p> with already rendered runs and an optional paragraph-level font"""
+    ppr = f'<a:pPr>{default_font}</a:pPr>' if default_font else ''
+    if not ppr and not content:
+        return '<a:p/>'
+    return f'<a:p>{ppr}{content}</a:p>'
+
+
+def text_paragraphs(text, default_font=None):
+    """Paragraphs for text_frame.text = text, with the font on the first paragraph"""
+    lines = text.split('\n')
+    paragraphs = [paragraph(paragraph_runs(lines[0]), default_font)]
+    paragraphs.extend(paragraph(paragraph_runs(line_text)) for line_text in lines[1:])
+    return ''.join(paragraphs)
+
+
+def autoshape(shape_id, geometry, x, y, cx, cy, fill, line_xml):
+    """<p:sp> for slide.shapes.add_shape() with the given fill and line"""
+    prst, name = geometry
+    return AUTOSHAPE_TEMPLATE.format(
+        id=shape_id, index=shape_id - 1, name=name, prst=prst,
+        x=int(x), y=int(y), cx=int(cx), cy=int(cy), fill=fill, line=line_xml)
+
+
+def textbox(shape_id, x, y, cx, cy, paragraphs, word_wrap=False, anchor=None):
+    """<p:sp> for slide.shapes.add_textbox() holding already rendered paragraphs"""
+    return TEXTBOX_TEMPLATE.format(
+        id=shape_id, index=shape_id - 1, x=int(x), y=int(y), cx=int(cx), cy=int(cy),
+        wrap='square' if word_wrap else 'none',
+        anchor=f' anchor="{anchor}"' if anchor else '', paragraphs=paragraphs)
+
+
+def picture(shape_id, rId, x, y, cx, cy, descr):
+    """Standalone <p:pic> (namespaces declared) for slide.shapes.add_picture()"""
+    return PICTURE_TEMPLATE.format(
+        namespaces=NAMESPACES, id=shape_id, index=shape_id - 1, rId=rId,
+        x=int(x), y=int(y), cx=int(cx), cy=int(cy), descr=escape(descr, {'"': '&quot;'}))
+
+
+class ShapeWriter:
+    """Collects shapes for one slide and appends them in a single parse
+
+    Shape ids and names follow python-pptx: id is one more than the highest id
+    on the slide, the name suffix is id - 1.
+    """
+
+    def __init__(self, slide):
+        self.spTree = slide.shapes._spTree
+        self.next_id = self.spTree.max_shape_id + 1
+        self.fragments = []
+
+    def _allocate_id(self):
+        shape_id = self.next_id
+        self.next_id += 1
+        return shape_id
+
+    def autoshape(self, geometry, x, y, cx, cy, fill, line_xml):
+        self.fragments.append(autoshape(self._allocate_id(), geometry, x, y, cx, cy, fill, line_xml))
+
+    def textbox(self, x, y, cx, cy, paragraphs, word_wrap=False, anchor=None):
+        self.fragments.append(textbox(self._allocate_id(), x, y, cx, cy, paragraphs, word_wrap, anchor))
+
+    def flush(self):
+        """Parse the collected shapes and append them to the slide"""
+        if not self.fragments:
+            return
+        group = parse_xml(f'<p:spTree {NAMESPACES}>{"".join(self.fragments)}</p:spTree>')
+        self.spTree.extend(list(group))
+        self.fragments = []
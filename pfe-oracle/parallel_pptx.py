@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parallel slide rendering with an OOXML merge
+python-pptx is single-threaded, so the deck is cut into contiguous chunks of
+slides, each chunk is rendered into its own package in a worker process, and
+the chunk packages are merged back into one deck: slide parts and their
+relationships are appended in order, layouts are shared (every chunk starts
+from the same template) and identical media is stored once. The image
+decisions and unresolved asset references of each worker are merged back
+too, so print_image_report() and report_missing_assets() cover every slide
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_index import merge_missing_assets, missing_assets
+from image_pipeline import image_decisions, merge_image_decisions
+from pptx_package import Package
+
+
+def _chunks(items, count):
+    """Split items into count contiguous, nearly equal slices"""
+    size, extra = divmod(len(items), count)
+    chunks = []
+    start = 0
+    for idx in range(count):
+        end = start + size + (1 if idx < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+
+def _render_chunk(new_builder, slide_funcs, first_slide=0):
+    """Worker: render slide_funcs into a fresh deck
+
+    new_builder() returns either a builder with a .prs Presentation or a
+    Presentation itself; every slide_func(builder) appends exactly one slide.
+    A builder with a slide_offset attribute gets first_slide, the number of
+    slides before the chunk. Returns (.pptx bytes, image decisions, missing
+    asset references) of the chunk.
+    """
+    builder = new_builder()
+    if hasattr(builder, 'slide_offset'):
+        builder.slide_offset = first_slide
+    for slide_func in slide_funcs:
+        slide_func(builder)
+
+    prs = getattr(builder, 'prs', builder)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue(), image_decisions(), missing_assets()
+
+
+def merge_packages(packages):
+    """Append the slides of packages[1:] to packages[0], in order"""
+    merged = packages[0]
+    media_by_hash = merged.media_by_hash()
+
+    for package in packages[1:]:
+        for slide_part in package.slide_parts():
+            part_name = merged.new_part_name('ppt/slides/slide{}.xml')
+            rels = merged.import_slide_rels(part_name, package, slide_part, media_by_hash)
+            merged.append_slide(part_name, package.parts[slide_part], rels)
+
+    # docProps/app.xml still counts and names the first chunk's slides
+    merged.update_app_properties()
+    return merged
+
+
+def render_parallel(new_builder, slide_funcs, output_path, workers=None):
+    """Render slide_funcs across worker processes and save the merged deck
+
+    new_builder and every slide function must be picklable (module-level
+    functions, functools.partial of them, ...). Returns output_path.
+    """
+    workers = workers or os.cpu_count() or 1
+    slide_funcs = list(slide_funcs)
+
+    if workers <= 1 or len(slide_funcs) <= 1:
+        data, _, _ = _render_chunk(new_builder, slide_funcs)
+        Package.from_bytes(data).save(output_path)
+        return output_path
+
+    # A couple of chunks per worker evens out slides of very different cost
+    chunks = _chunks(slide_funcs, min(len(slide_funcs), workers * 2))
+    first_slides = [sum(len(chunk) for chunk in chunks[:idx]) for idx in range(len(chunks))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render_chunk, [new_builder] * len(chunks), chunks, first_slides))
+
+    for _, decisions, missing in results:
+        merge_image_decisions(decisions)
+        merge_missing_assets(missing)
+    merged = merge_packages([Package.from_bytes(data) for data, _, _ in results])
+    merged.save(output_path)
+    return output_path
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Content-hash keyed on-disk cache of parsed decks
+Entries are keyed by SHA-256 of the HTML bytes plus the parser name/version,
+stored as zlib-compressed pickles and evicted least-recently-used once the
+cache directory grows past its size cap
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+CACHE_DIR = os.environ.get('PFE_PARSE_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'pfe-oracle', 'parse'))
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+MAGIC = b'PFEPC1\n'
+ENTRY_SUFFIX = '.pfecache'
+
+
+class ParseCache:
+    """Directory of cached parse results, one file per (HTML hash, parser, version)"""
+
+    magic = MAGIC
+    entry_suffix = ENTRY_SUFFIX
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(html_bytes, parser_name, parser_version):
+        """SHA-256 over parser identity and document bytes"""
+        digest = hashlib.sha256()
+        digest.update(f"{parser_name}:{parser_version}\0".encode('utf-8'))
+        digest.update(html_bytes)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + self.entry_suffix)
+
+    def _read(self, key):
+        """Payload stored under key (without the magic header), or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        if not data.startswith(self.magic):
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return data[len(self.magic):]
+
+    def _write(self, key, payload):
+        """Store payload under key (atomic rename, safe with concurrent writers)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.magic + payload)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def get(self, key):
+        """Return the cached model for key, or None on a miss"""
+        payload = self._read(key)
+        if payload is None:
+            return None
+
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception:
+            # Corrupt or written by an incompatible version: treat as a miss
+            return None
+
+    def put(self, key, model):
+        """Store model under key"""
+        self._write(key, zlib.compress(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL), 6))
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.entry_suffix):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except FileNotFoundError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def load(self, html_path, parser_name, parser_version, parse_func):
+        """Return parse_func(html_text) for html_path, from the cache when possible"""
+        with open(html_path, 'rb') as f:
+            html_bytes = f.read()
+
+        key = self.make_key(html_bytes, parser_name, parser_version)
+        model = self.get(key)
+        if model is None:
+            model = parse_func(html_bytes.decode('utf-8'))
+            self.put(key, model)
+
+        return model
+
+
+def cached_parse(html_path, parser_name, parser_version, parse_func):
+    """Parse html_path through the default on-disk cache"""
+    return ParseCache().load(html_path, parser_name, parser_version, parse_func)
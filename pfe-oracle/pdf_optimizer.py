@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+PDF post-optimizer
+Shrinks an exported PDF without a second browser pass (pypdf + Pillow):
+
+- identical streams (the same image or font program on every part of a
+  --split or --incremental export, repeated XObjects) become one object;
+- images drawn at more than the image profile's DPI (see image_pipeline.py)
+  are resampled to it, together with their soft masks; the size an image is
+  drawn at is read from the page content streams, and images whose placement
+  can't be worked out (patterns, annotations) are left alone. JPEGs are
+  re-encoded at the profile's quality, other images stay lossless;
+- content streams, fonts and other deflated or unfiltered streams are
+  re-deflated at level 9, kept only when smaller.
+
+Every object that shrank is reported with its savings. Fonts are
+deduplicated but not re-subsetted: Chromium already embeds subsets, and
+merging the subsets of separately printed parts would need a font toolkit.
+
+    python pdf_optimizer.py deck.pdf                  # deck_optimized.pdf
+    python pdf_optimizer.py --profile=web --in-place deck.pdf
+"""
+
+import hashlib
+import io
+import math
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+
+from PIL import Image as PILImage
+
+from image_pipeline import PROFILES, active_profile, target_pixels
+
+EMU_PER_POINT = 12700
+IDENTITY = [1, 0, 0, 1, 0, 0]
+
+# Forms drawing forms drawing forms...: stop following placements this deep
+MAX_FORM_DEPTH = 12
+
+# Below this, re-deflating a stream isn't worth reporting or rewriting
+MIN_SAVING = 16
+
+# Each round merges one more level of objects referencing merged ones
+MAX_DEDUPLICATION_ROUNDS = 8
+
+# Color spaces an image can be decoded in (with 8 bits per component)
+IMAGE_MODES = {'/DeviceRGB': 'RGB', '/DeviceGray': 'L'}
+ICC_MODES = {3: 'RGB', 1: 'L'}
+# Image filters _decode_image() reads ('' = unfiltered)
+IMAGE_FILTERS = ('/DCTDecode', '/FlateDecode', '')
+
+FONT_FILE_KEYS = ('/FontFile', '/FontFile2', '/FontFile3')
+
+
+@dataclass(slots=True)
+class Saving:
+    """One object that got smaller, and how"""
+    idnum: int
+    kind: str
+    note: str
+    before: int
+    after: int
+
+
+@dataclass(slots=True)
+class OptimizationReport:
+    """What optimize_pdf() did to one file"""
+    input_path: str
+    output_path: str
+    input_bytes: int = 0
+    output_bytes: int = 0
+    savings: list = field(default_factory=list)
+
+
+def _get(dictionary, key, default=None):
+    """dictionary[key] with an indirect reference resolved (.get() leaves it unresolved)"""
+    return dictionary[key] if key in dictionary else default
+
+
+def _concat(matrix, ctm):
+    """matrix x ctm, PDF's [a b c d e f] convention"""
+    a, b, c, d, e, f = matrix
+    A, B, C, D, E, F = ctm
+    return [a * A + b * C, a * B + b * D, c * A + d * C, c * B + d * D,
+            e * A + f * C + E, e * B + f * D + F]
+
+
+def _stream_kind(stream):
+    subtype = stream.get('/Subtype')
+    if subtype == '/Image':
+        return 'image'
+    if subtype == '/Form':
+        return 'form'
+    if '/Length1' in stream or subtype in ('/Type1C', '/CIDFontType0C', '/OpenType'):
+        return 'font'
+    return 'content'
+
+
+class _Scan:
+    """Every stream reachable from the pages, and the largest size each image is drawn at"""
+
+    def __init__(self, writer):
+        from pypdf.generic import ContentStream
+
+        self._content_stream = ContentStream
+        self.writer = writer
+        self.streams = {}     # idnum -> (kind, stream)
+        self.placements = {}  # image idnum -> (width pt, height pt)
+        self._operations = {}
+        for page in writer.pages:
+            contents = _get(page, '/Contents')
+            if contents is None:
+                continue
+            refs = contents if isinstance(contents, list) else [page.raw_get('/Contents')]
+            for ref in refs:
+                self._add(ref, 'content')
+            resources = _get(page, '/Resources')
+            self._collect(resources)
+            self._draw(page.get_contents().operations, resources, IDENTITY, 0)
+
+    def _add(self, ref, kind):
+        """Record ref's stream; False when it was already recorded (or isn't an indirect stream)"""
+        if not hasattr(ref, 'idnum') or ref.idnum in self.streams:
+            return False
+        stream = ref.get_object()
+        if not hasattr(stream, 'get_data'):
+            return False
+        self.streams[ref.idnum] = (kind, stream)
+        return True
+
+    def _collect(self, resources):
+        if resources is None:
+            return
+        xobjects = _get(resources, '/XObject', {})
+        for name in xobjects:
+            ref = xobjects.raw_get(name)
+            xobject = ref.get_object()
+            if not self._add(ref, _stream_kind(xobject)):
+                continue
+            if xobject.get('/Subtype') == '/Image' and '/SMask' in xobject:
+                self._add(xobject.raw_get('/SMask'), 'image')
+            self._collect(_get(xobject, '/Resources'))
+
+        fonts = _get(resources, '/Font', {})
+        for name in fonts:
+            font = fonts[name]
+            descendants = [descendant.get_object() for descendant in _get(font, '/DescendantFonts', [])]
+            for each in [font] + descendants:
+                if '/ToUnicode' in each:
+                    self._add(each.raw_get('/ToUnicode'), 'font')
+                descriptor = _get(each, '/FontDescriptor', {})
+                for key in FONT_FILE_KEYS:
+                    if key in descriptor:
+                        self._add(descriptor.raw_get(key), 'font')
+            self._collect(_get(font, '/Resources'))  # Type3 glyph procedures
+
+        patterns = _get(resources, '/Pattern', {})
+        for name in patterns:
+            ref = patterns.raw_get(name)
+            if self._add(ref, 'content'):
+                self._collect(_get(ref.get_object(), '/Resources'))
+
+        states = _get(resources, '/ExtGState', {})
+        for name in states:
+            soft_mask = _get(states[name], '/SMask')
+            if hasattr(soft_mask, 'raw_get') and '/G' in soft_mask:
+                if self._add(soft_mask.raw_get('/G'), 'form'):
+                    self._collect(_get(soft_mask['/G'], '/Resources'))
+
+    def _draw(self, operations, resources, ctm, depth):
+        """Follow q/Q/cm and record the size of every image painted with Do"""
+        xobjects = _get(resources, '/XObject', {}) if resources is not None else {}
+        stack = []
+        for operands, operator in operations:
+            if operator == b'q':
+                stack.append(ctm)
+            elif operator == b'Q':
+                if stack:
+                    ctm = stack.pop()
+            elif operator == b'cm':
+                ctm = _concat([float(value) for value in operands], ctm)
+            elif operator == b'Do' and operands and operands[0] in xobjects:
+                ref = xobjects.raw_get(operands[0])
+                xobject = ref.get_object()
+                if not hasattr(ref, 'idnum'):
+                    continue
+                if xobject.get('/Subtype') == '/Image':
+                    width, height = math.hypot(ctm[0], ctm[1]), math.hypot(ctm[2], ctm[3])
+                    drawn = self.placements.get(ref.idnum, (0, 0))
+                    self.placements[ref.idnum] = (max(drawn[0], width), max(drawn[1], height))
+                elif xobject.get('/Subtype') == '/Form' and depth < MAX_FORM_DEPTH:
+                    form_operations = self._operations.get(ref.idnum)
+                    if form_operations is None:
+                        form_operations = self._content_stream(xobject, self.writer).operations
+                        self._operations[ref.idnum] = form_operations
+                    matrix = [float(value) for value in _get(xobject, '/Matrix', IDENTITY)]
+                    self._draw(form_operations, _get(xobject, '/Resources', resources),
+                               _concat(matrix, ctm), depth + 1)
+
+
+# ---------------------------------------------------------------------------
+# Images
+# ---------------------------------------------------------------------------
+
+def _image_mode(image):
+    """Pillow mode an image XObject decodes to, or None when it isn't handled"""
+    if _get(image, '/BitsPerComponent') != 8 or _get(image, '/ImageMask') or '/Decode' in image:
+        return None
+    color_space = _get(image, '/ColorSpace')
+    if isinstance(color_space, list):
+        if len(color_space) == 2 and color_space[0] == '/ICCBased':
+            return ICC_MODES.get(_get(color_space[1].get_object(), '/N'))
+        return None
+    return IMAGE_MODES.get(color_space)
+
+
+def _filter(stream):
+    """The stream's single filter name ('' when unfiltered), or None for a chain"""
+    filters = _get(stream, '/Filter', '')
+    if isinstance(filters, list):
+        return filters[0] if len(filters) == 1 else None
+    return filters
+
+
+def _decode_image(image, mode):
+    """Pillow image of a DCT- or Flate-encoded image XObject, or None"""
+    image_filter = _filter(image)
+    if image_filter == '/DCTDecode':
+        decoded = PILImage.open(io.BytesIO(image._data))
+        return decoded if decoded.mode == mode else None
+    if image_filter in ('/FlateDecode', ''):
+        size = (image['/Width'], image['/Height'])
+        data = image.get_data()
+        if len(data) < size[0] * size[1] * len(mode):
+            return None
+        return PILImage.frombytes(mode, size, data)
+    return None
+
+
+def _set_image(image, data, image_filter, size):
+    """Replace an image XObject's pixels with encoded data (mutates it in place)"""
+    from pypdf.generic import NameObject, NumberObject
+
+    image._data = data
+    image.decoded_self = None
+    image[NameObject('/Filter')] = NameObject(image_filter)
+    image[NameObject('/Width')] = NumberObject(size[0])
+    image[NameObject('/Height')] = NumberObject(size[1])
+    image.pop('/DecodeParms', None)
+
+
+def _resample(image, size, settings, force=False):
+    """Resample one image XObject to size in place; returns the new encoded size, or None
+
+    Unless force is set, the image is only replaced when that saves bytes.
+    """
+    mode = _image_mode(image)
+    decoded = _decode_image(image, mode) if mode else None
+    if decoded is None:
+        return None
+
+    resized = decoded.resize(size, PILImage.LANCZOS)
+    if _filter(image) == '/DCTDecode':
+        buffer = io.BytesIO()
+        resized.save(buffer, 'JPEG', quality=settings['jpeg_quality'], optimize=True)
+        data, image_filter = buffer.getvalue(), '/DCTDecode'
+    else:
+        data, image_filter = zlib.compress(resized.tobytes(), 9), '/FlateDecode'
+    if len(data) >= len(image._data) and not force:
+        return None
+    _set_image(image, data, image_filter, size)
+    return len(data)
+
+
+def downsample_images(scan, settings, report):
+    """Resample every image drawn above settings['dpi'] (and its soft mask)"""
+    for idnum, (width, height) in sorted(scan.placements.items()):
+        image = scan.streams.get(idnum, (None, None))[1]
+        if image is None or not width or not height:
+            continue
+        pixels = (image['/Width'], image['/Height'])
+        target = target_pixels(width * EMU_PER_POINT, height * EMU_PER_POINT, settings['dpi'])
+        scale = max(target[0] / pixels[0], target[1] / pixels[1])
+        if scale >= 1:
+            continue
+        size = (max(1, round(pixels[0] * scale)), max(1, round(pixels[1] * scale)))
+        dpi = pixels[0] / (width / 72)
+
+        before = len(image._data)
+        soft_mask = _get(image, '/SMask')
+        if soft_mask is not None and (soft_mask['/Width'], soft_mask['/Height']) != pixels:
+            soft_mask = None  # drawn stretched to the image anyway
+        if soft_mask is not None and (_image_mode(soft_mask) != 'L'
+                                      or _filter(soft_mask) not in IMAGE_FILTERS):
+            continue
+        after = _resample(image, size, settings)
+        if after is None:
+            continue
+        if soft_mask is not None:
+            # Keep the mask the image's size, even when it doesn't shrink
+            mask_before = len(soft_mask._data)
+            mask_after = _resample(soft_mask, size, settings, force=True)
+            if mask_after is not None:
+                before += mask_before
+                after += mask_after
+        report.savings.append(Saving(
+            idnum, 'image', f"{pixels[0]}x{pixels[1]} @ {dpi:.0f} DPI → {size[0]}x{size[1]} "
+            f"({_filter(image)[1:]}{'' if soft_mask is None else ' + mask'})", before, after))
+
+
+# ---------------------------------------------------------------------------
+# Streams
+# ---------------------------------------------------------------------------
+
+def recompress_streams(scan, report):
+    """Re-deflate Flate (without predictors) and unfiltered streams at level 9"""
+    from pypdf.generic import NameObject
+
+    for idnum, (kind, stream) in sorted(scan.streams.items()):
+        stream_filter = _filter(stream)
+        if stream_filter not in ('/FlateDecode', '') or '/DecodeParms' in stream:
+            continue
+        before = len(stream._data)
+        try:
+            data = zlib.compress(stream.get_data(), 9)
+        except Exception:
+            continue  # damaged stream: leave it as it is
+        if len(data) + MIN_SAVING > before:
+            continue
+        stream._data = data
+        stream.decoded_self = None
+        stream[NameObject('/Filter')] = NameObject('/FlateDecode')
+        note = 're-deflated' if stream_filter else 'deflated'
+        report.savings.append(Saving(idnum, kind, note, before, len(data)))
+
+
+def _stream_hash(stream):
+    dictionary = sorted((key, repr(value)) for key, value in stream.items() if key != '/Length')
+    return hashlib.sha256(repr(dictionary).encode('utf-8') + b'\0' + stream._data).hexdigest()
+
+
+def deduplicate_streams(writer, scan, report):
+    """Merge identical streams into one object each, carrying over where they are drawn
+
+    Runs in rounds: once two soft masks are merged, the images using them
+    become identical too, and so on up the forms that draw them.
+    """
+    for _ in range(MAX_DEDUPLICATION_ROUNDS):
+        groups = {}
+        for idnum, (kind, stream) in scan.streams.items():
+            groups.setdefault(_stream_hash(stream), []).append(idnum)
+        duplicates = [sorted(idnums) for idnums in groups.values() if len(idnums) > 1]
+        if not duplicates:
+            return
+
+        for kept, *merged in duplicates:
+            kind, stream = scan.streams[kept]
+            size = len(stream._data)
+            report.savings.append(Saving(kept, kind, f"{len(merged) + 1} identical copies merged",
+                                         size * (len(merged) + 1), size))
+            for idnum in merged:
+                drawn = scan.placements.pop(idnum, None)
+                if drawn is not None:
+                    kept_drawn = scan.placements.get(kept, (0, 0))
+                    scan.placements[kept] = (max(drawn[0], kept_drawn[0]), max(drawn[1], kept_drawn[1]))
+                del scan.streams[idnum]
+        writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def optimized_path(pdf_path):
+    """deck.pdf -> deck_optimized.pdf"""
+    root, extension = os.path.splitext(pdf_path)
+    return f"{root}_optimized{extension}"
+
+
+def optimize_pdf(pdf_path, output_path=None, profile=None):
+    """Write an optimized copy of pdf_path (default: deck_optimized.pdf); returns an OptimizationReport
+
+    output_path may be pdf_path itself (atomic rename). profile names the
+    image profile whose DPI cap and JPEG quality apply (default:
+    PFE_IMAGE_PROFILE); 'original' leaves image pixels alone.
+    """
+    from pypdf import PdfWriter
+
+    output_path = output_path or optimized_path(pdf_path)
+    settings = PROFILES[profile or active_profile()]
+    report = OptimizationReport(pdf_path, output_path, input_bytes=os.path.getsize(pdf_path))
+
+    writer = PdfWriter(clone_from=pdf_path)
+    scan = _Scan(writer)
+    # Identical copies first, so each image is resampled once
+    deduplicate_streams(writer, scan, report)
+    if settings is not None:
+        downsample_images(scan, settings, report)
+    recompress_streams(scan, report)
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.pdf.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer.write(f)
+        shutil.copymode(pdf_path, tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    writer.close()
+
+    report.output_bytes = os.path.getsize(output_path)
+    return report
+
+
+def _saving(before, after):
+    return f"-{(before - after) / before:.0%}" if before else "-0%"
+
+
+def print_optimization_report(report, top=15):
+    """Print the largest per-object savings, totals per kind and the file sizes"""
+    print(f"\n🗜️  {os.path.basename(report.input_path)} → {os.path.basename(report.output_path)}")
+    savings = sorted(report.savings, key=lambda saving: saving.after - saving.before)
+    for saving in savings[:top]:
+        print(f"   obj {saving.idnum} {saving.kind}: {saving.note}")
+        print(f"      {saving.before / 1024:.1f} KB → {saving.after / 1024:.1f} KB "
+              f"({_saving(saving.before, saving.after)})")
+    if len(savings) > top:
+        print(f"   ... and {len(savings) - top} more object(s)")
+
+    totals = {}
+    for saving in report.savings:
+        total = totals.setdefault(saving.kind, [0, 0, 0])
+        total[0] += 1
+        total[1] += saving.before
+        total[2] += saving.after
+    for kind, (count, before, after) in sorted(totals.items()):
+        print(f"   {kind}: {count} object(s), {(before - after) / 1024:.0f} KB saved")
+    print(f"   File: {report.input_bytes / (1024*1024):.2f} MB → "
+          f"{report.output_bytes / (1024*1024):.2f} MB ({_saving(report.input_bytes, report.output_bytes)})")
+
+
+def main():
+    profile = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--profile=')), None)
+    in_place = '--in-place' in sys.argv[1:]
+    pdf_paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not pdf_paths:
+        pdf_paths = ['/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/dbaichi-v1.pdf']
+
+    print("=" * 60)
+    print("PDF post-optimizer")
+    print("=" * 60)
+    print(f"\nImage profile: {profile or active_profile()}")
+
+    for pdf_path in pdf_paths:
+        report = optimize_pdf(pdf_path, pdf_path if in_place else None, profile)
+        print_optimization_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Minimal OPC (zip) package access for .pptx files
+Reads every part into memory, edits relationships, content types, slide order
+and custom document properties, and writes the package back atomically,
+without going through python-pptx's object model. ZipPackage does the same
+for a deck on disk but only inflates the parts it touches and copies every
+other zip entry across still compressed
+"""
+
+import hashlib
+import io
+import os
+import posixpath
+import re
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from collections.abc import MutableMapping
+
+from lxml import etree
+
+NS_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+NS_CONTENT_TYPES = 'http://schemas.openxmlformats.org/package/2006/content-types'
+NS_CUSTOM_PROPS = 'http://schemas.openxmlformats.org/officeDocument/2006/custom-properties'
+NS_EXTENDED_PROPS = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+NS_VT = 'http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes'
+NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+RT_BASE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+RT_OFFICE_DOCUMENT = RT_BASE + 'officeDocument'
+RT_SLIDE = RT_BASE + 'slide'
+RT_SLIDE_LAYOUT = RT_BASE + 'slideLayout'
+RT_IMAGE = RT_BASE + 'image'
+RT_CUSTOM_PROPS = RT_BASE + 'custom-properties'
+
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+CT_CUSTOM_PROPS = 'application/vnd.openxmlformats-officedocument.custom-properties+xml'
+CUSTOM_PROPS_PART = 'docProps/custom.xml'
+CUSTOM_PROPS_FMTID = '{D5CDD505-2E9C-101B-9397-08002B2CF9AE}'
+APP_PROPS_PART = 'docProps/app.xml'
+SLIDE_TITLES_HEADING = 'Slide Titles'
+
+CONTENT_TYPES_PART = '[Content_Types].xml'
+MEDIA_DIR = 'ppt/media/'
+
+MEDIA_IMAGE_NAME = re.compile(r'ppt/media/image(\d+)(?:\.[^/]*)?$')
+
+# Image format -> (part name extension, content type), as python-pptx names media
+IMAGE_FORMATS = {
+    'BMP': ('bmp', 'image/bmp'),
+    'GIF': ('gif', 'image/gif'),
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'TIFF': ('tiff', 'image/tiff'),
+    'WMF': ('wmf', 'image/x-wmf'),
+}
+
+
+class PackageError(Exception):
+    """A part can't be carried over from one package into another"""
+
+
+def rels_part_name(part_name):
+    """Name of the relationships part belonging to part_name ('' = package)"""
+    directory, base = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', base + '.rels')
+
+
+class Package:
+    """An OPC package held as an ordered {part name: bytes} dict"""
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    @classmethod
+    def from_bytes(cls, data):
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            return cls({name: zf.read(name) for name in zf.namelist()})
+
+    @classmethod
+    def open(cls, path):
+        with zipfile.ZipFile(path) as zf:
+            return cls({name: zf.read(name) for name in zf.namelist()})
+
+    @classmethod
+    def from_presentation(cls, prs):
+        """Snapshot a python-pptx Presentation as a Package"""
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        return cls.from_bytes(buffer.getvalue())
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+            # [Content_Types].xml first, like every Office writer
+            names = sorted(self.parts, key=lambda name: name != CONTENT_TYPES_PART)
+            for name in names:
+                zf.writestr(name, self.parts[name])
+        return buffer.getvalue()
+
+    def write_to(self, f):
+        f.write(self.to_bytes())
+
+    def save(self, path):
+        """Write the package to path through a temp file + rename"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.pptx.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self.write_to(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # -- relationships ------------------------------------------------------
+
+    def get_rels(self, part_name):
+        """Relationships of part_name as a list of attribute dicts"""
+        data = self.parts.get(rels_part_name(part_name))
+        if data is None:
+            return []
+        root = etree.fromstring(data)
+        return [dict(rel.attrib) for rel in root.iterchildren(f'{{{NS_RELS}}}Relationship')]
+
+    def set_rels(self, part_name, rels):
+        root = etree.Element(f'{{{NS_RELS}}}Relationships', nsmap={None: NS_RELS})
+        for rel in rels:
+            etree.SubElement(root, f'{{{NS_RELS}}}Relationship', rel)
+        self.parts[rels_part_name(part_name)] = etree.tostring(
+            root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    @staticmethod
+    def resolve(source_part, target):
+        """Absolute part name of a relationship target relative to source_part"""
+        if target.startswith('/'):
+            return target[1:]
+        return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+    @staticmethod
+    def relative(source_part, target_part):
+        """Relationship target for target_part as seen from source_part"""
+        return posixpath.relpath(target_part, posixpath.dirname(source_part) or '.')
+
+    def next_rel_id(self, rels):
+        used = {rel['Id'] for rel in rels}
+        idx = 1
+        while f'rId{idx}' in used:
+            idx += 1
+        return f'rId{idx}'
+
+    # -- content types ------------------------------------------------------
+
+    def _content_types(self):
+        return etree.fromstring(self.parts[CONTENT_TYPES_PART])
+
+    def _store_content_types(self, root):
+        self.parts[CONTENT_TYPES_PART] = etree.tostring(
+            root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def ensure_default(self, extension, content_type):
+        """Make sure parts with this extension have a Default content type"""
+        root = self._content_types()
+        for default in root.iterchildren(f'{{{NS_CONTENT_TYPES}}}Default'):
+            if default.get('Extension').lower() == extension.lower():
+                return
+        element = etree.Element(f'{{{NS_CONTENT_TYPES}}}Default',
+                                Extension=extension, ContentType=content_type)
+        root.insert(0, element)
+        self._store_content_types(root)
+
+    def content_type_for_extension(self, extension):
+        root = self._content_types()
+        for default in root.iterchildren(f'{{{NS_CONTENT_TYPES}}}Default'):
+            if default.get('Extension').lower() == extension.lower():
+                return default.get('ContentType')
+        return None
+
+    def set_override(self, part_name, content_type):
+        root = self._content_types()
+        part_uri = '/' + part_name
+        for override in root.iterchildren(f'{{{NS_CONTENT_TYPES}}}Override'):
+            if override.get('PartName') == part_uri:
+                override.set('ContentType', content_type)
+                break
+        else:
+            etree.SubElement(root, f'{{{NS_CONTENT_TYPES}}}Override',
+                             PartName=part_uri, ContentType=content_type)
+        self._store_content_types(root)
+
+    def remove_override(self, part_name):
+        root = self._content_types()
+        part_uri = '/' + part_name
+        for override in list(root.iterchildren(f'{{{NS_CONTENT_TYPES}}}Override')):
+            if override.get('PartName') == part_uri:
+                root.remove(override)
+        self._store_content_types(root)
+
+    # -- presentation structure --------------------------------------------
+
+    def main_part(self):
+        for rel in self.get_rels(''):
+            if rel['Type'] == RT_OFFICE_DOCUMENT:
+                return self.resolve('', rel['Target'])
+        raise ValueError("Package has no officeDocument relationship")
+
+    def slide_parts(self):
+        """Slide part names in presentation order"""
+        presentation = self.main_part()
+        targets = {rel['Id']: self.resolve(presentation, rel['Target'])
+                   for rel in self.get_rels(presentation) if rel['Type'] == RT_SLIDE}
+        root = etree.fromstring(self.parts[presentation])
+        sld_id_lst = root.find(f'{{{NS_P}}}sldIdLst')
+        if sld_id_lst is None:
+            return []
+        return [targets[sld_id.get(f'{{{NS_R}}}id')] for sld_id in sld_id_lst]
+
+    def new_part_name(self, template, start=1):
+        """First free part name for a template such as 'ppt/media/image{}.png'"""
+        idx = start
+        while template.format(idx) in self.parts:
+            idx += 1
+        return template.format(idx)
+
+    def append_slide(self, part_name, slide_xml, rels):
+        """Add slide part part_name (see new_part_name) at the end of the presentation"""
+        presentation = self.main_part()
+        self.parts[part_name] = slide_xml
+        self.set_rels(part_name, rels)
+        self.set_override(part_name, CT_SLIDE)
+
+        presentation_rels = self.get_rels(presentation)
+        rel_id = self.next_rel_id(presentation_rels)
+        presentation_rels.append({'Id': rel_id, 'Type': RT_SLIDE,
+                                  'Target': self.relative(presentation, part_name)})
+        self.set_rels(presentation, presentation_rels)
+
+        root = etree.fromstring(self.parts[presentation])
+        sld_id_lst = root.find(f'{{{NS_P}}}sldIdLst')
+        if sld_id_lst is None:
+            # sldIdLst follows sldMasterIdLst / notesMasterIdLst / handoutMasterIdLst
+            sld_id_lst = etree.Element(f'{{{NS_P}}}sldIdLst')
+            anchor = None
+            for tag in ('sldMasterIdLst', 'notesMasterIdLst', 'handoutMasterIdLst'):
+                found = root.find(f'{{{NS_P}}}{tag}')
+                if found is not None:
+                    anchor = found
+            if anchor is None:
+                root.insert(0, sld_id_lst)
+            else:
+                anchor.addnext(sld_id_lst)
+        slide_ids = [int(sld_id.get('id')) for sld_id in sld_id_lst]
+        etree.SubElement(sld_id_lst, f'{{{NS_P}}}sldId',
+                         {'id': str(max(slide_ids + [255]) + 1), f'{{{NS_R}}}id': rel_id})
+        self.parts[presentation] = etree.tostring(
+            root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def next_image_part_name(self, extension):
+        """Name for a new ppt/media/image<n>.<extension>, numbered like python-pptx does"""
+        idxs = sorted(int(match.group(1)) for match in map(MEDIA_IMAGE_NAME.match, self.parts) if match)
+        for position, idx in enumerate(idxs, 1):
+            if position < idx:
+                return f'{MEDIA_DIR}image{position}.{extension}'
+        return f'{MEDIA_DIR}image{len(idxs) + 1}.{extension}'
+
+    def media_by_hash(self):
+        """{sha1 of content: part name} of every ppt/media part"""
+        return {hashlib.sha1(data).hexdigest(): name
+                for name, data in self.parts.items() if name.startswith(MEDIA_DIR)}
+
+    def import_slide_rels(self, target_part, source, source_part, media_by_hash):
+        """Relationships of source's slide part, rewritten for target_part in this package
+
+        Layout targets must already exist here with identical content (both
+        decks built from the same template); images are copied into ppt/media
+        unless media_by_hash already holds the same bytes.
+        """
+        new_rels = []
+        for rel in source.get_rels(source_part):
+            rel = dict(rel)
+            if rel.get('TargetMode') == 'External':
+                new_rels.append(rel)
+                continue
+
+            source_target = source.resolve(source_part, rel['Target'])
+
+            if rel['Type'] == RT_SLIDE_LAYOUT:
+                if self.parts.get(source_target) != source.parts[source_target]:
+                    raise PackageError(f"layout {source_target} differs between packages")
+                rel['Target'] = self.relative(target_part, source_target)
+
+            elif rel['Type'] == RT_IMAGE:
+                data = source.parts[source_target]
+                media_hash = hashlib.sha1(data).hexdigest()
+                media_part = media_by_hash.get(media_hash)
+                if media_part is None:
+                    extension = source_target.rsplit('.', 1)[-1]
+                    media_part = self.new_part_name(MEDIA_DIR + 'image{}.' + extension)
+                    self.parts[media_part] = data
+                    self.ensure_default(extension, source.content_type_for_extension(extension))
+                    media_by_hash[media_hash] = media_part
+                rel['Target'] = self.relative(target_part, media_part)
+
+            else:
+                raise PackageError(f"unsupported slide relationship {rel['Type']}")
+
+            new_rels.append(rel)
+        return new_rels
+
+    def referenced_parts(self):
+        """Every internal part targeted by some relationship"""
+        referenced = set()
+        for name in list(self.parts):
+            if not name.endswith('.rels'):
+                continue
+            directory, base = posixpath.split(name)
+            source = posixpath.join(posixpath.dirname(directory), base[:-len('.rels')])
+            for rel in self.get_rels(source):
+                if rel.get('TargetMode') != 'External':
+                    referenced.add(self.resolve(source, rel['Target']))
+        return referenced
+
+    def drop_unreferenced_media(self):
+        """Remove ppt/media parts no relationship points at any more"""
+        referenced = self.referenced_parts()
+        removed = [name for name in self.parts
+                   if name.startswith(MEDIA_DIR) and name not in referenced]
+        for name in removed:
+            del self.parts[name]
+        return removed
+
+    def slide_title(self, slide_part):
+        """Text of the slide's title placeholder, or '' when it has none"""
+        root = etree.fromstring(self.parts[slide_part])
+        for ph in root.iter(f'{{{NS_P}}}ph'):
+            if ph.get('type') in ('title', 'ctrTitle'):
+                shape = ph.getparent().getparent().getparent()
+                return ''.join(shape.itertext(f'{{{NS_A}}}t'))
+        return ''
+
+    def update_app_properties(self):
+        """Rewrite the slide count and slide titles of docProps/app.xml from the slide list"""
+        data = self.parts.get(APP_PROPS_PART)
+        if data is None:
+            return
+        root = etree.fromstring(data)
+        titles = [self.slide_title(slide_part) for slide_part in self.slide_parts()]
+        slides = root.find(f'{{{NS_EXTENDED_PROPS}}}Slides')
+        if slides is not None:
+            slides.text = str(len(titles))
+
+        # HeadingPairs is (heading, count) pairs cutting TitlesOfParts into groups
+        pairs = root.find(f'{{{NS_EXTENDED_PROPS}}}HeadingPairs/{{{NS_VT}}}vector')
+        parts = root.find(f'{{{NS_EXTENDED_PROPS}}}TitlesOfParts/{{{NS_VT}}}vector')
+        if pairs is None or parts is None:
+            return
+        variants = list(pairs)
+        groups = []
+        position = 0
+        for heading, count in zip(variants[0::2], variants[1::2]):
+            size = int(count[0].text)
+            groups.append([heading[0].text, list(parts)[position:position + size]])
+            position += size
+        if titles and SLIDE_TITLES_HEADING not in [heading for heading, _ in groups]:
+            groups.append([SLIDE_TITLES_HEADING, []])
+        for group in groups:
+            if group[0] == SLIDE_TITLES_HEADING:
+                group[1] = []
+                for title in titles:
+                    element = etree.Element(f'{{{NS_VT}}}lpstr')
+                    element.text = title
+                    group[1].append(element)
+
+        pairs[:] = []
+        parts[:] = []
+        for heading, entries in groups:
+            for tag, text in (('lpstr', heading), ('i4', str(len(entries)))):
+                variant = etree.SubElement(pairs, f'{{{NS_VT}}}variant')
+                etree.SubElement(variant, f'{{{NS_VT}}}{tag}').text = text
+            parts.extend(entries)
+        pairs.set('size', str(len(pairs)))
+        parts.set('size', str(len(parts)))
+        self.parts[APP_PROPS_PART] = etree.tostring(
+            root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    # -- custom document properties ---------------------------------------
+
+    def get_custom_properties(self):
+        data = self.parts.get(CUSTOM_PROPS_PART)
+        if data is None:
+            return {}
+        root = etree.fromstring(data)
+        properties = {}
+        for prop in root.iterchildren(f'{{{NS_CUSTOM_PROPS}}}property'):
+            value = prop[0].text if len(prop) else ''
+            properties[prop.get('name')] = value or ''
+        return properties
+
+    def set_custom_properties(self, properties):
+        """Replace docProps/custom.xml with string properties (vt:lpwstr)"""
+        root = etree.Element(f'{{{NS_CUSTOM_PROPS}}}Properties',
+                             nsmap={None: NS_CUSTOM_PROPS, 'vt': NS_VT})
+        for pid, (name, value) in enumerate(properties.items(), 2):
+            prop = etree.SubElement(root, f'{{{NS_CUSTOM_PROPS}}}property',
+                                    fmtid=CUSTOM_PROPS_FMTID, pid=str(pid), name=name)
+            etree.SubElement(prop, f'{{{NS_VT}}}lpwstr').text = value
+        self.parts[CUSTOM_PROPS_PART] = etree.tostring(
+            root, xml_declaration=True, encoding='UTF-8', standalone=True)
+        self.set_override(CUSTOM_PROPS_PART, CT_CUSTOM_PROPS)
+
+        package_rels = self.get_rels('')
+        if not any(rel['Type'] == RT_CUSTOM_PROPS for rel in package_rels):
+            package_rels.append({'Id': self.next_rel_id(package_rels),
+                                 'Type': RT_CUSTOM_PROPS, 'Target': CUSTOM_PROPS_PART})
+            self.set_rels('', package_rels)
+
+
+class LazyParts(MutableMapping):
+    """{part name: bytes} over an open zip file
+
+    Entries are inflated on first access; assigned parts are kept in memory
+    and listed in changed, in the zip's own order followed by new parts.
+    """
+
+    def __init__(self, zf):
+        self.zf = zf
+        self.infos = {info.filename: info for info in zf.infolist()}
+        self.names = dict.fromkeys(self.infos)
+        self.loaded = {}
+        self.changed = set()
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        if name not in self.loaded:
+            self.loaded[name] = self.zf.read(name)
+        return self.loaded[name]
+
+    def __setitem__(self, name, data):
+        self.names.setdefault(name)
+        self.loaded[name] = data
+        self.changed.add(name)
+
+    def __delitem__(self, name):
+        del self.names[name]
+        self.loaded.pop(name, None)
+        self.changed.add(name)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(list(self.names))
+
+    def __len__(self):
+        return len(self.names)
+
+
+# Zip records written by _ZipWriter (see the zip APPNOTE, sections 4.3.7-4.3.16)
+LOCAL_HEADER = struct.Struct('<4s5H3I2H')
+CENTRAL_HEADER = struct.Struct('<4s6H3I5H2I')
+END_OF_CENTRAL_DIRECTORY = struct.Struct('<4s4H2IH')
+ZIP_VERSION = 20  # deflate
+ZIP_UTF8_NAME = 0x800
+ZIP_DATA_DESCRIPTOR = 0x08
+# Beyond these a zip needs zip64 records, which _ZipWriter doesn't write
+ZIP_MAX_ENTRIES = 0xFFFF
+ZIP_MAX_OFFSET = 0xFFFFFFFF
+
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class _ZipWriter:
+    """Writes a zip entry by entry: new data deflated, existing entries copied still compressed
+
+    Only plain (non-zip64) zip records are written; everything comes from the
+    documented ZipInfo fields and the zip format itself.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offset = 0
+        self.central = []
+
+    def _write(self, name, flags, method, date_time, crc, compressed, size, create_system, external_attr):
+        name_bytes = name.encode('utf-8')
+        if not name.isascii():
+            flags |= ZIP_UTF8_NAME
+        if self.offset + len(compressed) + len(name_bytes) + LOCAL_HEADER.size > ZIP_MAX_OFFSET:
+            raise zipfile.LargeZipFile("package too large for a zip without zip64")
+        dos_time, dos_date = _dos_date_time(date_time)
+        fields = (flags, method, dos_time, dos_date, crc, len(compressed), size)
+        self.f.write(LOCAL_HEADER.pack(b'PK\x03\x04', ZIP_VERSION, *fields, len(name_bytes), 0))
+        self.f.write(name_bytes)
+        self.f.write(compressed)
+        self.central.append(CENTRAL_HEADER.pack(b'PK\x01\x02', (create_system << 8) | ZIP_VERSION, ZIP_VERSION,
+                                                *fields, len(name_bytes), 0, 0, 0, 0, external_attr, self.offset)
+                            + name_bytes)
+        self.offset += LOCAL_HEADER.size + len(name_bytes) + len(compressed)
+
+    def writestr(self, name, data):
+        """Add an entry holding data, deflated like ZipFile.writestr() does"""
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        self._write(name, 0, zipfile.ZIP_DEFLATED, time.localtime()[:6], zlib.crc32(data), compressed,
+                    len(data), 3, 0o600 << 16)
+
+    def copy(self, raw, info):
+        """Add entry info of the zip file object raw, without inflating it"""
+        raw.seek(info.header_offset)
+        header = raw.read(LOCAL_HEADER.size)
+        if len(header) < LOCAL_HEADER.size or header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"bad local header for {info.filename}")
+        name_length, extra_length = LOCAL_HEADER.unpack(header)[-2:]
+        raw.seek(name_length + extra_length, os.SEEK_CUR)
+        compressed = raw.read(info.compress_size)
+        if len(compressed) < info.compress_size:
+            raise zipfile.BadZipFile(f"truncated entry {info.filename}")
+        # CRC and sizes go in the headers written here, no data descriptor follows
+        self._write(info.filename, info.flag_bits & ~(ZIP_DATA_DESCRIPTOR | ZIP_UTF8_NAME), info.compress_type,
+                    info.date_time, info.CRC, compressed, info.file_size, info.create_system,
+                    info.external_attr)
+
+    def close(self):
+        """Write the central directory"""
+        if len(self.central) > ZIP_MAX_ENTRIES:
+            raise zipfile.LargeZipFile("too many entries for a zip without zip64")
+        directory = b''.join(self.central)
+        self.f.write(directory)
+        self.f.write(END_OF_CENTRAL_DIRECTORY.pack(b'PK\x05\x06', 0, 0, len(self.central), len(self.central),
+                                                   len(directory), self.offset, 0))
+
+
+class ZipPackage(Package):
+    """Package backed by a .pptx on disk that is only read where it is touched
+
+    save() writes the parts that were assigned and copies every other entry's
+    compressed bytes straight across, so patching a few slides of a large deck
+    costs about one file copy. Use as a context manager (the zip stays open).
+    """
+
+    @classmethod
+    def open(cls, path):
+        return cls(LazyParts(zipfile.ZipFile(path)))
+
+    def close(self):
+        self.parts.zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_to(self, f):
+        out = _ZipWriter(f)
+        with open(self.parts.zf.filename, 'rb') as raw:
+            for name in self.parts:
+                if name in self.parts.changed:
+                    out.writestr(name, self.parts[name])
+                else:
+                    out.copy(raw, self.parts.infos[name])
+        out.close()
+
+    def find_media(self, data):
+        """ppt/media part holding exactly data, or None
+
+        Untouched entries are compared on the CRC and size in the zip
+        directory first, so only real candidates are inflated.
+        """
+        crc = zlib.crc32(data)
+        for name in self.parts:
+            if not name.startswith(MEDIA_DIR):
+                continue
+            if name not in self.parts.changed:
+                info = self.parts.infos[name]
+                if info.CRC != crc or info.file_size != len(data):
+                    continue
+            if self.parts[name] == data:
+                return name
+        return None
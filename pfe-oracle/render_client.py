@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Render client
+Exports decks through the render daemon (render_daemon.py), whose browsers
+are already running, so an export takes about as long as printing the deck.
+Only the standard library is imported; when no daemon is listening the jobs
+are rendered in-process instead (the slow path: Playwright and Chromium
+start for this call), or --start launches a daemon in the background first.
+
+    python render_client.py deck.html                    # deck.pdf
+    python render_client.py deck.html --slides=3-7 --format=Letter --scale=0.8
+    python render_client.py deck.html --png --slides=12 --width=1600 --height=900
+    python render_client.py --start deck1.html deck2.html --offline
+    python render_client.py --stats
+
+Options: --output=PATH (one deck only), --png, --slides=N or N-M (1-based),
+--format=A4|Letter|..., --scale=X, --portrait / --landscape, --width=PX and
+--height=PX (PNG viewport), --offline (vendored assets, see asset_vendor.py),
+--incremental (re-print only changed slides, see incremental_pdf.py),
+--optimize (shrink the PDF afterwards, see pdf_optimizer.py).
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SOCKET_PATH = os.environ.get('PFE_RENDER_SOCKET',
+                             os.path.join(tempfile.gettempdir(), f"pfe-render-{os.getuid()}.sock"))
+
+# Where a daemon started with --start writes its output
+DAEMON_LOG = os.path.splitext(SOCKET_PATH)[0] + '.log'
+
+
+def request(message, socket_path=SOCKET_PATH, timeout=None):
+    """Send one request object to the daemon and return its response object
+
+    Raises OSError when no daemon is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2)
+        sock.connect(socket_path)
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("The render daemon closed the connection")
+    return json.loads(line)
+
+
+def is_running(socket_path=SOCKET_PATH):
+    """Whether a daemon answers on socket_path"""
+    try:
+        return request({'command': 'ping'}, socket_path, timeout=2).get('ok', False)
+    except (OSError, ValueError):
+        return False
+
+
+def start_daemon(wait=60):
+    """Launch render_daemon.py in the background and wait until it answers"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'render_daemon.py')
+    with open(DAEMON_LOG, 'ab') as log:
+        process = subprocess.Popen([sys.executable, script], stdin=subprocess.DEVNULL,
+                                   stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running():
+            return True
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    return False
+
+
+def parse_args(args):
+    """(jobs, flags) from the command line"""
+    options = {}
+    flags = set()
+    html_paths = []
+    for arg in args:
+        if not arg.startswith('--'):
+            html_paths.append(os.path.abspath(arg))
+            continue
+        name, has_value, value = arg[2:].partition('=')
+        if name in ('output', 'slides', 'format'):
+            options[name] = os.path.abspath(value) if name == 'output' else value
+        elif name == 'scale':
+            options[name] = float(value)
+        elif name in ('width', 'height'):
+            options[name] = int(value)
+        elif name == 'png' and not has_value:
+            options['type'] = 'png'
+        elif name in ('portrait', 'landscape') and not has_value:
+            options['landscape'] = name == 'landscape'
+        elif name in ('offline', 'incremental', 'optimize') and not has_value:
+            options[name] = True
+        elif name in ('start', 'stats', 'no-daemon') and not has_value:
+            flags.add(name)
+        else:
+            raise ValueError(f"Unknown option {arg}")
+
+    if 'output' in options and len(html_paths) > 1:
+        raise ValueError("--output needs a single deck")
+    return [dict(options, html=html_path) for html_path in html_paths], flags
+
+
+def main():
+    try:
+        jobs, flags = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(2)
+
+    if 'stats' in flags:
+        try:
+            print(json.dumps(request({'command': 'stats'}), indent=1))
+        except OSError:
+            print(f"No render daemon on {SOCKET_PATH}")
+            sys.exit(1)
+        return
+    if not jobs:
+        print(__doc__.strip())
+        sys.exit(2)
+
+    started = time.perf_counter()
+    response = None
+    if 'no-daemon' not in flags:
+        if 'start' in flags and not is_running() and not start_daemon():
+            print(f"⚠️  The render daemon didn't start (see {DAEMON_LOG})")
+        try:
+            response = request({'jobs': jobs})
+        except OSError:
+            pass
+    if response is None:
+        print("… no render daemon, rendering in-process (start one with: python render_daemon.py)")
+        import asyncio
+        from render_daemon import render_without_daemon
+
+        response = asyncio.run(render_without_daemon(jobs))
+
+    if 'results' not in response:
+        print(f"✗ {response.get('error')}")
+        sys.exit(1)
+    for job, result in zip(jobs, response['results']):
+        if 'error' in result:
+            print(f"✗ {os.path.basename(job['html'])}: {result['error']}")
+        else:
+            print(f"✓ {result['output']} ({result['seconds']:.2f}s)")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    if not response['ok']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
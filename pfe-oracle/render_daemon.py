@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Render daemon
+Keeps Playwright and a BrowserPool (see browser_pool.py) warm behind a Unix
+socket, so an export only pays for loading and printing the deck: no Python
+imports, no Playwright startup, no Chromium launch. render_client.py is the
+command line side; editor integrations and pre-commit hooks call that.
+
+    python render_daemon.py            # serve until Ctrl+C / SIGTERM
+    python render_daemon.py --stop     # stop a running daemon
+
+Protocol: one JSON object per line each way. A request is
+{"jobs": [job, ...]} or {"command": "ping" | "stats" | "stop"}; the jobs of
+a request render concurrently and the response lists one result per job,
+{"output": path, "seconds": s} or {"error": message}. A job:
+
+    html        absolute path of the deck (required)
+    output      .pdf or .png path (default: the deck's, with type's extension)
+    type        "pdf" or "png" (default: from output, else pdf)
+    slides      "5" or "3-7", 1-based and inclusive: print only those slides
+    incremental re-print only the slides that changed (whole-deck PDF jobs,
+                see incremental_pdf.py)
+    optimize    shrink the PDF afterwards (see pdf_optimizer.py)
+    format, landscape, scale, margin, print_background
+                page.pdf() options over convert_to_pdf.PDF_OPTIONS
+    width, height, scale
+                PNG viewport size and device scale factor
+    offline     serve external assets from the vendored store (asset_vendor.py)
+
+    PFE_RENDER_SOCKET         socket path (default: $TMPDIR/pfe-render-<uid>.sock)
+    PFE_RENDER_IDLE_TIMEOUT   exit after this many idle seconds (default: 0, never)
+"""
+
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import time
+
+from convert_to_pdf import PDF_OPTIONS, render_job
+from render_client import SOCKET_PATH, is_running, request
+
+# Request keys passed to page.pdf(); 'scale' is shared with PNG jobs
+PDF_KEYS = ('format', 'landscape', 'scale', 'margin', 'print_background')
+PNG_KEYS = ('width', 'height', 'scale')
+
+# Request lines are small, but leave room for long batches
+LINE_LIMIT = 1024 * 1024
+
+
+def parse_slides(value):
+    """'5' -> (4, 5), '3-7' -> (2, 7): a 1-based inclusive range as start/end indexes"""
+    first, _, last = str(value).partition('-')
+    start, end = int(first), int(last or first)
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid slide range {value!r}")
+    return start - 1, end
+
+
+def parse_job(job):
+    """(html path, output path, render_job() keyword arguments, offline) of a request job"""
+    known = {'html', 'output', 'type', 'slides', 'offline', 'incremental', 'optimize'}
+    known.update(PDF_KEYS, PNG_KEYS)
+    unknown = sorted(set(job) - known)
+    if unknown:
+        raise ValueError(f"Unknown job option(s): {', '.join(unknown)}")
+
+    html_path = job.get('html')
+    if not html_path or not os.path.isabs(html_path):
+        raise ValueError("'html' must be an absolute path")
+    if not os.path.exists(html_path):
+        raise FileNotFoundError(f"No such deck: {html_path}")
+
+    output_path = job.get('output')
+    kind = job.get('type') or ('png' if output_path and output_path.lower().endswith('.png') else 'pdf')
+    if kind not in ('pdf', 'png'):
+        raise ValueError(f"Unknown output type {kind!r} (expected pdf or png)")
+    output_path = output_path or f"{os.path.splitext(html_path)[0]}.{kind}"
+    if not os.path.isabs(output_path):
+        raise ValueError("'output' must be an absolute path")
+    if not output_path.lower().endswith(f".{kind}"):
+        raise ValueError(f"'output' of a {kind} job must end in .{kind}")
+    if job.get('incremental') and (kind != 'pdf' or job.get('slides')):
+        raise ValueError("'incremental' only applies to whole-deck PDF jobs")
+    if job.get('optimize') and kind != 'pdf':
+        raise ValueError("'optimize' only applies to PDF jobs")
+
+    options = {'slides': parse_slides(job['slides']) if job.get('slides') else None}
+    if kind == 'pdf':
+        options['pdf_options'] = {key: job[key] for key in PDF_KEYS if key in job}
+    else:
+        page_options = {}
+        if 'width' in job or 'height' in job:
+            page_options['viewport'] = {'width': int(job.get('width', 1280)),
+                                        'height': int(job.get('height', 720))}
+        if 'scale' in job:
+            page_options['device_scale_factor'] = float(job['scale'])
+        options['page_options'] = page_options
+    return html_path, output_path, options, bool(job.get('offline'))
+
+
+class RenderDaemon:
+    """A warm BrowserPool answering render requests on a Unix socket"""
+
+    def __init__(self, socket_path=SOCKET_PATH, idle_timeout=None):
+        self.socket_path = socket_path
+        if idle_timeout is None:
+            idle_timeout = float(os.environ.get('PFE_RENDER_IDLE_TIMEOUT') or 0)
+        self.idle_timeout = idle_timeout
+        self.started = time.monotonic()
+        self.last_active = self.started
+        self.active = 0
+        self.jobs = 0
+        self.failures = 0
+        self.pool = None
+        self._assets = None
+        self._assets_mtime = None
+        self._stopping = None
+
+    def assets(self):
+        """The vendored AssetStore, reloaded when its manifest changes"""
+        from asset_vendor import ASSET_STORE_DIR, AssetStore
+
+        try:
+            mtime = os.stat(os.path.join(ASSET_STORE_DIR, 'manifest.json')).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._assets is None or mtime != self._assets_mtime:
+            self._assets = AssetStore()
+            self._assets_mtime = mtime
+        return self._assets
+
+    async def run_job(self, job):
+        """Render one request job; returns its result object"""
+        started = time.perf_counter()
+        try:
+            html_path, output_path, options, offline = parse_job(job)
+            assets = self.assets() if offline else None
+            if job.get('incremental'):
+                from incremental_pdf import render_pdf_incremental
+
+                await render_pdf_incremental(self.pool, html_path, output_path, assets,
+                                             pdf_options=options['pdf_options'])
+            else:
+                await render_job(self.pool, html_path, output_path, assets=assets, **options)
+            if job.get('optimize'):
+                from pdf_optimizer import optimize_pdf
+
+                # pypdf and Pillow are CPU-bound; other jobs keep printing meanwhile
+                await asyncio.to_thread(optimize_pdf, output_path, output_path)
+        except Exception as e:
+            self.failures += 1
+            print(f"✗ {job.get('html')}: {e}")
+            return {'error': str(e) or type(e).__name__}
+
+        self.jobs += 1
+        seconds = time.perf_counter() - started
+        print(f"✓ {os.path.basename(output_path)} ({seconds:.2f}s)")
+        return {'output': output_path, 'seconds': round(seconds, 3)}
+
+    async def handle_request(self, message):
+        """Response object for one request object"""
+        command = message.get('command')
+        if command == 'ping':
+            return {'ok': True}
+        if command == 'stats':
+            return {'ok': True, 'jobs': self.jobs, 'failures': self.failures, 'active': self.active,
+                    'launches': self.pool.launches, 'browsers': self.pool.size,
+                    'uptime': round(time.monotonic() - self.started, 1)}
+        if command == 'stop':
+            self._stopping.set()
+            return {'ok': True}
+        if command is not None:
+            return {'ok': False, 'error': f"Unknown command {command!r}"}
+
+        jobs = message.get('jobs')
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            return {'ok': False, 'error': "Expected {\"jobs\": [...]} or {\"command\": ...}"}
+        results = await asyncio.gather(*(self.run_job(job) for job in jobs))
+        return {'ok': all('error' not in result for result in results), 'results': results}
+
+    async def handle_connection(self, reader, writer):
+        """Answer the requests of one client connection, one line each, in order"""
+        try:
+            while line := await reader.readline():
+                self.active += 1
+                try:
+                    try:
+                        message = json.loads(line)
+                        if not isinstance(message, dict):
+                            raise ValueError("a request is a JSON object")
+                    except ValueError as e:
+                        response = {'ok': False, 'error': f"Bad request: {e}"}
+                    else:
+                        response = await self.handle_request(message)
+                finally:
+                    self.active -= 1
+                    self.last_active = time.monotonic()
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # client went away or sent an oversized line
+        except asyncio.CancelledError:
+            pass  # daemon stopping while the client was idle
+        finally:
+            writer.close()
+
+    async def _watch_idle(self):
+        while not self._stopping.is_set():
+            await asyncio.sleep(min(self.idle_timeout, 5))
+            if not self.active and time.monotonic() - self.last_active >= self.idle_timeout:
+                print(f"\n💤 Idle for {self.idle_timeout:.0f}s, stopping")
+                self._stopping.set()
+
+    async def serve(self):
+        """Launch the pool, then serve until stopped (request, signal or idle timeout)"""
+        from browser_pool import BrowserPool
+
+        if is_running(self.socket_path):
+            raise RuntimeError(f"A render daemon is already listening on {self.socket_path}")
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise RuntimeError(f"{self.socket_path} exists and is not a socket")
+            os.remove(self.socket_path)  # left over by a daemon that died
+
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._stopping.set)
+
+        launch_started = time.perf_counter()
+        async with BrowserPool() as self.pool:
+            print(f"✓ {self.pool.size} browser(s) launched in {time.perf_counter() - launch_started:.1f}s")
+            # Owner-only from the moment it is bound: no window with the default umask
+            old_umask = os.umask(0o077)
+            try:
+                server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path,
+                                                         limit=LINE_LIMIT)
+            finally:
+                os.umask(old_umask)
+            print(f"🎧 Listening on {self.socket_path}")
+            watcher = asyncio.create_task(self._watch_idle()) if self.idle_timeout > 0 else None
+            try:
+                await self._stopping.wait()
+            finally:
+                if watcher:
+                    watcher.cancel()
+                server.close()
+                if os.path.exists(self.socket_path):
+                    os.remove(self.socket_path)
+                await server.wait_closed()
+        print(f"✓ Stopped after {self.jobs} job(s), {self.failures} failed")
+
+
+async def render_without_daemon(jobs):
+    """The response a daemon would give for jobs, on a pool launched for them alone"""
+    from browser_pool import BrowserPool
+
+    daemon = RenderDaemon()
+    daemon.pool = BrowserPool()
+    daemon.pool.size = max(1, min(daemon.pool.size, -(-len(jobs) // daemon.pool.pages_per_browser)))
+    async with daemon.pool:
+        return await daemon.handle_request({'jobs': jobs})
+
+
+def main():
+    if '--stop' in sys.argv[1:]:
+        try:
+            request({'command': 'stop'})
+            print("✓ Render daemon stopping")
+        except OSError:
+            print(f"No render daemon on {SOCKET_PATH}")
+        return
+
+    print("=" * 60)
+    print("Render daemon")
+    print("=" * 60)
+    print(f"\nPDF defaults: {PDF_OPTIONS['format']}, scale {PDF_OPTIONS['scale']}")
+
+    try:
+        asyncio.run(RenderDaemon().serve())
+    except RuntimeError as e:
+        print(f"\n✗ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
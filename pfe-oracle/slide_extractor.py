@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Single-pass slide extractor for the HTML presentation
+Tokenizes the document once and returns, for every slide, its classes plus
+the images it references (src, alt text and classes)
+"""
+
+import html
+import re
+from itertools import accumulate, compress, count
+
+from parse_cache import cached_parse
+
+# Bump whenever extract_slides() output changes, so cached results are re-parsed
+EXTRACTOR_VERSION = 1
+
+# One alternation scanned left to right: comments, script/style bodies and
+# raw text are skipped, only <div>, </div> and <img> tags are yielded.
+# Attribute values may contain '>' (e.g. data-notes), so quoted strings are
+# consumed as a whole.
+TAG_TOKEN = re.compile(
+    r'<!--.*?-->'
+    r'|<script\b.*?</script\s*>'
+    r'|<style\b.*?</style\s*>'
+    r'|<(/?)(div|img)\b((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Same tokens for the fast path, as one string each: '' for a plain </div>
+# (the most common tag, yielded without allocating), the tag without its '<'
+# otherwise. Attributes end at the first '>', which QUOTED_ATTRIBUTES checks.
+FAST_TOKEN = re.compile(
+    r'<(?:/div>'
+    r'|(/?(?i:div|img)\b[^>]*>'
+    r'|!--.*?-->'
+    r'|(?i:script\b.*?</script)\s*>'
+    r'|(?i:style\b.*?</style)\s*>))',
+    re.DOTALL,
+)
+QUOTED_ATTRIBUTES = re.compile(r'[^\'">]*(?:(?:"[^"]*"|\'[^\']*\')[^\'">]*)*\Z')
+ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+def parse_attributes(raw_attrs):
+    """Parse the attribute part of a tag into a dict"""
+    attrs = {}
+    for name, double_quoted, single_quoted, bare in ATTRIBUTE.findall(raw_attrs):
+        attrs.setdefault(name.lower(), html.unescape(double_quoted or single_quoted or bare))
+    return attrs
+
+
+class _QuotedBracket(Exception):
+    """A tag with '>' inside a quoted attribute value: FAST_TOKEN cut it short"""
+
+
+class _DepthChanges(dict):
+    """FAST_TOKEN token -> change of <div> depth, worked out once per distinct token
+
+    Along the way, .tags maps every <div> carrying attributes to its classes
+    and every <img> to None (its attributes are parsed if a slide shows it).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tags = {}
+
+    def __missing__(self, token):
+        if not token:
+            change = -1  # </div>
+        else:
+            is_end = token[0] == '/'
+            name = token[is_end:is_end + 3].lower()
+            raw_attrs = token[is_end + 3:-1]
+            if name not in ('div', 'img'):
+                change = 0  # comment, script or style
+            elif not QUOTED_ATTRIBUTES.match(raw_attrs):
+                raise _QuotedBracket(token)
+            elif is_end:
+                change = -1 if name == 'div' else 0
+            elif name == 'img':
+                self.tags[token] = None
+                change = 0
+            elif raw_attrs.rstrip().endswith('/'):
+                change = 0  # <div/> never opens a block
+            else:
+                if raw_attrs.strip():
+                    self.tags[token] = parse_attributes(raw_attrs).get('class', '').split()
+                change = 1
+        self[token] = change
+        return change
+
+
+def extract_slides(html_content):
+    """Extract per-slide classes and image references in one pass over the HTML
+
+    <div> nesting is tracked so a slide ends at its own closing tag, not at the
+    first nested </div>. Each slide is returned as a dict:
+
+        {'number': 1, 'classes': [...], 'content_classes': set(...),
+         'images': [{'src': ..., 'alt': ..., 'classes': [...],
+                     'in_image_container': bool}]}
+    """
+    tokens = FAST_TOKEN.findall(html_content)
+    changes = _DepthChanges()
+    try:
+        # Depth after each token; a block ends at the first token back below it
+        depths = list(accumulate(map(changes.__getitem__, tokens)))
+    except _QuotedBracket:
+        return _extract_slides_by_tag(html_content)
+
+    tags = changes.tags
+    images = {}
+    watched = {token for token, classes in tags.items()
+               if classes is None or 'slide' in classes or 'image-container' in classes}
+    slides = []
+    current = None
+    slide_end = container_end = -1
+
+    for idx in compress(count(), map(watched.__contains__, tokens)):
+        token = tokens[idx]
+        classes = tags[token]
+        if idx > slide_end:
+            if classes is None or 'slide' not in classes:
+                continue  # outside slides
+            try:
+                slide_end = depths.index(depths[idx] - 1, idx)
+            except ValueError:
+                slide_end = len(tokens)  # unterminated last slide (truncated document)
+            content_classes = set()
+            for inner in tags.keys() & set(tokens[idx + 1:slide_end]):
+                inner_classes = tags[inner]
+                if inner_classes is None:
+                    if inner not in images:
+                        images[inner] = parse_attributes(inner[3:-1])
+                    inner_classes = images[inner].get('class', '').split()
+                content_classes.update(inner_classes)
+            current = {
+                'number': len(slides) + 1,
+                'classes': list(classes),
+                'content_classes': content_classes,
+                'images': [],
+            }
+            slides.append(current)
+            container_end = -1
+        elif classes is None:
+            attrs = images[token]
+            current['images'].append({
+                'src': attrs.get('src', ''),
+                'alt': attrs.get('alt', ''),
+                'classes': attrs.get('class', '').split(),
+                'in_image_container': idx < container_end,
+            })
+        elif 'image-container' in classes and idx > container_end:
+            try:
+                container_end = depths.index(depths[idx] - 1, idx)
+            except ValueError:
+                container_end = len(tokens)
+
+    return slides
+
+
+def _extract_slides_by_tag(html_content):
+    """extract_slides() walking TAG_TOKEN matches, for documents FAST_TOKEN can't split"""
+    slides = []
+    current = None
+    div_depth = 0
+    slide_depth = None
+    container_depths = []
+
+    for match in TAG_TOKEN.finditer(html_content):
+        tag = match.group(2)
+        if tag is None:
+            continue  # comment, script or style
+        tag = tag.lower()
+        is_end = bool(match.group(1))
+
+        if tag == 'div' and is_end:
+            if div_depth == 0:
+                continue
+            if container_depths and container_depths[-1] == div_depth:
+                container_depths.pop()
+            if current is not None and div_depth == slide_depth:
+                slides.append(current)
+                current = None
+                slide_depth = None
+            div_depth -= 1
+            continue
+
+        if is_end:
+            continue
+
+        raw_attrs = match.group(3)
+        if current is None and tag == 'div' and 'slide' not in raw_attrs:
+            # Fast path outside slides: only the depth matters
+            if not raw_attrs.rstrip().endswith('/'):
+                div_depth += 1
+            continue
+
+        attrs = parse_attributes(raw_attrs)
+        classes = attrs.get('class', '').split()
+
+        if tag == 'div':
+            if raw_attrs.rstrip().endswith('/'):
+                continue  # <div/> never opens a block
+            div_depth += 1
+
+            if current is None:
+                if 'slide' in classes:
+                    current = {
+                        'number': len(slides) + 1,
+                        'classes': classes,
+                        'content_classes': set(),
+                        'images': [],
+                    }
+                    slide_depth = div_depth
+                continue
+
+            if 'image-container' in classes:
+                container_depths.append(div_depth)
+            current['content_classes'].update(classes)
+
+        elif current is not None:
+            current['content_classes'].update(classes)
+            current['images'].append({
+                'src': attrs.get('src', ''),
+                'alt': attrs.get('alt', ''),
+                'classes': classes,
+                'in_image_container': bool(container_depths),
+            })
+
+    # Unterminated last slide (truncated document) is still a slide
+    if current is not None:
+        slides.append(current)
+
+    return slides
+
+
+def extract_slides_from_file(html_path):
+    """Read an HTML file and extract its slides"""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        return extract_slides(f.read())
+
+
+def load_slides(html_path):
+    """Slides of html_path, served from the parse cache when the file is unchanged"""
+    return cached_parse(html_path, 'slide_extractor', EXTRACTOR_VERSION, extract_slides)
+
+
+def main():
+    html_path = '/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/presentation.html'
+    slides = extract_slides_from_file(html_path)
+
+    image_count = sum(len(slide['images']) for slide in slides)
+    print(f"Found {len(slides)} slides with {image_count} image references")
+    for slide in slides:
+        for image in slide['images']:
+            print(f"  Slide {slide['number']}: {image['src']} ({image['alt']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Compact slide intermediate representation
+Slides are extracted once from the parse tree into small __slots__ dataclasses
+that hold only strings and lists, so the tree can be dropped right away and
+slides pickle cheaply (e.g. to send them to worker processes)
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+from class_index import ClassIndex
+from parse_cache import cached_parse
+
+# Bump whenever the IR classes or extract_slide() change, so cached decks are re-parsed
+IR_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Content nodes
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class ImageRef:
+    """<img> reference: src exactly as written in the HTML plus alt text"""
+    src: str
+    alt: str = ''
+
+
+@dataclass(slots=True)
+class ImageContainer:
+    """div.image-container"""
+    image: Optional[ImageRef] = None
+
+
+@dataclass(slots=True)
+class Card:
+    """div.card with its div.card-title / div.card-content text"""
+    title: Optional[str] = None
+    content: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CardGrid:
+    """div.card-grid"""
+    cards: List[Card] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class BulletItem:
+    """Top-level <li> of a bullet list
+
+    text is the full item text (nested lists included); lead_text is the raw
+    text of the item without its nested lists.
+    """
+    text: str
+    lead_text: str
+
+
+@dataclass(slots=True)
+class BulletList:
+    """ul.bullet-list"""
+    items: List[BulletItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class HighlightBox:
+    """div.highlight-box; title is its <h3>, text the whole box text"""
+    text: str
+    title: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ToolItem:
+    """div.tool-item inside a tool grid"""
+    name: Optional[str] = None
+    image: Optional[ImageRef] = None
+
+
+@dataclass(slots=True)
+class ToolGrid:
+    """div.tool-grid"""
+    tools: List[ToolItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Column:
+    """One direct <div> child of a two-column block"""
+    bullet_list: Optional[BulletList] = None
+    cards: List[Card] = field(default_factory=list)
+    highlight_box: Optional[HighlightBox] = None
+    image_container: Optional[ImageContainer] = None
+    has_image: bool = False
+
+
+@dataclass(slots=True)
+class TwoColumn:
+    """div.two-column"""
+    columns: List[Column] = field(default_factory=list)
+
+
+# ---------------------------------------------------------------------------
+# Slide nodes
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class TitleSlide:
+    """div.slide.title-slide"""
+    number: int
+    classes: List[str]
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    author: Optional[str] = None
+    logos: List[ImageRef] = field(default_factory=list)
+
+    kind = 'title'
+
+
+@dataclass(slots=True)
+class DividerSlide:
+    """div.slide.divider-slide"""
+    number: int
+    classes: List[str]
+    title: Optional[str] = None
+
+    kind = 'divider'
+
+
+@dataclass(slots=True)
+class FullImageSlide:
+    """div.slide.full-image-slide"""
+    number: int
+    classes: List[str]
+    title: Optional[str] = None
+    image: Optional[ImageRef] = None
+
+    kind = 'full-image'
+
+
+@dataclass(slots=True)
+class ContentSlide:
+    """div.slide.content-slide (and any slide without a more specific type)
+
+    Each construct field holds the first matching element anywhere inside
+    div.slide-content, mirroring how the renderers look them up. text is the
+    whole slide-content text, or None when the slide has no slide-content.
+    """
+    number: int
+    classes: List[str]
+    title: Optional[str] = None
+    text: Optional[str] = None
+    bullet_list: Optional[BulletList] = None
+    card_grid: Optional[CardGrid] = None
+    two_column: Optional[TwoColumn] = None
+    tool_grid: Optional[ToolGrid] = None
+    highlight_box: Optional[HighlightBox] = None
+    image_container: Optional[ImageContainer] = None
+    image: Optional[ImageRef] = None
+
+    kind = 'content'
+
+
+def iter_image_refs(node):
+    """Yield every ImageRef reachable from an IR node (or list of nodes)"""
+    if isinstance(node, ImageRef):
+        yield node
+    elif isinstance(node, list):
+        for item in node:
+            yield from iter_image_refs(item)
+    elif hasattr(type(node), '__dataclass_fields__'):
+        for name in type(node).__dataclass_fields__:
+            yield from iter_image_refs(getattr(node, name))
+
+
+# ---------------------------------------------------------------------------
+# Extraction from BeautifulSoup
+# ---------------------------------------------------------------------------
+# All lookups go through a ClassIndex built in one pass over the document (or
+# over the slide in streaming mode) instead of re-walking subtrees with find().
+
+def _text(elem, separator=''):
+    """Stripped text of an element, or None if the element is missing"""
+    if elem is None:
+        return None
+    return elem.get_text(separator=separator).strip()
+
+
+def _image_ref(img):
+    if img is None:
+        return None
+    return ImageRef(src=img.get('src', ''), alt=img.get('alt', ''))
+
+
+def _card(index, card):
+    return Card(
+        title=_text(index.find('div', 'card-title', within=card)),
+        content=_text(index.find('div', 'card-content', within=card)),
+    )
+
+
+def _bullet_list(ul):
+    if ul is None:
+        return None
+
+    items = []
+    for li in ul.find_all('li', recursive=False):
+        lead_text = ""
+        for child in li.children:
+            if child.name is None:  # Text node
+                lead_text += child
+            elif child.name != 'ul':
+                lead_text += child.get_text()
+        items.append(BulletItem(text=li.get_text().strip(), lead_text=lead_text))
+
+    return BulletList(items=items)
+
+
+def _highlight_box(index, box):
+    if box is None:
+        return None
+    return HighlightBox(text=_text(box), title=_text(index.find('h3', within=box)))
+
+
+def _image_container(index, container):
+    if container is None:
+        return None
+    return ImageContainer(image=_image_ref(index.find('img', within=container)))
+
+
+def _tool_grid(index, grid):
+    if grid is None:
+        return None
+    return ToolGrid(tools=[
+        ToolItem(name=_text(index.find('div', 'tool-name', within=tool)),
+                 image=_image_ref(index.find('img', within=tool)))
+        for tool in index.find_all('div', 'tool-item', within=grid)
+    ])
+
+
+def _two_column(index, block):
+    if block is None:
+        return None
+
+    columns = []
+    for column in block.find_all(['div'], recursive=False):
+        columns.append(Column(
+            bullet_list=_bullet_list(index.find('ul', 'bullet-list', within=column)),
+            cards=[_card(index, card) for card in index.find_all('div', 'card', within=column)],
+            highlight_box=_highlight_box(index, index.find('div', 'highlight-box', within=column)),
+            image_container=_image_container(index, index.find('div', 'image-container', within=column)),
+            has_image=index.find('img', within=column) is not None,
+        ))
+
+    return TwoColumn(columns=columns)
+
+
+def extract_slide(slide, number, index=None):
+    """Convert one div.slide Tag into its IR node
+
+    index is a ClassIndex covering the slide (typically the whole document's);
+    one is built for the slide alone when omitted.
+    """
+    if index is None:
+        index = ClassIndex(slide)
+
+    classes = list(slide.get('class', []))
+
+    if 'title-slide' in classes:
+        logo_container = index.find('div', 'logo-container', within=slide)
+        logos = [_image_ref(img) for img in index.find_all('img', within=logo_container)] if logo_container else []
+        return TitleSlide(
+            number=number,
+            classes=classes,
+            title=_text(index.find('h1', 'main-title', within=slide), separator='\n'),
+            subtitle=_text(index.find('p', 'subtitle', within=slide)),
+            author=_text(index.find('div', 'author-info', within=slide), separator='\n'),
+            logos=logos,
+        )
+
+    if 'divider-slide' in classes:
+        return DividerSlide(
+            number=number,
+            classes=classes,
+            title=_text(index.find('h2', 'divider-title', within=slide)),
+        )
+
+    title = _text(index.find('h2', 'slide-title', within=slide))
+
+    if 'full-image-slide' in classes:
+        return FullImageSlide(
+            number=number,
+            classes=classes,
+            title=title,
+            image=_image_ref(index.find('img', within=slide)),
+        )
+
+    content = index.find('div', 'slide-content', within=slide)
+    if content is None:
+        return ContentSlide(number=number, classes=classes, title=title)
+
+    card_grid = index.find('div', 'card-grid', within=content)
+
+    return ContentSlide(
+        number=number,
+        classes=classes,
+        title=title,
+        text=_text(content),
+        bullet_list=_bullet_list(index.find('ul', 'bullet-list', within=content)),
+        card_grid=CardGrid(cards=[_card(index, card) for card in index.find_all('div', 'card', within=card_grid)]) if card_grid else None,
+        two_column=_two_column(index, index.find('div', 'two-column', within=content)),
+        tool_grid=_tool_grid(index, index.find('div', 'tool-grid', within=content)),
+        highlight_box=_highlight_box(index, index.find('div', 'highlight-box', within=content)),
+        image_container=_image_container(index, index.find('div', 'image-container', within=content)),
+        image=_image_ref(index.find('img', within=content)),
+    )
+
+
+def extract_deck(html_content):
+    """Parse the presentation HTML and return the IR of every slide in #slides-container"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    index = ClassIndex(soup)
+    slides_container = soup.find('div', id='slides-container')
+    slides = [slide for slide in slides_container.find_all('div', recursive=False)
+              if 'slide' in slide.get('class', [])]
+
+    deck = [extract_slide(slide, idx, index) for idx, slide in enumerate(slides, 1)]
+    soup.decompose()
+    return deck
+
+
+def extract_deck_from_file(html_path):
+    """Read an HTML file and return the IR of its slides"""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        return extract_deck(f.read())
+
+
+def load_deck(html_path):
+    """IR of html_path, served from the parse cache when the file is unchanged"""
+    return cached_parse(html_path, 'slide_ir', IR_VERSION, extract_deck)
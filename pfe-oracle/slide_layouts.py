@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Custom slide layouts
+Adds slide layouts to a python-pptx Presentation from raw XML so chrome that
+every slide of a kind repeats (background, title styling, decorations) lives
+once on the layout and slides only carry their own content
+"""
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.parts.slide import SlideLayoutPart
+
+from ooxml_shapes import NAMESPACES
+
+LAYOUT_TEMPLATE = (
+    '<p:sldLayout {namespaces} preserve="1" userDrawn="1">'
+    '<p:cSld name="{name}">{background}'
+    '<p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>{shapes}</p:spTree>'
+    '</p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'
+)
+
+# Insets are python-pptx's textbox defaults, so text sits where add_textbox() put it
+TITLE_PLACEHOLDER_TEMPLATE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="Title {index}"/>'
+    '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr><p:ph type="title"/></p:nvPr></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="{wrap}" lIns="91440" tIns="45720" rIns="91440" bIns="45720" anchor="t">'
+    '<a:spAutoFit/></a:bodyPr>'
+    '<a:lstStyle><a:lvl1pPr algn="{align}"><a:lnSpc><a:spcPct val="100000"/></a:lnSpc>{font}</a:lvl1pPr></a:lstStyle>'
+    '<a:p><a:r><a:rPr lang="en-US"/><a:t>Click to edit title</a:t></a:r></a:p></p:txBody></p:sp>'
+)
+
+
+def background(fill):
+    """<p:bg> for a solid or gradient fill (see ooxml_shapes.solid_fill / gradient_fill)"""
+    return f'<p:bg><p:bgPr>{fill}<a:effectLst/></p:bgPr></p:bg>'
+
+
+def title_placeholder(shape_id, x, y, cx, cy, font, align='l', word_wrap=False):
+    """Title placeholder styled like a textbox; font is an <a:defRPr> (ooxml_shapes.font)"""
+    return TITLE_PLACEHOLDER_TEMPLATE.format(
+        id=shape_id, index=shape_id - 1, x=int(x), y=int(y), cx=int(cx), cy=int(cy),
+        wrap='square' if word_wrap else 'none', align=align, font=font)
+
+
+def add_slide_layout(prs, name, background_xml='', shapes_xml=''):
+    """Append a layout to the presentation's first slide master and return it"""
+    master = prs.slide_master
+    package = prs.part.package
+
+    partname = package.next_partname('/ppt/slideLayouts/slideLayout%d.xml')
+    element = parse_xml(LAYOUT_TEMPLATE.format(
+        namespaces=NAMESPACES, name=name, background=background_xml, shapes=shapes_xml))
+    layout_part = SlideLayoutPart(partname, CT.PML_SLIDE_LAYOUT, package, element)
+    layout_part.relate_to(master.part, RT.SLIDE_MASTER)
+    rId = master.part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+
+    # Layout ids share one number space with the slide master ids
+    layout_id_lst = master._element.get_or_add_sldLayoutIdLst()
+    used_ids = [int(layout_id.get('id')) for layout_id in layout_id_lst]
+    used_ids += [int(master_id.get('id')) for master_id in prs._element.sldMasterIdLst]
+    layout_id = layout_id_lst._add_sldLayoutId(rId=rId)
+    layout_id.set('id', str(max(used_ids) + 1))
+
+    return prs.slide_layouts[len(layout_id_lst) - 1]
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time Tailwind for the HTML decks
+The Tailwind CDN <script> scans the DOM and generates CSS on every page load.
+compile_css() does the same once, in Python: every token of the document is a
+candidate (as with Tailwind's content scanner, so classes built in scripts
+count too), candidates are resolved against the utility table below (Tailwind
+v3 default theme) and the matching rules are emitted after the preflight
+reset, ordered like Tailwind's core plugins so conflicting utilities resolve
+the same way. inline_static_css() swaps the CDN script for that stylesheet.
+
+Covered: layout, flex/grid, spacing, sizing, borders, colors, typography,
+shadows, plus the sm/md/lg/xl/2xl, hover/focus and print variants. Decks with
+a tailwind.config or <style type="text/tailwindcss"> are refused.
+
+    python tailwind_static.py FINAL_PRESENTATION_COMPLETE.html
+"""
+
+import os
+import re
+import sys
+
+# Tailwind v3 preflight (the CDN's base reset), minified
+PREFLIGHT = """\
+*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}
+::before,::after{--tw-content:''}
+html,:host{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji";font-feature-settings:normal;font-variation-settings:normal;-webkit-tap-highlight-color:transparent}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+abbr:where([title]){-webkit-text-decoration:underline dotted;text-decoration:underline dotted}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace;font-feature-settings:normal;font-variation-settings:normal;font-size:1em}
+small{font-size:80%}
+sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}
+sub{bottom:-0.25em}
+sup{top:-0.5em}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,input:where([type='button']),input:where([type='reset']),input:where([type='submit']){-webkit-appearance:button;background-color:transparent;background-image:none}
+:-moz-focusring{outline:auto}
+:-moz-ui-invalid{box-shadow:none}
+progress{vertical-align:baseline}
+::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}
+[type='search']{-webkit-appearance:textfield;outline-offset:-2px}
+::-webkit-search-decoration{-webkit-appearance:none}
+::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}
+summary{display:list-item}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+fieldset{margin:0;padding:0}
+legend{padding:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+dialog{padding:0}
+textarea{resize:vertical}
+input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}
+button,[role="button"]{cursor:pointer}
+:disabled{cursor:default}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]:where(:not([hidden="until-found"])){display:none}
+"""
+
+CDN_SCRIPT = re.compile(r'<script\b[^>]*\bsrc\s*=\s*["\']https?://cdn\.tailwindcss\.com[^"\']*["\'][^>]*>\s*</script>\s*', re.I)
+# Things only the in-browser compiler understands
+UNSUPPORTED_SETUP = re.compile(r'tailwind\.config\s*=|type\s*=\s*["\']text/tailwindcss["\']', re.I)
+
+# Every run of characters that could be a class name (Tailwind's default extractor, simplified)
+CANDIDATE = re.compile(r'[^<>"\'`\s=;{}()]*[^<>"\'`\s=;{}():.,]')
+
+SPACING = {'0': '0px', 'px': '1px'}
+SPACING.update({key: f"{float(key) / 4:g}rem" for key in (
+    '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+    '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56', '60', '64', '72', '80', '96')})
+
+COLORS = {
+    'slate': ['#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8', '#64748b', '#475569', '#334155', '#1e293b', '#0f172a', '#020617'],
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827', '#030712'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'],
+    'orange': ['#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316', '#ea580c', '#c2410c', '#9a3412', '#7c2d12', '#431407'],
+    'yellow': ['#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12', '#422006'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'],
+    'teal': ['#f0fdfa', '#ccfbf1', '#99f6e4', '#5eead4', '#2dd4bf', '#14b8a6', '#0d9488', '#0f766e', '#115e59', '#134e4a', '#042f2e'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'],
+    'indigo': ['#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81', '#1e1b4b'],
+    'purple': ['#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87', '#3b0764'],
+}
+SHADES = ['50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950']
+PALETTE = {f"{name}-{shade}": value for name, values in COLORS.items() for shade, value in zip(SHADES, values)}
+PALETTE.update({'white': '#fff', 'black': '#000', 'transparent': 'transparent',
+                'current': 'currentColor', 'inherit': 'inherit'})
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+FONT_WEIGHTS = {'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+                'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji"',
+    'serif': 'ui-serif,Georgia,Cambria,"Times New Roman",Times,serif',
+    'mono': 'ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace',
+}
+LINE_HEIGHTS = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+LINE_HEIGHTS.update({str(n): f"{n / 4:g}rem" for n in range(3, 11)})
+LETTER_SPACING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em',
+                  'wide': '0.025em', 'wider': '0.05em', 'widest': '0.1em'}
+RADII = {'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+         'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+MAX_WIDTHS = {'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+              '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+              '7xl': '80rem', 'full': '100%', 'min': 'min-content', 'max': 'max-content',
+              'fit': 'fit-content', 'prose': '65ch'}
+BREAKPOINTS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+PSEUDO_VARIANTS = {'hover': ':hover', 'focus': ':focus', 'active': ':active', 'first': ':first-child',
+                   'last': ':last-child'}
+
+SIDES = {'t': ['top'], 'r': ['right'], 'b': ['bottom'], 'l': ['left'],
+         'x': ['left', 'right'], 'y': ['top', 'bottom'], '': ['']}
+
+
+def _size(value, extra=None):
+    """Spacing, fraction, arbitrary ([12px]) or extra keyword value, or None"""
+    if value in SPACING:
+        return SPACING[value]
+    if extra and value in extra:
+        return extra[value]
+    fraction = re.fullmatch(r'(\d+)/(\d+)', value)
+    if fraction and int(fraction.group(2)):
+        percent = f"{int(fraction.group(1)) / int(fraction.group(2)) * 100:.6f}".rstrip('0').rstrip('.')
+        return f"{percent}%"
+    if value.startswith('[') and value.endswith(']') and len(value) > 2:
+        return value[1:-1].replace('_', ' ')
+    return None
+
+
+def _sided(properties, value, sides):
+    """Declarations of properties (with '{}' for the side) for each side"""
+    return '; '.join(prop.format(f"-{side}" if side else '') + f": {value}"
+                     for side in sides for prop in properties)
+
+
+def _spacing_family(prefix, css_property, sides, negative=True, extra=None):
+    """Resolver for m-4, mx-auto, -mt-2 style utilities of one side group"""
+    pattern = re.compile(rf'(-?){prefix}({"|".join(sides)})-(.+)')
+
+    def resolve(name):
+        match = pattern.fullmatch(name)
+        if not match:
+            return None
+        sign, side, value = match.groups()
+        size = _size(value, extra)
+        if size is None or (sign and (not negative or size in ('auto', '0px'))):
+            return None
+        return _sided([css_property], f"-{size}" if sign else size, SIDES[side])
+    return resolve
+
+
+def _keyword(mapping):
+    return lambda name: mapping.get(name)
+
+
+def _prefixed(prefix, css_property, values, template='{}'):
+    def resolve(name):
+        if not name.startswith(prefix):
+            return None
+        value = values(name[len(prefix):]) if callable(values) else values.get(name[len(prefix):])
+        return f"{css_property}: {template.format(value)}" if value is not None else None
+    return resolve
+
+
+def _inset(name):
+    match = re.fullmatch(r'(-?)(inset|inset-x|inset-y|top|right|bottom|left)-(.+)', name)
+    if not match:
+        return None
+    sign, prop, value = match.groups()
+    size = _size(value, {'auto': 'auto', 'full': '100%'})
+    if size is None or (sign and size == 'auto'):
+        return None
+    size = f"-{size}" if sign else size
+    sides = {'inset': ['top', 'right', 'bottom', 'left'], 'inset-x': ['left', 'right'],
+             'inset-y': ['top', 'bottom']}.get(prop, [prop])
+    return '; '.join(f"{side}: {size}" for side in sides)
+
+
+def _space(name):
+    """space-x-4 / space-y-4: a (selector suffix, declarations) pair"""
+    match = re.fullmatch(r'space-(x|y)-(.+)', name)
+    size = _size(match.group(2)) if match else None
+    if size is None:
+        return None
+    start, end = ('left', 'right') if match.group(1) == 'x' else ('top', 'bottom')
+    return (' > :not([hidden]) ~ :not([hidden])', f"margin-{end}: 0px; margin-{start}: {size}")
+
+
+def _border_width(sides):
+    pattern = re.compile(rf'border({"|".join("-" + side for side in sides if side)}|)(?:-(0|2|4|8))?')
+
+    def resolve(name):
+        match = pattern.fullmatch(name)
+        if not match:
+            return None
+        side, width = match.groups()
+        return _sided(['border{}-width'], f"{width or 1}px", SIDES[side.lstrip('-')])
+    return resolve
+
+
+def _rounded(name):
+    match = re.fullmatch(r'rounded(?:-(t|r|b|l))?(?:-(none|sm|md|lg|xl|2xl|3xl|full))?', name)
+    if not match:
+        return None
+    side, size = match.groups()
+    corners = {None: [''], 't': ['-top-left', '-top-right'], 'r': ['-top-right', '-bottom-right'],
+               'b': ['-bottom-right', '-bottom-left'], 'l': ['-top-left', '-bottom-left']}[side]
+    return '; '.join(f"border{corner}-radius: {RADII[size or '']}" for corner in corners)
+
+
+def _font_size(name):
+    size = FONT_SIZES.get(name[len('text-'):]) if name.startswith('text-') else None
+    if size is None:
+        return None
+    return f"font-size: {size[0]}; line-height: {size[1]}"
+
+
+def _color(prefix, css_property):
+    return _prefixed(prefix, css_property, PALETTE)
+
+
+def _shadow(name):
+    if name == 'shadow' or name.startswith('shadow-'):
+        value = SHADOWS.get(name[len('shadow-'):] if name != 'shadow' else '')
+        if value is not None:
+            return f"box-shadow: {value}"
+    return None
+
+
+# Ordered like Tailwind's core plugins: later entries win conflicts
+UTILITIES = [
+    _keyword({'static': 'position: static', 'fixed': 'position: fixed', 'absolute': 'position: absolute',
+              'relative': 'position: relative', 'sticky': 'position: sticky'}),
+    _inset,
+    _prefixed('z-', 'z-index', {str(n): str(n) for n in (0, 10, 20, 30, 40, 50)} | {'auto': 'auto'}),
+    _prefixed('col-span-', 'grid-column', {str(n): f"span {n} / span {n}" for n in range(1, 13)}
+              | {'full': '1 / -1'}),
+    _spacing_family('m', 'margin{}', [''], extra={'auto': 'auto'}),
+    _spacing_family('m', 'margin{}', ['x', 'y'], extra={'auto': 'auto'}),
+    _spacing_family('m', 'margin{}', ['t', 'r', 'b', 'l'], extra={'auto': 'auto'}),
+    _keyword({'block': 'display: block', 'inline-block': 'display: inline-block', 'inline': 'display: inline',
+              'flex': 'display: flex', 'inline-flex': 'display: inline-flex', 'table': 'display: table',
+              'grid': 'display: grid', 'inline-grid': 'display: inline-grid', 'contents': 'display: contents',
+              'list-item': 'display: list-item', 'hidden': 'display: none'}),
+    _prefixed('h-', 'height', lambda v: _size(v, {'auto': 'auto', 'full': '100%', 'screen': '100vh',
+                                                  'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'})),
+    _prefixed('max-h-', 'max-height', lambda v: _size(v, {'none': 'none', 'full': '100%', 'screen': '100vh'})),
+    _prefixed('min-h-', 'min-height', {'0': '0px', 'full': '100%', 'screen': '100vh'}),
+    _prefixed('w-', 'width', lambda v: _size(v, {'auto': 'auto', 'full': '100%', 'screen': '100vw',
+                                                 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'})),
+    _prefixed('min-w-', 'min-width', {'0': '0px', 'full': '100%'}),
+    _prefixed('max-w-', 'max-width', MAX_WIDTHS),
+    _keyword({'flex-1': 'flex: 1 1 0%', 'flex-auto': 'flex: 1 1 auto', 'flex-initial': 'flex: 0 1 auto',
+              'flex-none': 'flex: none'}),
+    _keyword({'flex-shrink-0': 'flex-shrink: 0', 'flex-shrink': 'flex-shrink: 1',
+              'shrink-0': 'flex-shrink: 0', 'shrink': 'flex-shrink: 1'}),
+    _keyword({'flex-grow-0': 'flex-grow: 0', 'flex-grow': 'flex-grow: 1', 'grow-0': 'flex-grow: 0', 'grow': 'flex-grow: 1'}),
+    _keyword({'cursor-pointer': 'cursor: pointer', 'cursor-default': 'cursor: default'}),
+    _keyword({'list-inside': 'list-style-position: inside', 'list-outside': 'list-style-position: outside'}),
+    _keyword({'list-disc': 'list-style-type: disc', 'list-decimal': 'list-style-type: decimal',
+              'list-none': 'list-style-type: none'}),
+    _prefixed('grid-cols-', 'grid-template-columns', {str(n): f"repeat({n}, minmax(0, 1fr))" for n in range(1, 13)}
+              | {'none': 'none'}),
+    _keyword({'flex-row': 'flex-direction: row', 'flex-row-reverse': 'flex-direction: row-reverse',
+              'flex-col': 'flex-direction: column', 'flex-col-reverse': 'flex-direction: column-reverse'}),
+    _keyword({'flex-wrap': 'flex-wrap: wrap', 'flex-wrap-reverse': 'flex-wrap: wrap-reverse',
+              'flex-nowrap': 'flex-wrap: nowrap'}),
+    _keyword({'items-start': 'align-items: flex-start', 'items-end': 'align-items: flex-end',
+              'items-center': 'align-items: center', 'items-baseline': 'align-items: baseline',
+              'items-stretch': 'align-items: stretch'}),
+    _keyword({'justify-start': 'justify-content: flex-start', 'justify-end': 'justify-content: flex-end',
+              'justify-center': 'justify-content: center', 'justify-between': 'justify-content: space-between',
+              'justify-around': 'justify-content: space-around', 'justify-evenly': 'justify-content: space-evenly'}),
+    _prefixed('gap-', 'gap', _size),
+    _prefixed('gap-x-', 'column-gap', _size),
+    _prefixed('gap-y-', 'row-gap', _size),
+    _space,
+    _keyword({f"overflow{axis}-{value}": f"overflow{axis}: {value}"
+              for axis in ('', '-x', '-y') for value in ('auto', 'hidden', 'clip', 'visible', 'scroll')}),
+    _keyword({'truncate': 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap'}),
+    _keyword({f"whitespace-{value}": f"white-space: {value}"
+              for value in ('normal', 'nowrap', 'pre', 'pre-line', 'pre-wrap')}),
+    _rounded,
+    _border_width(['']),
+    _border_width(['x', 'y']),
+    _border_width(['t', 'r', 'b', 'l']),
+    _keyword({f"border-{style}": f"border-style: {style}" for style in ('solid', 'dashed', 'dotted', 'double', 'none')}),
+    _color('border-', 'border-color'),
+    _color('bg-', 'background-color'),
+    _keyword({f"object-{fit}": f"object-fit: {fit}" for fit in ('contain', 'cover', 'fill', 'none', 'scale-down')}),
+    _spacing_family('p', 'padding{}', [''], negative=False),
+    _spacing_family('p', 'padding{}', ['x', 'y'], negative=False),
+    _spacing_family('p', 'padding{}', ['t', 'r', 'b', 'l'], negative=False),
+    _keyword({f"text-{align}": f"text-align: {align}" for align in ('left', 'center', 'right', 'justify')}),
+    _prefixed('font-', 'font-family', FONT_FAMILIES),
+    _font_size,
+    _prefixed('font-', 'font-weight', FONT_WEIGHTS),
+    _keyword({'uppercase': 'text-transform: uppercase', 'lowercase': 'text-transform: lowercase',
+              'capitalize': 'text-transform: capitalize', 'normal-case': 'text-transform: none'}),
+    _keyword({'italic': 'font-style: italic', 'not-italic': 'font-style: normal'}),
+    _prefixed('leading-', 'line-height', LINE_HEIGHTS),
+    _prefixed('tracking-', 'letter-spacing', LETTER_SPACING),
+    _color('text-', 'color'),
+    _keyword({'underline': 'text-decoration-line: underline', 'line-through': 'text-decoration-line: line-through',
+              'no-underline': 'text-decoration-line: none'}),
+    _prefixed('opacity-', 'opacity', {str(n): f"{n / 100:g}" for n in (0, 5, 10, 20, 25, 30, 40, 50, 60, 70, 75, 80, 90, 95, 100)}),
+    _shadow,
+]
+
+
+def resolve(name):
+    """(order, selector suffix, declarations) of a utility class name, or None"""
+    for order, resolver in enumerate(UTILITIES):
+        result = resolver(name)
+        if result is not None:
+            return (order, *result) if isinstance(result, tuple) else (order, '', result)
+    return None
+
+
+def css_escape(name):
+    """Class name as a CSS selector: w-1/2 -> w-1\\/2"""
+    return re.sub(r'[^a-zA-Z0-9_-]', lambda match: '\\' + match.group(0), name)
+
+
+def compile_css(text):
+    """(stylesheet, utility class names) for every utility used anywhere in text"""
+    rules = []
+    utilities = []
+    for candidate in sorted(set(CANDIDATE.findall(text))):
+        *variants, name = candidate.split(':')
+        if len(variants) > 1 or (variants and variants[0] not in BREAKPOINTS
+                                 and variants[0] not in PSEUDO_VARIANTS and variants[0] != 'print'):
+            continue
+        resolved = resolve(name)
+        if resolved is None:
+            continue
+        order, suffix, declarations = resolved
+        variant = variants[0] if variants else ''
+        # Variants come after every plain utility, breakpoints in ascending order
+        group = (list(BREAKPOINTS).index(variant) + 2 if variant in BREAKPOINTS
+                 else 1 if variant else 0)
+        selector = '.' + css_escape(candidate) + PSEUDO_VARIANTS.get(variant, '') + suffix
+        rule = f"{selector}{{{declarations}}}"
+        if variant in BREAKPOINTS:
+            rule = f"@media (min-width:{BREAKPOINTS[variant]}){{{rule}}}"
+        elif variant == 'print':
+            rule = f"@media print{{{rule}}}"
+        rules.append((group, order, candidate, rule))
+        utilities.append(candidate)
+
+    rules.sort()
+    return PREFLIGHT + '\n'.join(rule for *_, rule in rules) + '\n', utilities
+
+
+def inline_static_css(html_text):
+    """html_text with the Tailwind CDN script replaced by a static stylesheet
+
+    The stylesheet goes at the end of <head>, where the CDN puts the CSS it
+    generates. Returns (html, utility class names); raises ValueError when
+    the deck has no CDN script or configures Tailwind in the page.
+    """
+    if not CDN_SCRIPT.search(html_text):
+        raise ValueError("no Tailwind CDN <script> in the document")
+    if UNSUPPORTED_SETUP.search(html_text):
+        raise ValueError("the document configures Tailwind in the page (tailwind.config / text/tailwindcss)")
+
+    html_text = CDN_SCRIPT.sub('', html_text, count=1)
+    css, utilities = compile_css(html_text)
+    style = f'<style data-generated="tailwind-static">\n{css}</style>\n'
+    head_end = html_text.find('</head>')
+    if head_end == -1:
+        raise ValueError("no </head> to put the stylesheet in")
+    return html_text[:head_end] + style + html_text[head_end:], utilities
+
+
+def main():
+    html_paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not html_paths:
+        html_paths = ['/Users/anasabounouar/Downloads/dbaichi/pfe-oracle/FINAL_PRESENTATION_COMPLETE.html']
+
+    for html_path in html_paths:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html_text = f.read()
+        try:
+            static_html, utilities = inline_static_css(html_text)
+        except ValueError as e:
+            print(f"✗ {html_path}: {e}")
+            continue
+
+        root, extension = os.path.splitext(html_path)
+        output_path = f"{root}_static{extension}"
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(static_html)
+        print(f"✓ {os.path.basename(output_path)}: {len(utilities)} utilities, "
+              f"{(len(static_html) - len(html_text)) / 1024:.1f} KB of CSS, CDN script removed")
+
+
+if __name__ == "__main__":
+    main()